@@ -0,0 +1,54 @@
+"""
+Index des périodes d'appartenance aux groupes : (personne, date) -> groupe.
+
+Les périodes viennent de VoteAccumulator.affiliations() (groupe porté par
+chaque vote, voir aggregate.py) ou de data/affiliations.json. Pour chaque
+personne, les dates de début sont triées : une recherche est une
+bisection, O(log n) dans le nombre de périodes de la personne.
+
+Entre deux périodes (pas de vote entre la fin de l'une et le début de la
+suivante), la personne est rattachée à la période commencée en dernier :
+le changement de groupe est daté au premier vote sous le nouveau groupe.
+Après sa dernière période, elle reste dans son dernier groupe ; avant la
+première, elle n'a pas de groupe connu.
+"""
+from bisect import bisect_right
+
+from aggregate import POSITION_KEYS, VoteAccumulator
+
+COLUMNS = ["group_id", "first_date", "last_date", *POSITION_KEYS]
+
+
+class AffiliationIndex:
+
+    def __init__(self, periods: dict[str, list[list]]):
+        """periods: person_id -> [[group_id, première date, dernière date, ...], ...]."""
+        self._periods = {}
+        for pid, rows in periods.items():
+            rows = sorted(rows, key=lambda r: (r[1], r[2]))
+            self._periods[pid] = ([r[1] for r in rows], rows)
+
+    @classmethod
+    def from_accumulator(cls, acc: VoteAccumulator) -> "AffiliationIndex":
+        return cls(dict(acc.affiliations()))
+
+    def lookup(self, person_id: str, date: str) -> str | None:
+        """group_id de la personne à la date (YYYY-MM-DD), None si inconnu."""
+        entry = self._periods.get(person_id)
+        if entry is None:
+            return None
+        starts, rows = entry
+        i = bisect_right(starts, date) - 1
+        return rows[i][0] if i >= 0 else None
+
+    def periods(self, person_id: str) -> list[list]:
+        """Périodes de la personne, de la plus ancienne à la plus récente."""
+        entry = self._periods.get(person_id)
+        return entry[1] if entry is not None else []
+
+    def members(self, group_id: str, date: str) -> list[str]:
+        """person_id rattachés au groupe à la date, triés."""
+        return sorted(pid for pid in self._periods if self.lookup(pid, date) == group_id)
+
+    def to_dict(self) -> dict:
+        return {pid: rows for pid, (_, rows) in sorted(self._periods.items())}
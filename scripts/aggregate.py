@@ -1,88 +1,114 @@
 """
 Agrégation des données par député et par groupe politique.
 Produit des statistiques de vote pré-calculées pour le frontend.
+
+Les votes sont lus directement dans les colonnes de la VoteTable
+(voir votes.py) : codes personne / groupe et position int8.
+Un VoteAccumulator parcourt les votes une seule fois pour tous les
+livrables (députés, groupes, people, mois) ; chaque sortie a ensuite son
+étape de finalisation.
+Si NumPy est disponible, les comptages sont vectorisés (bincount sur les
+lignes de la table) ; sinon on retombe sur les boucles Python. Les deux
+chemins produisent exactement les mêmes dicts. accumulate() garde les
+boucles Python sous VECTORIZE_MIN_VOTES votes, où le coût fixe de NumPy
+l'emporte (voir scripts/bench/check_aggregate.py).
+
+Loyauté : chaque vote (le premier d'une personne sur un scrutin) est
+marqué fidèle ou dissident par rapport à la position majoritaire de son
+groupe au moment du vote (même règle que majority_position). Ne sont pas
+marqués : votes sans groupe, non-votants, groupes majoritairement
+non-votants.
+
+Appartenance : le groupe porté par chaque vote (organeRef) découpe la
+présence de chaque député en périodes (groupe, première date, dernière
+date, compteurs de la période) : une nouvelle période commence quand le
+groupe change entre deux votes consécutifs dans l'ordre d'ajout (du plus
+récent au plus ancien dans les builds). Seul le premier vote d'une
+personne sur un scrutin compte : une mise au point porte l'organeRef du
+scrutin (l'Assemblée), pas celui du groupe. Le groupe courant d'un député est
+celui de sa période la plus récente ; voir affiliations.py pour la
+recherche (personne, date) -> groupe.
+
+Statistiques de groupe : chaque ligne de vote, mise au point comprise, est
+rattachée au groupe détenu par la personne à la date du scrutin, celui de
+son premier vote sur le scrutin (le groupe de sa période). Tous les groupes
+des périodes ont une fiche, y compris les groupes quittés ou dissous (sans
+membre courant).
 """
+from array import array
+from collections import defaultdict
 
+from votes import POSITIONS, vote_table
 
-def aggregate_deputies(scrutins: list[dict]) -> list[dict]:
-    """
-    Pour chaque député, calcule ses stats de vote et son historique.
-    """
-    dep_map: dict = {}
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-    for s in scrutins:
-        for v in s.get("votes", []):
-            pid = v["person_id"]
-            if pid not in dep_map:
-                dep_map[pid] = {
-                    "person_id": pid,
-                    "name": v.get("name"),
-                    "group": v.get("group"),
-                    "group_acronym": v.get("group_acronym"),
-                    "group_name": v.get("group_name"),
-                    "chamber": s["chamber"],
-                    "counts": {"FOR": 0, "AGAINST": 0, "ABSTAIN": 0, "NONVOTING": 0},
-                }
+POSITION_KEYS = ["for", "against", "abstain", "nonvoting"]
 
-            d = dep_map[pid]
-            # garder le nom/groupe le plus récent
-            if v.get("name"):
-                d["name"] = v["name"]
-            if v.get("group"):
-                d["group"] = v["group"]
-                d["group_acronym"] = v.get("group_acronym")
-                d["group_name"] = v.get("group_name")
-
-            pos = v["position"]
-            if pos in d["counts"]:
-                d["counts"][pos] += 1
-
-    result = []
-    for d in dep_map.values():
-        c = d["counts"]
-        total = sum(c.values())
-        stats = {
-            "total_votes": total,
-            "for": c["FOR"],
-            "against": c["AGAINST"],
-            "abstain": c["ABSTAIN"],
-            "nonvoting": c["NONVOTING"],
-        }
-        if total > 0:
-            stats["pct_for"] = round(c["FOR"] / total * 100, 1)
-            stats["pct_against"] = round(c["AGAINST"] / total * 100, 1)
-            stats["pct_abstain"] = round(c["ABSTAIN"] / total * 100, 1)
-            stats["pct_nonvoting"] = round(c["NONVOTING"] / total * 100, 1)
-            stats["participation_rate"] = round((total - c["NONVOTING"]) / total * 100, 1)
-        else:
-            stats.update({
-                "pct_for": 0, "pct_against": 0,
-                "pct_abstain": 0, "pct_nonvoting": 0,
-                "participation_rate": 0,
-            })
-
-        result.append({
-            "person_id": d["person_id"],
-            "name": d["name"],
-            "group": d["group"],
-            "group_acronym": d.get("group_acronym"),
-            "group_name": d.get("group_name"),
-            "chamber": d["chamber"],
-            "stats": stats,
+NONVOTING = POSITIONS.index("NONVOTING")
+
+# marque de loyauté d'un vote
+UNFLAGGED, LOYAL, DISSENT = 0, 1, 2
+
+# accumulate() : chemin NumPy à partir de ce nombre de votes
+VECTORIZE_MIN_VOTES = 1000
+
+# titres recopiés dans les historiques (fiches députés / groupes)
+SHORT_TITLE = 100
+
+
+# ---------------------------------------------------------------------------
+# Mise en forme (commune aux deux chemins)
+# ---------------------------------------------------------------------------
+
+def short_title(title: str | None) -> str | None:
+    """Titre coupé à SHORT_TITLE caractères, sur une fin de mot."""
+    if not title or len(title) <= SHORT_TITLE:
+        return title
+    return title[:SHORT_TITLE].rsplit(" ", 1)[0].rstrip(" ,;:") + "…"
+
+
+def _deputy_stats(c: list[int]) -> dict:
+    total = sum(c)
+    stats = {
+        "total_votes": total,
+        "for": c[0],
+        "against": c[1],
+        "abstain": c[2],
+        "nonvoting": c[3],
+    }
+    if total > 0:
+        stats["pct_for"] = round(c[0] / total * 100, 1)
+        stats["pct_against"] = round(c[1] / total * 100, 1)
+        stats["pct_abstain"] = round(c[2] / total * 100, 1)
+        stats["pct_nonvoting"] = round(c[3] / total * 100, 1)
+        stats["participation_rate"] = round((total - c[3]) / total * 100, 1)
+    else:
+        stats.update({
+            "pct_for": 0, "pct_against": 0,
+            "pct_abstain": 0, "pct_nonvoting": 0,
+            "participation_rate": 0,
         })
+    return stats
 
-    result.sort(key=lambda x: (x.get("name") or "", x["person_id"]))
-    return result
 
+def _deputy_entry(table, p: int, c: list[int], g: int, chamber: str) -> dict:
+    return {
+        "person_id": table.person_ids[p],
+        "name": table.person_names[p],
+        "group": table.group_ids[g],
+        "group_acronym": table.group_acronyms[g],
+        "group_name": table.group_names[g],
+        "chamber": chamber,
+        "stats": _deputy_stats(c),
+    }
 
-def aggregate_groups(scrutins: list[dict], deputies: list[dict]) -> list[dict]:
-    """
-    Pour chaque groupe politique, calcule les stats agrégées,
-    la cohésion et la liste des membres.
-    """
-    group_map: dict = {}
 
-    # init groupes depuis les fiches députés
+def _group_map(deputies: list[dict]) -> dict:
+    """Groupes et membres, d'après le groupe courant de chaque député."""
+    group_map: dict = {}
     for dep in deputies:
         gid = dep.get("group")
         if not gid:
@@ -93,105 +119,671 @@ def aggregate_groups(scrutins: list[dict], deputies: list[dict]) -> list[dict]:
                 "acronym": dep.get("group_acronym", ""),
                 "name": dep.get("group_name", "Groupe inconnu"),
                 "members": {},
-                "counts": {"FOR": 0, "AGAINST": 0, "ABSTAIN": 0, "NONVOTING": 0},
-                "per_scrutin_data": {},
             }
         group_map[gid]["members"][dep["person_id"]] = dep["name"]
+    return group_map
+
 
-    # accumuler les votes par scrutin par groupe
-    pos_key_map = {
-        "FOR": "for", "AGAINST": "against",
-        "ABSTAIN": "abstain", "NONVOTING": "nonvoting",
+def _group_entry(g: dict, c: list[int], cohesion_scores: list[float]) -> dict:
+    total = sum(c)
+    stats = {
+        "total_group_votes": total,
+        "for": c[0],
+        "against": c[1],
+        "abstain": c[2],
+        "nonvoting": c[3],
     }
+    if total > 0:
+        stats["pct_for"] = round(c[0] / total * 100, 1)
+        stats["pct_against"] = round(c[1] / total * 100, 1)
+        stats["pct_abstain"] = round(c[2] / total * 100, 1)
+        stats["pct_nonvoting"] = round(c[3] / total * 100, 1)
+    else:
+        stats.update({
+            "pct_for": 0, "pct_against": 0,
+            "pct_abstain": 0, "pct_nonvoting": 0,
+        })
 
-    for s in scrutins:
-        for v in s.get("votes", []):
-            gid = v.get("group")
-            if not gid or gid not in group_map:
+    # builtin sum (somme compensée) dans l'ordre d'apparition des scrutins :
+    # même arrondi quel que soit le chemin de calcul
+    cohesion = round(
+        sum(cohesion_scores) / len(cohesion_scores) * 100, 1
+    ) if cohesion_scores else 0
+
+    members_list = [
+        {"person_id": pid, "name": name}
+        for pid, name in g["members"].items()
+    ]
+    members_list.sort(key=lambda x: (x["name"] or "", x["person_id"]))
+
+    return {
+        "group_id": g["group_id"],
+        "acronym": g["acronym"],
+        "name": g["name"],
+        "member_count": len(members_list),
+        "stats": stats,
+        "cohesion": cohesion,
+        "members": members_list,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Chemin NumPy
+# ---------------------------------------------------------------------------
+
+def _columns(scrutins: list[dict], table):
+    """
+    Colonnes (person, group, position, scrutin) des lignes de `scrutins`,
+    dans l'ordre d'itération. `scrutin` est l'indice du scrutin dans la liste.
+    """
+    person = np.frombuffer(table.person, dtype=np.int32)
+    group = np.frombuffer(table.group, dtype=np.int32)
+    position = np.frombuffer(table.position, dtype=np.int8).astype(np.int64)
+
+    starts = np.fromiter((s["votes"].start for s in scrutins), dtype=np.int64, count=len(scrutins))
+    sizes = np.fromiter((len(s["votes"]) for s in scrutins), dtype=np.int64, count=len(scrutins))
+    scrutin = np.repeat(np.arange(len(scrutins)), sizes)
+
+    # cas courant : les scrutins couvrent la table d'un seul tenant
+    if len(scrutins) and starts[0] == 0 and sizes.sum() == len(table) and (
+            np.all(starts[1:] == (starts + sizes)[:-1])):
+        return person, group, position, scrutin
+    offsets = np.cumsum(sizes) - sizes
+    rows = np.arange(int(sizes.sum())) - np.repeat(offsets, sizes) + np.repeat(starts, sizes)
+    return person[rows], group[rows], position[rows], scrutin
+
+
+def _first_rows(keys, n_keys: int):
+    """
+    Clés présentes (0 <= clé < n_keys) et indice de leur première ligne,
+    par ordre de clé. Un minimum.at évite le tri de np.unique.
+    """
+    first = np.full(n_keys, len(keys), dtype=np.int64)
+    np.minimum.at(first, keys, np.arange(len(keys)))
+    present = np.flatnonzero(first < len(keys))
+    return present, first[present]
+
+
+class _VoteColumns:
+    """
+    Colonnes des votes d'un VoteAccumulator (chemin NumPy), calculées une
+    fois à la finalisation et lues par toutes les sorties : lignes
+    (person, group, position, scrutin), premier vote de chaque (personne,
+    scrutin), groupe détenu et marque de loyauté de chaque ligne.
+    """
+
+    def __init__(self, scrutins: list[dict], table):
+        self.n = n = len(scrutins)
+        person, group, position, scrutin = _columns(scrutins, table)
+        self.person, self.group, self.position, self.scrutin = person, group, position, scrutin
+
+        key = person.astype(np.int64) * n + scrutin
+        order = np.argsort(key, kind="stable")
+        key = key[order]
+        first = np.ones(len(key), dtype=bool)
+        first[1:] = key[1:] != key[:-1]
+        # lignes des premiers votes, triées par personne puis ordre d'ajout
+        self.first = order[first]
+        self.first_people = key[first] // n
+        # groupe de chaque ligne à la date de son scrutin : celui du premier
+        # vote de la personne sur le scrutin (une mise au point porte
+        # l'Assemblée)
+        self.held = np.empty_like(group)
+        self.held[order] = group[order][first][np.cumsum(first) - 1]
+        self.flags = _loyalty_flags(n, self.held, position, scrutin)
+        self._rank = self._ranked = None
+
+    def ranked(self, rank):
+        """
+        Premiers votes triés par personne puis selon `rank` (None : ordre
+        d'ajout) : (lignes, code personne de chacune). Le tri du dernier
+        `rank` demandé est gardé.
+        """
+        if rank is None:
+            return self.first, self.first_people
+        if rank is not self._rank:
+            key = (self.first_people * self.n
+                   + np.asarray(rank, dtype=np.int64)[self.scrutin[self.first]])
+            order = np.argsort(key, kind="stable")
+            self._rank, self._ranked = rank, (self.first[order], self.first_people[order])
+        return self._ranked
+
+
+def _accumulate_np(scrutins: list[dict], table, cols: _VoteColumns):
+    """
+    Même résultat que la boucle de VoteAccumulator.add, en une passe
+    vectorisée sur les colonnes : (people, groups, runs), voir
+    VoteAccumulator.
+    """
+    person, position, scrutin = cols.person, cols.position, cols.scrutin
+    n_people = len(table.person_ids)
+
+    counts = np.bincount(person * 4 + position, minlength=n_people * 4).reshape(n_people, 4)
+
+    # chambre du premier scrutin où la personne apparaît
+    codes, first = _first_rows(person, n_people)
+    chambers = [s["chamber"] for s in scrutins]
+    first_scrutin = scrutin[first]
+
+    runs = _runs_np(scrutins, cols)
+    people = [
+        (p, c, _current_group(runs.get(p)), chambers[k])
+        for p, c, k in zip(codes.tolist(), counts[codes].tolist(), first_scrutin.tolist())
+    ]
+
+    # groupes suivis (ceux des périodes d'appartenance) -> 1..G
+    tracked = sorted({r[0] for rs in runs.values() for r in rs})
+    local = np.zeros(len(table.group_ids), dtype=np.int64)
+    local[tracked] = np.arange(1, len(tracked) + 1)
+    n_groups = len(tracked) + 1
+
+    # scrutins identifiés par leur id (un id répété fusionne ses votes)
+    uid_of: dict[str, int] = {}
+    scrutin_uid = np.fromiter(
+        (uid_of.setdefault(s["id"], len(uid_of)) for s in scrutins),
+        dtype=np.int64, count=len(scrutins),
+    )
+    n_uids = len(uid_of)
+
+    g_local = local[cols.held]
+    keep = np.flatnonzero(g_local)
+    g_local = g_local[keep]
+    uid = scrutin_uid[scrutin[keep]]
+    pos = position[keep]
+
+    totals = np.bincount(g_local * 4 + pos, minlength=n_groups * 4).reshape(n_groups, 4)
+
+    # matrice (groupe, scrutin, position)
+    cell = g_local * n_uids + uid
+    per_scrutin = np.bincount(cell * 4 + pos, minlength=n_groups * n_uids * 4)
+    per_scrutin = per_scrutin.reshape(n_groups * n_uids, 4)
+
+    # compteurs dans l'ordre de première apparition de chaque (groupe, scrutin)
+    cells, first = _first_rows(cell, n_groups * n_uids)
+    cells = cells[np.argsort(first, kind="stable")]
+    ids = list(uid_of)
+
+    by_group = {k: {} for k in range(1, n_groups)}
+    for c, counts in zip(cells.tolist(), per_scrutin[cells].tolist()):
+        by_group[c // n_uids][ids[c % n_uids]] = counts
+
+    totals = totals.tolist()
+    groups = {
+        code: (totals[k], by_group[k])
+        for k, code in enumerate(tracked, start=1)
+    }
+    return people, groups, runs
+
+
+def _runs_np(scrutins: list[dict], cols: _VoteColumns):
+    """
+    Périodes d'appartenance par personne (voir VoteAccumulator._runs) :
+    premier vote de chaque (personne, scrutin), s'il a un groupe, trié par
+    personne puis ordre d'ajout ; une période par suite de votes au même
+    groupe.
+    """
+    dates = sorted({s["date"] for s in scrutins})
+    date_code = {d: i for i, d in enumerate(dates)}
+    scrutin_date = np.fromiter((date_code[s["date"]] for s in scrutins),
+                               dtype=np.int64, count=len(scrutins))
+
+    rows = cols.first[cols.group[cols.first] != 0]
+    if not len(rows):
+        return {}
+    p, g = cols.person[rows], cols.group[rows]
+    start = np.ones(len(rows), dtype=bool)
+    start[1:] = (p[1:] != p[:-1]) | (g[1:] != g[:-1])
+    starts = np.flatnonzero(start)
+    run = np.cumsum(start) - 1
+
+    d = scrutin_date[cols.scrutin[rows]]
+    first = np.minimum.reduceat(d, starts).tolist()
+    last = np.maximum.reduceat(d, starts).tolist()
+    counts = np.bincount(run * 4 + cols.position[rows], minlength=len(starts) * 4)
+    counts = counts.reshape(len(starts), 4).tolist()
+
+    runs: dict[int, list] = {}
+    for pp, gg, a, b, c in zip(p[starts].tolist(), g[starts].tolist(), first, last, counts):
+        runs.setdefault(pp, []).append([gg, dates[a], dates[b], *c])
+    return runs
+
+
+def _current_group(runs: list | None) -> int:
+    """Groupe de la période la plus récente (à égalité, la première ajoutée)."""
+    if not runs:
+        return 0
+    return max(enumerate(runs), key=lambda ir: (ir[1][2], ir[1][1], -ir[0]))[1][0]
+
+
+def _histories_np(cols: _VoteColumns, rank, flags: bool = False):
+    """
+    Historique de vote par personne : (code personne, [(indice scrutin,
+    position)]) trié selon `rank`, premier vote retenu par scrutin ;
+    flags : [(indice scrutin, position, marque de loyauté)].
+    """
+    order, people = cols.ranked(rank)
+
+    columns = [cols.scrutin[order].tolist(), cols.position[order].tolist()]
+    if flags:
+        columns.append(cols.flags[order].tolist())
+    bounds = [0, *(np.flatnonzero(np.diff(people)) + 1).tolist(), len(order)]
+    for a, b in zip(bounds, bounds[1:]):
+        if a < b:
+            yield int(people[a]), list(zip(*(c[a:b] for c in columns)))
+
+
+def _loyalty_flags(n: int, group, position, scrutin):
+    """
+    Marque de loyauté de chaque ligne : position majoritaire du groupe sur
+    le scrutin (toutes ses lignes, premier maximum comme majority_position)
+    comparée à la position du vote. `group` : groupes détenus, `n` : nombre
+    de scrutins.
+    """
+    cell = group.astype(np.int64) * n + scrutin
+    n_cells = (int(group.max(initial=0)) + 1) * n
+    counts = np.bincount(cell * 4 + position, minlength=n_cells * 4).reshape(n_cells, 4)
+    majority = counts.argmax(axis=1)[cell]
+
+    flags = np.where(position == majority, LOYAL, DISSENT).astype(np.int8)
+    flags[(group == 0) | (position == NONVOTING) | (majority == NONVOTING)] = UNFLAGGED
+    return flags
+
+
+def _rebels_np(cols: _VoteColumns):
+    """{indice scrutin: [(code personne, code groupe, position)]} des votes dissidents."""
+    rows = cols.first[cols.flags[cols.first] == DISSENT]
+    rebels: dict[int, list] = {}
+    for k, p, g, pos in zip(cols.scrutin[rows].tolist(), cols.person[rows].tolist(),
+                            cols.group[rows].tolist(), cols.position[rows].tolist()):
+        rebels.setdefault(k, []).append((p, g, pos))
+    return rebels
+
+
+# ---------------------------------------------------------------------------
+# Accumulateur
+# ---------------------------------------------------------------------------
+
+class VoteAccumulator:
+    """
+    Une passe sur les votes pour tous les livrables : compteurs par député,
+    compteurs par groupe et par scrutin, référentiel people et scrutins
+    rangés par mois. Les votes ajoutés doivent être des VoteSlice d'une
+    même VoteTable (voir accumulate()).
+
+    vectorized: force (True) ou désactive (False) le chemin NumPy ;
+    par défaut il est utilisé dès que NumPy est installé. Avec NumPy,
+    add() ne fait que ranger le scrutin et la passe sur les votes a lieu
+    en bloc à la première finalisation.
+    """
+
+    def __init__(self, vectorized: bool | None = None):
+        if vectorized is None:
+            vectorized = np is not None
+        self.vectorized = vectorized
+        self.table = None
+        self.scrutins: list[dict] = []
+        self.by_month: dict[str, list[dict]] = defaultdict(list)
+
+        # chemin Python : code personne -> [FOR, AGAINST, ABSTAIN, NONVOTING]
+        self._person_counts: dict[int, list[int]] = {}
+        self._person_chamber: dict[int, str] = {}
+        # code personne -> périodes d'appartenance dans l'ordre d'ajout :
+        # [code groupe, première date, dernière date, FOR, AGAINST, ABSTAIN,
+        # NONVOTING] (chemin NumPy : calculées à la finalisation)
+        self._runs: dict[int, list[list]] = {}
+        # code groupe -> compteurs, et compteurs par id de scrutin
+        self._group_counts: dict[int, list[int]] = {}
+        self._group_scrutins: dict[int, dict[str, list[int]]] = {}
+        # code personne -> indice scrutin << 4 | loyauté << 2 | position
+        # (1er vote par scrutin)
+        self._history: dict[int, array] = {}
+        # indice scrutin -> [(code personne, code groupe, position)] dissidents
+        self._rebels: dict[int, list] = {}
+
+        self._people = None
+        self._groups = None
+        # chemin NumPy : colonnes partagées par les sorties (_VoteColumns)
+        self._cols = None
+        self._ranks = None
+
+    def add(self, s: dict):
+        sl = s["votes"]
+        if self.table is None:
+            self.table = sl.table
+        self.scrutins.append(s)
+        self.by_month[s["date"][:7]].append(s)
+        self._people = self._groups = self._cols = self._ranks = None
+        if self.vectorized:
+            return
+
+        table = self.table
+        person, group, position = table.person, table.group, table.position
+        person_counts = self._person_counts
+        runs = self._runs
+        group_counts = self._group_counts
+        group_scrutins = self._group_scrutins
+        history = self._history
+        chamber = s["chamber"]
+        sid = s["id"]
+        date = s["date"]
+        k = len(self.scrutins) - 1
+        # groupe -> compteurs sur ce scrutin (ses seules lignes)
+        counts: dict[int, list[int]] = {}
+        # personne -> groupe détenu à la date du scrutin (son premier vote)
+        held: dict[int, int] = {}
+        for i in range(sl.start, sl.stop):
+            p = person[i]
+            pos = position[i]
+            c = person_counts.get(p)
+            if c is None:
+                c = person_counts[p] = [0, 0, 0, 0]
+                self._person_chamber[p] = chamber
+                history[p] = array("i")
+            c[pos] += 1
+            h = history[p]
+            first = not h or h[-1] >> 4 != k
+            if first:
+                h.append(k << 4 | pos)
+                held[p] = group[i]
+
+            g = held[p]
+            if not g:
                 continue
-            g = group_map[gid]
-            pos = v["position"]
-            if pos in g["counts"]:
-                g["counts"][pos] += 1
-
-            sid = s["id"]
-            if sid not in g["per_scrutin_data"]:
-                g["per_scrutin_data"][sid] = {
-                    "scrutin_id": sid,
-                    "date": s["date"],
-                    "title": s["title"],
-                    "for": 0, "against": 0, "abstain": 0, "nonvoting": 0,
+            if first:
+                r = runs.get(p)
+                if r is None:
+                    r = runs[p] = []
+                if r and r[-1][0] == g:
+                    r = r[-1]
+                    if date < r[1]:
+                        r[1] = date
+                    elif date > r[2]:
+                        r[2] = date
+                else:
+                    r.append([g, date, date, 0, 0, 0, 0])
+                    r = r[-1]
+                r[3 + pos] += 1
+            gc = group_counts.get(g)
+            if gc is None:
+                gc = group_counts[g] = [0, 0, 0, 0]
+                group_scrutins[g] = {}
+            gc[pos] += 1
+            per_scrutin = group_scrutins[g].get(sid)
+            if per_scrutin is None:
+                per_scrutin = group_scrutins[g][sid] = [0, 0, 0, 0]
+            per_scrutin[pos] += 1
+            c = counts.get(g)
+            if c is None:
+                c = counts[g] = [0, 0, 0, 0]
+            c[pos] += 1
+
+        # loyauté : majorité de chaque groupe sur le scrutin ; seul le
+        # premier vote de chaque personne est marqué
+        majorities = {g: c.index(max(c)) for g, c in counts.items()}
+        seen = set()
+        rebels = []
+        for i in range(sl.start, sl.stop):
+            p = person[i]
+            if p in seen:
+                continue
+            seen.add(p)
+            g = group[i]
+            pos = position[i]
+            if not g or pos == NONVOTING:
+                continue
+            majority = majorities[g]
+            if majority == NONVOTING:
+                continue
+            flag = LOYAL if pos == majority else DISSENT
+            history[p][-1] |= flag << 2
+            if flag == DISSENT:
+                rebels.append((p, g, pos))
+        if rebels:
+            self._rebels[k] = rebels
+
+    def _finalize(self):
+        """
+        people: [(code personne, compteurs, code groupe courant, chambre)]
+        groups: {code groupe: (compteurs, {id scrutin: compteurs})}
+        Chemin NumPy : les colonnes des votes (_VoteColumns) sont calculées
+        ici une fois pour toutes les sorties.
+        """
+        if self._people is not None:
+            return
+        if self.table is None:
+            self._people, self._groups = [], {}
+        elif self.vectorized:
+            self._cols = _VoteColumns(self.scrutins, self.table)
+            self._people, self._groups, self._runs = _accumulate_np(
+                self.scrutins, self.table, self._cols)
+        else:
+            self._people = [
+                (p, c, _current_group(self._runs.get(p)), self._person_chamber[p])
+                for p, c in self._person_counts.items()
+            ]
+            self._groups = {
+                g: (self._group_counts[g], self._group_scrutins[g])
+                for g in {r[0] for rs in self._runs.values() for r in rs}
+            }
+
+    def deputies(self) -> list[dict]:
+        """Fiches députés (stats de vote, groupe courant)."""
+        self._finalize()
+        result = [
+            _deputy_entry(self.table, p, c, g, chamber)
+            for p, c, g, chamber in self._people
+        ]
+        result.sort(key=lambda x: (x.get("name") or "", x["person_id"]))
+        return result
+
+    def groups(self, deputies: list[dict] | None = None) -> list[dict]:
+        """
+        Fiches groupes (stats agrégées, cohésion, membres). Les membres sont
+        les députés dont c'est le groupe courant ; les groupes des périodes
+        sans membre courant (quittés, dissous) ont une fiche sans membre.
+        """
+        self._finalize()
+        group_map = _group_map(deputies if deputies is not None else self.deputies())
+        table = self.table
+        for code in self._groups:
+            gid = table.group_ids[code]
+            if gid not in group_map:
+                group_map[gid] = {
+                    "group_id": gid,
+                    "acronym": table.group_acronyms[code],
+                    "name": table.group_names[code],
+                    "members": {},
                 }
-            pk = pos_key_map.get(pos)
-            if pk:
-                g["per_scrutin_data"][sid][pk] += 1
-
-    # calcul stats, cohésion, finalisation
-    positions = ["for", "against", "abstain", "nonvoting"]
-    result = []
-
-    for g in group_map.values():
-        c = g["counts"]
-        total = sum(c.values())
-        stats = {
-            "total_group_votes": total,
-            "for": c["FOR"],
-            "against": c["AGAINST"],
-            "abstain": c["ABSTAIN"],
-            "nonvoting": c["NONVOTING"],
-        }
-        if total > 0:
-            stats["pct_for"] = round(c["FOR"] / total * 100, 1)
-            stats["pct_against"] = round(c["AGAINST"] / total * 100, 1)
-            stats["pct_abstain"] = round(c["ABSTAIN"] / total * 100, 1)
-            stats["pct_nonvoting"] = round(c["NONVOTING"] / total * 100, 1)
+        result = []
+        for gid, g in group_map.items():
+            code = self.table.find_group(gid) if self.table is not None else None
+            c, per_scrutin = self._groups.get(code, ([0, 0, 0, 0], {}))
+            # cohésion : pour chaque scrutin, part de la position majoritaire
+            scores = [max(counts) / sum(counts) for counts in per_scrutin.values()]
+            result.append(_group_entry(g, c, scores))
+        result.sort(key=lambda x: (-x["member_count"], x["name"] or "", x["group_id"]))
+        return result
+
+    def people(self) -> list[dict]:
+        """Référentiel minimal pour data/people.json."""
+        self._finalize()
+        table = self.table
+        result = []
+        for p, _, g, chamber in self._people:
+            person = {
+                "person_id": table.person_ids[p],
+                "name": table.person_names[p],
+                "chamber": chamber,
+            }
+            if g:
+                person["group"] = table.group_ids[g]
+            result.append(person)
+        result.sort(key=lambda p: ((p.get("name") or ""), p["person_id"]))
+        return result
+
+    def _rank(self) -> list[int]:
+        """Rang de chaque scrutin ajouté dans l'ordre (date, id) décroissant."""
+        if self._ranks is None:
+            scrutins = self.scrutins
+            order = sorted(range(len(scrutins)),
+                           key=lambda k: (scrutins[k]["date"], scrutins[k]["id"]), reverse=True)
+            self._ranks = [0] * len(order)
+            for r, k in enumerate(order):
+                self._ranks[k] = r
+        return self._ranks
+
+    def histories(self, rank: list[int] | None = None, flags: bool = False):
+        """
+        (code personne, [(indice scrutin, code position)]) pour chaque
+        personne, un vote par scrutin (le premier), trié selon `rank`
+        (par défaut l'ordre d'ajout des scrutins).
+        flags : triplets (indice scrutin, code position, marque de loyauté).
+        """
+        if self.table is None:
+            return
+        if self.vectorized:
+            self._finalize()
+            yield from _histories_np(self._cols, rank, flags)
+            return
+        if rank is None:
+            rank = range(len(self.scrutins))
+        if flags:
+            for p, h in self._history.items():
+                yield p, sorted(((v >> 4, v & 3, v >> 2 & 3) for v in h),
+                                key=lambda kv: rank[kv[0]])
         else:
-            stats.update({
-                "pct_for": 0, "pct_against": 0,
-                "pct_abstain": 0, "pct_nonvoting": 0,
-            })
-
-        # cohésion : pour chaque scrutin, part de la position majoritaire
-        cohesion_scores = []
-        per_scrutin = []
-        for psd in g["per_scrutin_data"].values():
-            counts = [psd[p] for p in positions]
-            total_in_scrutin = sum(counts)
-            majority_pos = None
-            if total_in_scrutin > 0:
+            for p, h in self._history.items():
+                yield p, sorted(((v >> 4, v & 3) for v in h), key=lambda kv: rank[kv[0]])
+
+    def deputy_votes(self):
+        """
+        Historique par député, du plus récent au plus ancien :
+        (person_id, [[scrutin_id, date, position, loyauté, titre court,
+        result_status], ...]). Un seul vote par scrutin (le premier, si une
+        mise au point a ajouté un doublon). Loyauté : 1 fidèle à la
+        majorité du groupe, 0 dissident, None non marqué.
+        """
+        if self.table is None:
+            return
+        scrutins = self.scrutins
+        # (id, date, titre court, résultat) par scrutin, calculés une fois
+        head = [(s["id"], s["date"], short_title(s.get("title")), s.get("result_status"))
+                for s in scrutins]
+        loyalty = {UNFLAGGED: None, LOYAL: 1, DISSENT: 0}
+        for p, votes in self.histories(self._rank(), flags=True):
+            rows = []
+            for k, pos, flag in votes:
+                sid, date, title, result = head[k]
+                rows.append([sid, date, POSITIONS[pos], loyalty[flag], title, result])
+            yield self.table.person_ids[p], rows
+
+    def loyalty(self):
+        """
+        Loyauté par député : (person_id, votes fidèles, votes dissidents,
+        [scrutin_id dissidents, du plus récent au plus ancien]).
+        """
+        if self.table is None:
+            return
+        scrutins = self.scrutins
+        for p, votes in self.histories(self._rank(), flags=True):
+            loyal = sum(1 for _, _, flag in votes if flag == LOYAL)
+            dissent = [scrutins[k]["id"] for k, _, flag in votes if flag == DISSENT]
+            yield self.table.person_ids[p], loyal, len(dissent), dissent
+
+    def rebels(self):
+        """
+        Dissidents par scrutin, du plus récent au plus ancien :
+        (scrutin_id, [[person_id, group_id, position], ...] triés par
+        person_id). Seuls les scrutins avec au moins un dissident.
+        """
+        if self.table is None:
+            return
+        table = self.table
+        self._finalize()
+        rebels = _rebels_np(self._cols) if self.vectorized else self._rebels
+        rank = self._rank()
+        for k in sorted(rebels, key=rank.__getitem__):
+            yield self.scrutins[k]["id"], sorted(
+                [table.person_ids[p], table.group_ids[g], POSITIONS[pos]]
+                for p, g, pos in rebels[k]
+            )
+
+    def affiliations(self):
+        """
+        Périodes d'appartenance par député, triées par person_id :
+        (person_id, [[group_id, première date, dernière date, for, against,
+        abstain, nonvoting], ...]) du plus ancien au plus récent.
+        """
+        self._finalize()
+        table = self.table
+        result = []
+        for p, runs in self._runs.items():
+            # ordre d'ajout du plus récent au plus ancien : on le renverse
+            # avant le tri stable sur les dates
+            periods = sorted(reversed(runs), key=lambda r: (r[1], r[2]))
+            result.append((table.person_ids[p], [
+                [table.group_ids[r[0]], *r[1:]] for r in periods
+            ]))
+        result.sort(key=lambda x: x[0])
+        return result
+
+    def group_votes(self):
+        """
+        Votes par scrutin de chaque groupe suivi, du plus récent au plus
+        ancien : (group_id, [{scrutin_id, date, title, group_counts,
+        majority_position}, ...]), title étant le titre court.
+        """
+        self._finalize()
+        heads = {}
+        for s in self.scrutins:
+            heads.setdefault(s["id"], (s["date"], short_title(s.get("title"))))
+        for code, (_, per_scrutin) in self._groups.items():
+            rows = []
+            for sid, counts in per_scrutin.items():
                 majority = max(counts)
-                cohesion_scores.append(majority / total_in_scrutin)
-                majority_pos = positions[counts.index(majority)]
-
-            per_scrutin.append({
-                "scrutin_id": psd["scrutin_id"],
-                "date": psd["date"],
-                "title": psd["title"],
-                "group_counts": {p: psd[p] for p in positions},
-                "majority_position": majority_pos,
-            })
-
-        per_scrutin.sort(key=lambda x: (x["date"], x["scrutin_id"]), reverse=True)
-
-        cohesion = round(
-            sum(cohesion_scores) / len(cohesion_scores) * 100, 1
-        ) if cohesion_scores else 0
-
-        members_list = [
-            {"person_id": pid, "name": name}
-            for pid, name in g["members"].items()
-        ]
-        members_list.sort(key=lambda x: (x["name"] or "", x["person_id"]))
-
-        result.append({
-            "group_id": g["group_id"],
-            "acronym": g["acronym"],
-            "name": g["name"],
-            "member_count": len(members_list),
-            "stats": stats,
-            "cohesion": cohesion,
-            "members": members_list,
-        })
+                date, title = heads[sid]
+                rows.append({
+                    "scrutin_id": sid,
+                    "date": date,
+                    "title": title,
+                    "group_counts": dict(zip(POSITION_KEYS, counts)),
+                    "majority_position": POSITION_KEYS[counts.index(majority)],
+                })
+            rows.sort(key=lambda x: (x["date"], x["scrutin_id"]), reverse=True)
+            yield self.table.group_ids[code], rows
+
+
+# ---------------------------------------------------------------------------
+# API
+# ---------------------------------------------------------------------------
 
-    result.sort(key=lambda x: (-x["member_count"], x["name"]))
-    return result
+def accumulate(scrutins: list[dict], vectorized: bool | None = None) -> VoteAccumulator:
+    """
+    Accumulateur alimenté par `scrutins` (votes dicts convertis en table).
+    vectorized: par défaut NumPy s'il est installé et qu'il y a au moins
+    VECTORIZE_MIN_VOTES votes.
+    """
+    vote_table(scrutins)
+    if vectorized is None:
+        vectorized = (np is not None
+                      and sum(len(s["votes"]) for s in scrutins) >= VECTORIZE_MIN_VOTES)
+    acc = VoteAccumulator(vectorized)
+    for s in scrutins:
+        acc.add(s)
+    return acc
+
+
+def aggregate_deputies(scrutins: list[dict], vectorized: bool | None = None) -> list[dict]:
+    """
+    Pour chaque député, calcule ses stats de vote et son historique.
+    """
+    return accumulate(scrutins, vectorized).deputies()
+
+
+def aggregate_groups(scrutins: list[dict], deputies: list[dict],
+                     vectorized: bool | None = None) -> list[dict]:
+    """
+    Pour chaque groupe politique, calcule les stats agrégées,
+    la cohésion et la liste des membres.
+    """
+    return accumulate(scrutins, vectorized).groups(deputies)
@@ -0,0 +1,212 @@
+"""
+Taux d'accord entre votants : "qui vote comme qui".
+
+Deux votants sont d'accord sur un scrutin s'ils y ont exprimé la même
+position (pour, contre, abstention) ; le taux d'accord est rapporté aux
+scrutins où les deux se sont exprimés (non-votants et absents exclus).
+
+Les positions forment une matrice int8 scrutin × votant (-1 = pas de
+position exprimée). Avec NumPy, les comptages sont des produits matriciels
+accumulés par blocs de BLOCK_ROWS scrutins :
+
+    same   += Σ_pos A_pos^T · A_pos    (A_pos : indicatrice de la position)
+    common += E^T · E                  (E : position exprimée)
+
+Seul le bloc courant est matérialisé, restreint aux votants présents dans
+le bloc (une législature à la fois) ; les produits A^T · A sont
+symétriques (BLAS syrk). Sans NumPy, chaque votant a un bitset (int) par
+position et chaque paire est comptée par popcount. Les deux chemins
+donnent les mêmes entiers, donc les mêmes voisins.
+
+- deputy_neighbours : pour chaque député, ses `k` plus proches voisins
+  parmi ceux avec au moins `min_common` scrutins exprimés en commun ;
+- group_matrix : matrice complète groupe × groupe, la position d'un groupe
+  sur un scrutin étant la majorité des voix exprimées de ses membres.
+"""
+from aggregate import POSITION_KEYS, VoteAccumulator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TOP_K = 10
+MIN_COMMON = 20
+BLOCK_ROWS = 2048
+
+# positions exprimées : codes 0..2 de votes.POSITIONS (FOR, AGAINST, ABSTAIN)
+EXPRESSED = 3
+
+
+# ---------------------------------------------------------------------------
+# Comptages
+# ---------------------------------------------------------------------------
+
+def _counts_py(columns: list[list[tuple[int, int]]]):
+    """Bitsets par votant et par position, popcount par paire."""
+    bits = []
+    for col in columns:
+        b = [0] * EXPRESSED
+        for row, pos in col:
+            b[pos] |= 1 << row
+        bits.append((b, b[0] | b[1] | b[2]))
+
+    n = len(columns)
+    same = [[0] * n for _ in range(n)]
+    common = [[0] * n for _ in range(n)]
+    for i, (bi, ei) in enumerate(bits):
+        same_i, common_i = same[i], common[i]
+        for j in range(i, n):
+            bj, ej = bits[j]
+            c = (ei & ej).bit_count()
+            if not c:
+                continue
+            s = ((bi[0] & bj[0]).bit_count() + (bi[1] & bj[1]).bit_count()
+                 + (bi[2] & bj[2]).bit_count())
+            same_i[j] = same[j][i] = s
+            common_i[j] = common[j][i] = c
+    return same, common
+
+
+def _counts_np(columns: list[list[tuple[int, int]]], n_rows: int):
+    """Produits matriciels par blocs de lignes (scrutins)."""
+    n = len(columns)
+    sizes = [len(col) for col in columns]
+    total = sum(sizes)
+    rows = np.fromiter((r for col in columns for r, _ in col), dtype=np.int64, count=total)
+    pos = np.fromiter((p for col in columns for _, p in col), dtype=np.int8, count=total)
+    who = np.repeat(np.arange(n), sizes)
+    order = np.argsort(rows, kind="stable")
+    rows, pos, who = rows[order], pos[order], who[order]
+
+    same = np.zeros((n, n))
+    common = np.zeros((n, n))
+    edges = np.searchsorted(rows, np.arange(0, n_rows + BLOCK_ROWS, BLOCK_ROWS))
+    for start, (a, b) in zip(range(0, n_rows, BLOCK_ROWS), zip(edges, edges[1:])):
+        if a == b:
+            continue
+        # colonnes des seuls votants du bloc (une législature n'en a que ~600)
+        active, local = np.unique(who[a:b], return_inverse=True)
+        block = np.full((min(BLOCK_ROWS, n_rows - start), len(active)), -1, dtype=np.int8)
+        block[rows[a:b] - start, local] = pos[a:b]
+        cells = np.ix_(active, active)
+        # float32 : comptages exacts (< 2**24 par bloc), BLAS rapide
+        for k in range(EXPRESSED):
+            ind = (block == k).astype(np.float32)
+            same[cells] += ind.T @ ind
+        ind = (block >= 0).astype(np.float32)
+        common[cells] += ind.T @ ind
+    return same.astype(np.int64), common.astype(np.int64)
+
+
+def agreement_counts(columns: list[list[tuple[int, int]]], n_rows: int,
+                     vectorized: bool | None = None):
+    """
+    columns[j] : [(ligne, position)] du votant j, positions exprimées
+    seulement (0..2), au plus une par ligne.
+    Retourne (same, common) : matrices n × n (NumPy ou listes de listes)
+    des scrutins d'accord et des scrutins exprimés en commun.
+    """
+    if vectorized is None:
+        vectorized = np is not None
+    if vectorized:
+        return _counts_np(columns, n_rows)
+    return _counts_py(columns)
+
+
+# ---------------------------------------------------------------------------
+# Députés
+# ---------------------------------------------------------------------------
+
+def _top_py(same, common, ids: list[str], k: int, min_common: int) -> list[list[int]]:
+    result = []
+    for i in range(len(ids)):
+        same_i, common_i = same[i], common[i]
+        cand = [j for j in range(len(ids)) if j != i and common_i[j] >= min_common]
+        cand.sort(key=lambda j: (-(same_i[j] / common_i[j]), -common_i[j], ids[j]))
+        result.append(cand[:k])
+    return result
+
+
+def _top_np(same, common, ids: list[str], k: int, min_common: int) -> list[list[int]]:
+    n = len(ids)
+    id_rank = np.empty(n, dtype=np.int64)
+    id_rank[sorted(range(n), key=ids.__getitem__)] = np.arange(n)
+    valid = common >= min_common
+    np.fill_diagonal(valid, False)
+    rate = np.divide(same, common, out=np.zeros((n, n)), where=common > 0)
+    result = []
+    for i in range(n):
+        cand = np.flatnonzero(valid[i])
+        order = np.lexsort((id_rank[cand], -common[i, cand], -rate[i, cand]))
+        result.append(cand[order[:k]].tolist())
+    return result
+
+
+def deputy_neighbours(acc: VoteAccumulator, k: int = TOP_K,
+                      min_common: int = MIN_COMMON,
+                      vectorized: bool | None = None) -> dict[str, list]:
+    """
+    person_id -> [[person_id voisin, taux d'accord %, scrutins communs], ...]
+    du plus proche au moins proche (égalités : plus de scrutins communs,
+    puis person_id).
+    """
+    if vectorized is None:
+        vectorized = np is not None
+    codes, columns = [], []
+    for p, votes in acc.histories():
+        codes.append(p)
+        columns.append([(row, pos) for row, pos in votes if pos < EXPRESSED])
+    if not codes:
+        return {}
+    ids = [acc.table.person_ids[p] for p in codes]
+
+    same, common = agreement_counts(columns, len(acc.scrutins), vectorized)
+    top = (_top_np if vectorized else _top_py)(same, common, ids, k, min_common)
+    result = {}
+    for i, neighbours in enumerate(top):
+        result[ids[i]] = [
+            [ids[j], round(int(same[i][j]) / int(common[i][j]) * 100, 1), int(common[i][j])]
+            for j in neighbours
+        ]
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Groupes
+# ---------------------------------------------------------------------------
+
+def group_matrix(acc: VoteAccumulator, groups: list[dict],
+                 vectorized: bool | None = None) -> dict:
+    """
+    Matrice groupe × groupe pour les groupes de `groups` (fiches, même
+    ordre) : "agreement" en % (None sans scrutin commun) et "common".
+    """
+    listed = {g["group_id"]: i for i, g in enumerate(groups)}
+    rows: dict[str, int] = {}
+    columns = [[] for _ in groups]
+    for gid, per_scrutin in acc.group_votes():
+        i = listed.get(gid)
+        if i is None:
+            continue
+        for r in per_scrutin:
+            counts = [r["group_counts"][key] for key in POSITION_KEYS[:EXPRESSED]]
+            best = max(counts)
+            if best:
+                row = rows.setdefault(r["scrutin_id"], len(rows))
+                columns[i].append((row, counts.index(best)))
+
+    same, common = agreement_counts(columns, len(rows), vectorized)
+    n = len(groups)
+    return {
+        "groups": [
+            {"group_id": g["group_id"], "acronym": g["acronym"], "name": g["name"]}
+            for g in groups
+        ],
+        "agreement": [
+            [round(int(same[i][j]) / int(common[i][j]) * 100, 1) if common[i][j] else None
+             for j in range(n)]
+            for i in range(n)
+        ],
+        "common": [[int(common[i][j]) for j in range(n)] for i in range(n)],
+    }
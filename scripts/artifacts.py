@@ -0,0 +1,132 @@
+"""
+Ecriture des fichiers de data/ avec manifeste.
+
+data/manifest.json garde l'empreinte (sha256, taille) de chaque fichier
+logique ("index.json", "scrutins/2025-03.json", ...) :
+- un fichier dont le contenu n'a pas changé n'est pas réécrit ;
+- en mode assets, chaque fichier a aussi une copie immuable au nom haché
+  (data/assets/scrutins/2025-03.<hash>.json) avec ses variantes .gz et .br,
+  et l'entrée du manifeste pointe dessus ("path"). Un hébergement statique
+  peut servir data/assets/ avec un cache long : seul le manifeste est
+  revalidé à chaque visite.
+
+Chaque fichier est écrit à côté sous un nom temporaire puis renommé
+(os.replace) : un lecteur voit l'ancienne ou la nouvelle version, jamais un
+fichier tronqué, et un fichier partagé par lien dur avec une autre copie de
+data/ (mode --watch, voir publish.py) n'est pas modifié sur place.
+"""
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import instrument
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+ASSETS_DIR = "assets"
+
+GZIP_LEVEL = 9
+# 11 ne gagne que ~2 % pour un temps x90 sur les fichiers de mois
+BROTLI_QUALITY = 9
+
+
+def _hashed_path(rel: str, digest: str) -> str:
+    """'scrutins/2025-03.json' -> 'assets/scrutins/2025-03.<hash>.json'"""
+    p = Path(rel)
+    return (Path(ASSETS_DIR) / p.parent / f"{p.stem}.{digest[:12]}{p.suffix}").as_posix()
+
+
+def write_atomic(path: Path, data: bytes) -> int:
+    """Remplace `path` par `data` en un renommage. Retourne la taille écrite."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    try:
+        n = tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return n
+
+
+class ArtifactWriter:
+
+    def __init__(self, data_dir: Path, assets: bool = False):
+        self.data_dir = data_dir
+        self.assets = assets
+        self.manifest_path = data_dir / MANIFEST_NAME
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            files = manifest["files"] if manifest.get("version") == MANIFEST_VERSION else {}
+        except (OSError, ValueError, KeyError):
+            files = {}
+        self.files: dict[str, dict] = files
+        self.written = 0
+        self.skipped = 0
+
+    def _rel(self, path: Path) -> str:
+        return path.relative_to(self.data_dir).as_posix()
+
+    def write(self, path: Path, data: bytes) -> bool:
+        """Ecrit `data` dans `path` si le contenu a changé. Retourne True si écrit."""
+        rel = self._rel(path)
+        digest = hashlib.sha256(data).hexdigest()
+        entry = {"sha256": digest, "size": len(data)}
+        if self.assets:
+            entry["path"] = _hashed_path(rel, digest)
+
+        if (self.files.get(rel) == entry and path.exists()
+                and (not self.assets or (self.data_dir / entry["path"]).exists())):
+            self.skipped += 1
+            return False
+
+        n = write_atomic(path, data)
+        if self.assets:
+            hashed = self.data_dir / entry["path"]
+            n += write_atomic(hashed, data)
+            n += write_atomic(hashed.with_name(hashed.name + ".gz"),
+                              gzip.compress(data, GZIP_LEVEL, mtime=0))
+            if brotli is not None:
+                n += write_atomic(hashed.with_name(hashed.name + ".br"),
+                                  brotli.compress(data, quality=BROTLI_QUALITY))
+        instrument.add_bytes(n)
+        self.files[rel] = entry
+        self.written += 1
+        return True
+
+    def remove(self, path: Path):
+        path.unlink(missing_ok=True)
+        self.files.pop(self._rel(path), None)
+
+    def close(self):
+        """Ecrit le manifeste et supprime les copies hachées orphelines."""
+        self.files = {
+            rel: entry for rel, entry in self.files.items()
+            if (self.data_dir / rel).exists()
+        }
+        referenced = {entry["path"] for entry in self.files.values() if "path" in entry}
+        assets_dir = self.data_dir / ASSETS_DIR
+        if assets_dir.exists():
+            for path in assets_dir.rglob("*"):
+                if not path.is_file():
+                    continue
+                rel = self._rel(path)
+                base = rel.removesuffix(".gz").removesuffix(".br")
+                if base not in referenced:
+                    path.unlink()
+            for path in [*sorted(assets_dir.rglob("*"), reverse=True), assets_dir]:
+                if path.is_dir() and not any(path.iterdir()):
+                    path.rmdir()
+
+        manifest = {"version": MANIFEST_VERSION, "files": self.files}
+        write_atomic(
+            self.manifest_path,
+            (json.dumps(manifest, separators=(",", ":"), sort_keys=True) + "\n").encode("utf-8"),
+        )
@@ -0,0 +1,101 @@
+"""
+Taux d'accord entre députés (agreement.py) sur plusieurs législatures
+synthétiques : produits matriciels par blocs (NumPy) contre bitsets
+(Python pur), puis sélection des voisins. Vérifie que les deux chemins
+donnent les mêmes comptages.
+
+    python scripts/bench/bench_agreement.py [--legislatures 1 2 4] [--scrutins 4000]
+
+Chaque législature compte 577 sièges, dont un tiers de réélus de la
+précédente ; chaque groupe suit une consigne par scrutin avec quelques
+dissidents, la participation varie d'un scrutin à l'autre.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np  # noqa: E402
+
+from agreement import (MIN_COMMON, TOP_K, _top_np, _top_py,  # noqa: E402
+                       agreement_counts)
+from synthetic import GROUPS, chamber  # noqa: E402
+
+
+def _columns(n_legislatures: int, n_scrutins: int, seed: int = 0):
+    """columns[j] = [(ligne, position)] de chaque député, toutes législatures."""
+    rng = random.Random(seed)
+    members = chamber()
+    people = []
+    columns: list[list[tuple[int, int]]] = []
+    row = 0
+    seats = []
+    for leg in range(n_legislatures):
+        # un tiers de réélus, les autres sièges à de nouveaux députés
+        keep = set(rng.sample(range(len(seats)), len(seats) // 3)) if seats else set()
+        new_seats = []
+        for k, (_, gid) in enumerate(members):
+            if k in keep:
+                j = seats[k][0]
+            else:
+                j = len(people)
+                people.append(f"PA{leg}{k:04d}")
+                columns.append([])
+            new_seats.append((j, gid))
+        seats = new_seats
+        for _ in range(n_scrutins):
+            line = {gid: rng.randrange(3) for gid, *_ in GROUPS}
+            turnout = rng.choice([0.1, 0.3, 0.9, 1.0])
+            for j, gid in seats:
+                if rng.random() > turnout:
+                    continue
+                pos = line[gid] if rng.random() < 0.95 else rng.randrange(3)
+                columns[j].append((row, pos))
+            row += 1
+    return people, columns, row
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--legislatures", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--scrutins", type=int, default=4000, help="scrutins par législature")
+    ap.add_argument("--python-max", type=int, default=2,
+                    help="nombre max de législatures pour le chemin Python (lent)")
+    args = ap.parse_args()
+
+    for n_leg in args.legislatures:
+        ids, columns, n_rows = _columns(n_leg, args.scrutins)
+        n_votes = sum(len(c) for c in columns)
+        print(f"{n_leg} législature(s) : {len(ids)} députés, {n_rows} scrutins, "
+              f"{n_votes} votes exprimés")
+
+        t0 = time.perf_counter()
+        same, common = agreement_counts(columns, n_rows, vectorized=True)
+        dt_counts = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        top = _top_np(same, common, ids, TOP_K, MIN_COMMON)
+        dt_top = time.perf_counter() - t0
+        print(f"   NumPy (blocs) : comptages {dt_counts:6.2f}s  voisins {dt_top:6.2f}s")
+
+        if n_leg > args.python_max:
+            continue
+        t0 = time.perf_counter()
+        same_py, common_py = agreement_counts(columns, n_rows, vectorized=False)
+        dt_counts = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        top_py = _top_py(same_py, common_py, ids, TOP_K, MIN_COMMON)
+        dt_top = time.perf_counter() - t0
+        print(f"   Python (bits) : comptages {dt_counts:6.2f}s  voisins {dt_top:6.2f}s")
+
+        if not (np.array_equal(same, same_py) and np.array_equal(common, common_py)
+                and top == top_py):
+            print("❌ chemins différents")
+            sys.exit(1)
+        print("   ✅ mêmes comptages, mêmes voisins")
+
+
+if __name__ == "__main__":
+    main()
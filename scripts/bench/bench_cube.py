@@ -0,0 +1,105 @@
+"""
+Cube groupe × thème × mois et député × thème (cube.py) : temps des deux
+chemins (NumPy / Python), parité, et fenêtres glissantes lues dans le cube
+cumulé comparées à un recomptage direct sur les votes.
+
+    python scripts/bench/bench_cube.py [--scrutins 2000] [--window 3]
+
+Scrutins synthétiques sur deux ans (un à trois thèmes chacun, doublons de
+mise au point, députés sans groupe, voir check_aggregate.py).
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import cube  # noqa: E402
+from aggregate import POSITION_KEYS, accumulate  # noqa: E402
+from check_aggregate import _synthetic  # noqa: E402
+from votes import POSITIONS, VoteTable  # noqa: E402
+
+THEMES = ["budget", "sante", "environnement", "institutions", "autre"]
+
+
+def _scrutins(n: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    scrutins = _synthetic(n, seed)
+    for i, s in enumerate(scrutins):
+        s["date"] = f"{2024 + i % 2}-{1 + i % 12:02d}-{1 + i % 28:02d}"
+        s["themes"] = sorted(rng.sample(THEMES, rng.randint(1, 3)))
+    scrutins.sort(key=lambda s: (s["date"], s["id"]), reverse=True)
+    return scrutins
+
+
+def _direct(scrutins: list[dict], gid: str, theme: str, months: set[str]) -> list[int]:
+    """
+    GROUP_MEASURES recomptées sur toutes les lignes de votes, comme le cube :
+    chaque ligne compte pour le groupe du premier vote de la personne.
+    """
+    measures = [0] * len(cube.GROUP_MEASURES)
+    for s in scrutins:
+        if s["date"][:7] not in months or (theme != cube.ALL_THEMES and theme not in s["themes"]):
+            continue
+        counts = [0] * len(POSITION_KEYS)
+        held = {}
+        for v in s["votes"]:
+            if held.setdefault(v["person_id"], v["group"]) == gid:
+                counts[POSITIONS.index(v["position"])] += 1
+        if sum(counts):
+            measures = [a + b for a, b in zip(measures, [*counts, 1, max(counts)])]
+    return measures
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scrutins", type=int, default=2000)
+    ap.add_argument("--window", type=int, default=3, help="fenêtre glissante (mois)")
+    args = ap.parse_args()
+
+    scrutins = _scrutins(args.scrutins)
+    print(f"{len(scrutins)} scrutins, {sum(len(s['votes']) for s in scrutins)} votes")
+    votes = {s["id"]: list(s["votes"]) for s in scrutins}
+
+    VoteTable.from_scrutins(scrutins)
+    out = {}
+    for label, vectorized in [("python", False), ("numpy", True)]:
+        acc = accumulate(scrutins, vectorized=vectorized)
+        groups = acc.groups()
+        t0 = time.perf_counter()
+        g = cube.group_cube(acc, groups, vectorized=vectorized)
+        dt_groups = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        d = cube.deputy_cube(acc, vectorized=vectorized)
+        dt_deputies = time.perf_counter() - t0
+        out[label] = (g, d)
+        print(f"{label:>6}: groupe × thème × mois {dt_groups:6.3f}s  "
+              f"député × thème {dt_deputies:6.3f}s")
+    if out["python"] != out["numpy"]:
+        print("❌ chemins différents")
+        sys.exit(1)
+    print("✅ mêmes cubes")
+
+    g, _ = out["numpy"]
+    for s in scrutins:
+        s["votes"] = votes[s["id"]]
+    rng = random.Random(1)
+    n = len(g["months"])
+    for _ in range(20):
+        i = rng.randrange(len(g["groups"]))
+        t = rng.randrange(len(g["themes"]))
+        last = rng.randrange(n)
+        first = max(0, last - args.window + 1)
+        got = cube.window(g, i, t, first, last)
+        want = _direct(scrutins, g["groups"][i], g["themes"][t], set(g["months"][first:last + 1]))
+        if got != want:
+            print(f"❌ fenêtre {g['groups'][i]} {g['themes'][t]} "
+                  f"{g['months'][first]}..{g['months'][last]} : {got} != {want}")
+            sys.exit(1)
+    print(f"✅ fenêtres de {args.window} mois identiques au recomptage direct")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Taille et temps de parsing des fichiers de mois : format historique vs
+colonnaire, indenté vs minifié. Vérifie aussi l'aller-retour
+encode -> decode_month sur chaque mois.
+
+    python scripts/bench/bench_format.py [--data data]
+
+Les mois sont relus depuis data/scrutins/*.json (format historique) ;
+sans export historique dans --data, entrée synthétique (--synthetic N
+scrutins, comme check_aggregate.py).
+"""
+import argparse
+import gzip
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import columnar  # noqa: E402
+from aggregate import accumulate  # noqa: E402
+from check_aggregate import _synthetic  # noqa: E402
+from export import _json_default  # noqa: E402
+
+
+def _dumps(obj, minify: bool) -> str:
+    if minify:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"),
+                          sort_keys=True, default=_json_default)
+    return json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=True,
+                      default=_json_default)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--data", type=Path, default=Path("data"))
+    ap.add_argument("--repeat", type=int, default=5, help="parsings par mesure")
+    ap.add_argument("--synthetic", type=int, default=500,
+                    help="scrutins synthétiques si --data n'a pas de mois")
+    args = ap.parse_args()
+
+    legacy = {}
+    scrutins = []
+    for path in sorted((args.data / "scrutins").glob("*.json")):
+        month = json.loads(path.read_text(encoding="utf-8"))
+        if month.get("format") == columnar.FORMAT:
+            sys.exit(f"{path} est déjà colonnaire : relancer sur un export historique")
+        legacy[month["month"]] = month
+        scrutins.extend(month["scrutins"])
+    if not legacy:
+        print(f"⚠️ aucun mois dans {args.data / 'scrutins'} : "
+              f"{args.synthetic} scrutins synthétiques")
+        scrutins = _synthetic(args.synthetic)
+
+    acc = accumulate(scrutins)
+    if not legacy:
+        # mois tels que les écrit export.write_month
+        for m, items in acc.by_month.items():
+            items.sort(key=lambda x: (x["date"], x["id"]), reverse=True)
+            legacy[m] = {"month": m, "scrutins": items}
+    # référence : le texte exact du format historique
+    reference = {m: _dumps(doc, False) for m, doc in legacy.items()}
+
+    people = acc.people()
+    groups, person_index, group_index = columnar.dictionaries(acc.table, people)
+    dictionary = columnar.fingerprint(people, groups)
+    people_doc = {"people": people, "groups": groups, "dictionary": dictionary}
+    encoded = {
+        m: columnar.encode_month(m, acc.by_month[m], dictionary, person_index, group_index)
+        for m in legacy
+    }
+    print(f"{len(legacy)} mois, {len(scrutins)} scrutins, "
+          f"{sum(len(s['votes']) for s in scrutins)} votes")
+
+    variants = [
+        ("historique", legacy, False),
+        ("historique minifié", legacy, True),
+        ("colonnaire", encoded, False),
+        ("colonnaire minifié", encoded, True),
+    ]
+    base = None
+    for label, docs, minify in variants:
+        texts = [_dumps(doc, minify) for doc in docs.values()]
+        size = sum(len(t.encode("utf-8")) for t in texts)
+        gz = sum(len(gzip.compress(t.encode("utf-8"))) for t in texts)
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            for t in texts:
+                json.loads(t)
+        dt = (time.perf_counter() - t0) / args.repeat
+        base = base or size
+        print(f"{label:>20}: {size / 1e6:8.2f} Mo  gzip {gz / 1e6:7.2f} Mo  "
+              f"parse {dt * 1000:8.1f} ms  (x{base / size:.1f})")
+
+    # aller-retour : le décodeur de référence redonne le texte historique
+    for m, doc in encoded.items():
+        decoded = columnar.decode_month(json.loads(_dumps(doc, True)), people_doc)
+        if _dumps(decoded, False) != reference[m]:
+            print(f"❌ aller-retour différent pour {m}")
+            sys.exit(1)
+    print(f"✅ aller-retour identique sur {len(encoded)} mois")
+
+
+if __name__ == "__main__":
+    main()
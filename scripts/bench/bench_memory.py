@@ -0,0 +1,100 @@
+"""
+Pic mémoire (RSS max) des votes en dicts vs VoteTable.
+
+    python scripts/bench/bench_memory.py [--scrutins 3000] [--deputies 577]
+
+Chaque mode tourne dans un sous-processus dédié pour que le pic mesuré
+(resource.getrusage, ru_maxrss) ne dépende que de lui :
+- dicts : un dict par vote, enrichi des noms comme l'ancien fetch_an_scrutins ;
+- table : VoteTable colonnaire + une VoteSlice par scrutin.
+"""
+import argparse
+import random
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from synthetic import ASSEMBLEE, GROUPS, chamber  # noqa: E402
+from votes import POSITIONS, VoteTable  # noqa: E402
+
+
+def _referentiels(members):
+    acteurs = {pid: {"name": f"Prénom{i} Nom{i}"} for i, (pid, _) in enumerate(members)}
+    organes = {gid: {"name": name, "acronym": acronym} for gid, acronym, name, _ in GROUPS}
+    organes[ASSEMBLEE] = {"name": "Assemblée nationale", "acronym": "Assemblée"}
+    return acteurs, organes
+
+
+def _raw_votes(n_scrutins, members, seed=0):
+    """Votes compacts (person_id, position, group), comme en sortie de parsing."""
+    rng = random.Random(seed)
+    for _ in range(n_scrutins):
+        yield [(pid, rng.choice(POSITIONS), gid) for pid, gid in members]
+
+
+def _build(mode, n_scrutins, n_deputies):
+    members = chamber(n_deputies)
+    acteurs, organes = _referentiels(members)
+    scrutins = []
+    for i, votes in enumerate(_raw_votes(n_scrutins, members)):
+        scrutins.append({"id": f"AN-17-{i}", "votes": votes})
+
+    t0 = time.perf_counter()
+    if mode == "dicts":
+        for s in scrutins:
+            out = []
+            for pid, pos, gid in s["votes"]:
+                org = organes.get(gid, {})
+                out.append({
+                    "person_id": pid,
+                    "position": pos,
+                    "group": gid,
+                    "constituency": None,
+                    "name": acteurs.get(pid, {}).get("name", "Inconnu"),
+                    "group_name": org.get("name"),
+                    "group_acronym": org.get("acronym"),
+                })
+            s["votes"] = out
+    else:
+        table = VoteTable(acteurs, organes)
+        for s in scrutins:
+            s["votes"] = table.append(s["votes"])
+    dt = time.perf_counter() - t0
+
+    n_votes = sum(len(s["votes"]) for s in scrutins)
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # Ko sous Linux
+    print(f"{mode}\t{rss}\t{dt:.3f}\t{n_votes}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scrutins", type=int, default=3000)
+    ap.add_argument("--deputies", type=int, default=577)
+    ap.add_argument("--mode", choices=["dicts", "table"], help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.mode:
+        _build(args.mode, args.scrutins, args.deputies)
+        return
+
+    results = {}
+    for mode in ("dicts", "table"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--mode", mode,
+             "--scrutins", str(args.scrutins), "--deputies", str(args.deputies)],
+            check=True, capture_output=True, text=True,
+        ).stdout.split()
+        _, rss, dt, n_votes = out
+        results[mode] = int(rss)
+        print(f"{mode:>6}: pic RSS {int(rss) / 1024:8.1f} Mo  "
+              f"construction {float(dt):6.2f}s  ({n_votes} votes)")
+
+    print(f"gain mémoire: x{results['dicts'] / results['table']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Conversion des votes en Parquet : export_parquet (colonnes de la VoteTable)
+contre la conversion naïve des fichiers de mois (un dict par vote,
+pa.Table.from_pylist). Vérifie que les deux jeux de données sont égaux, et
+le décompte d'abstentions du scrutin de contrôle (voir bench_sqlite.py)
+dans scrutins.parquet.
+
+    python scripts/bench/bench_parquet.py [--data data] [--out /tmp/bench_parquet]
+"""
+import argparse
+import shutil
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pyarrow as pa  # noqa: E402
+import pyarrow.dataset as ds  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+
+from aggregate import accumulate  # noqa: E402
+from bench_sqlite import _check_scrutin, _load  # noqa: E402
+from dataset import export_parquet  # noqa: E402
+
+
+def _naive(scrutins: list[dict], out: Path):
+    by_month = {}
+    for s in scrutins:
+        d = date.fromisoformat(s["date"])
+        by_month.setdefault(s["date"][:7], []).extend(
+            {"scrutin_id": s["id"], "date": d, "person_id": v["person_id"],
+             "group_id": v.get("group"), "position": v["position"]}
+            for v in s["votes"]
+        )
+    for month, rows in by_month.items():
+        path = out / f"month={month}" / "part-0.parquet"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(pa.Table.from_pylist(rows), path, compression="zstd")
+
+
+def _rows(path: Path) -> list[tuple]:
+    t = ds.dataset(path, partitioning="hive").to_table()
+    cols = ["scrutin_id", "date", "person_id", "group_id", "position", "month"]
+    return sorted(zip(*[t[c].cast(pa.string()).to_pylist() for c in cols]))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--data", type=Path, default=Path("data"))
+    ap.add_argument("--out", type=Path, default=Path("/tmp/bench_parquet"))
+    args = ap.parse_args()
+
+    shutil.rmtree(args.out, ignore_errors=True)
+    scrutins = _load(args.data)
+    check = _check_scrutin(scrutins)
+    scrutins.append(check)
+    n_votes = sum(len(s["votes"]) for s in scrutins)
+    print(f"{len(scrutins)} scrutins, {n_votes} votes")
+
+    t0 = time.perf_counter()
+    _naive(scrutins, args.out / "naive")
+    naive_dt = time.perf_counter() - t0
+    print(f"  dicts + from_pylist: {naive_dt:6.2f}s")
+
+    acc = accumulate(scrutins)  # votes déjà en VoteTable dans generate.py
+    t0 = time.perf_counter()
+    export_parquet(args.out / "export", scrutins, "bench", acc)
+    dt = time.perf_counter() - t0
+    size = sum(f.stat().st_size for f in (args.out / "export" / "votes").rglob("*.parquet"))
+    print(f"       export_parquet: {dt:6.2f}s  (x{naive_dt / dt:.1f})  {size / 1e6:.2f} Mo")
+
+    if _rows(args.out / "naive") != _rows(args.out / "export" / "votes"):
+        print("❌ jeux de données différents")
+        sys.exit(1)
+    print("✅ mêmes votes")
+
+    t = pq.read_table(args.out / "export" / "scrutins.parquet",
+                      filters=[("scrutin_id", "=", check["id"])])
+    abstain = t["count_abstain"].to_pylist()
+    if abstain != [check["counts"]["abstention"]]:
+        print(f"❌ count_abstain {abstain}, [{check['counts']['abstention']}] attendu")
+        sys.exit(1)
+    print("✅ décompte d'abstentions")
+
+
+if __name__ == "__main__":
+    main()
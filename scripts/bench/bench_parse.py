@@ -0,0 +1,118 @@
+"""
+Compare _parse_one_xml (arbre + XPath) et _stream_one_xml (iterparse)
+sur le ZIP des scrutins en cache.
+
+    python scripts/bench/bench_parse.py [--zip .cache/an/17/Scrutins.xml.zip] [--limit N]
+    python scripts/bench/bench_parse.py --composite [--zip Scrutins_XIV.xml.zip] [--workers N]
+
+Sans ZIP en cache, un ZIP synthétique est généré (voir synthetic.py).
+Les sorties des deux parseurs sont comparées membre par membre.
+
+--composite : dump en un seul XML <scrutins> (anciennes législatures) ;
+l'extraction par élément (iterparse + XPath) est comparée à
+_parse_composite_xml (un processus) et au découpage en tranches entre
+--workers processus (_parse_all_members).
+"""
+import argparse
+import os
+import sys
+from io import BytesIO
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from lxml import etree  # noqa: E402
+
+from sources.an import (  # noqa: E402
+    _cache_dir, _compact_votes, _parse_all_members, _parse_composite_xml,
+    _parse_one_xml, _scrutin_from_element, _stream_one_xml,
+)
+from synthetic import write_scrutins_zip  # noqa: E402
+
+
+def _tree_composite(fileobj) -> list[dict]:
+    """Extraction par élément <scrutin> fermé (arbre + XPath), référence."""
+    out = []
+    for _, el in etree.iterparse(fileobj, events=("end",), tag="{*}scrutin"):
+        out.extend(_scrutin_from_element(el))
+        el.clear(keep_tail=True)
+        while el.getprevious() is not None:
+            del el.getparent()[0]
+    return out
+
+
+def _composite(zip_path: Path, workers: int):
+    with zipfile.ZipFile(zip_path) as zf:
+        names = [n for n in zf.namelist() if n.endswith(".xml")]
+    results = {}
+    for label, parse in [("tree", _tree_composite), ("stream", _parse_composite_xml)]:
+        t0 = time.perf_counter()
+        with zipfile.ZipFile(zip_path) as zf:
+            out = [_compact_votes(parse(zf.open(n))) for n in names]
+        results[label] = (out, time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    out = [recs for parsed in _parse_all_members(zip_path, names, workers, composite=True)
+           for recs in parsed.values()]
+    results[f"{workers} workers"] = (out, time.perf_counter() - t0)
+
+    reference, tree_dt = results["tree"]
+    n = sum(len(r) for r in reference)
+    for label, (out, dt) in results.items():
+        print(f"{label:>10}: {dt:7.2f}s  {n / dt:8.1f} scrutins/s  (x{tree_dt / dt:.1f})")
+    for label, (out, _) in results.items():
+        if out != reference:
+            print(f"❌ {label} : sorties différentes")
+            sys.exit(1)
+    print(f"✅ sorties identiques sur {n} scrutins")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--zip", type=Path, default=_cache_dir() / "Scrutins.xml.zip")
+    ap.add_argument("--limit", type=int, default=0)
+    ap.add_argument("--synthetic", type=int, default=300,
+                    help="nombre de scrutins si le ZIP est absent")
+    ap.add_argument("--composite", action="store_true")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = ap.parse_args()
+
+    zip_path = args.zip
+    if not zip_path.exists() or (args.composite and args.zip == ap.get_default("zip")):
+        zip_path = Path(tempfile.mkdtemp()) / "Scrutins.xml.zip"
+        print(f"génération de {args.synthetic} scrutins synthétiques"
+              f"{' (dump composite)' if args.composite else ''}")
+        write_scrutins_zip(zip_path, args.synthetic, composite=args.composite)
+    if args.composite:
+        _composite(zip_path, args.workers)
+        return
+
+    with zipfile.ZipFile(zip_path) as zf:
+        names = [n for n in zf.namelist() if n.endswith(".xml")]
+        if args.limit:
+            names = names[:args.limit]
+        blobs = [zf.read(n) for n in names]
+
+    results = {}
+    for label, fn in [("tree", _parse_one_xml), ("stream", _stream_one_xml)]:
+        t0 = time.perf_counter()
+        out = [fn(BytesIO(b)) for b in blobs]
+        dt = time.perf_counter() - t0
+        results[label] = (out, dt)
+        n_votes = sum(len(s["votes"]) for r in out for s in r)
+        print(f"{label:>6}: {dt:7.2f}s  {len(blobs) / dt:8.1f} fichiers/s  ({n_votes} votes)")
+
+    tree_out, tree_dt = results["tree"]
+    stream_out, stream_dt = results["stream"]
+    diffs = [n for n, a, b in zip(names, tree_out, stream_out) if a != b]
+    print(f"speedup: x{tree_dt / stream_dt:.1f}")
+    if diffs:
+        print(f"❌ {len(diffs)} sorties différentes, ex: {diffs[:5]}")
+        sys.exit(1)
+    print(f"✅ sorties identiques sur {len(names)} fichiers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Pic mémoire (RSS max) de generate.py : build en mémoire vs build en flux
+(--stream), pour des législatures synthétiques de plus en plus longues à
+nombre de scrutins par mois constant.
+
+    python scripts/bench/bench_pipeline.py [--months 6 12 24] [--per-month 150]
+
+Pour chaque taille, un répertoire de travail temporaire reçoit une copie de
+scripts/, data/themes.json et des archives synthétiques dans .cache/an/17. Le
+cache parsé est rempli par un premier build, puis chaque mode tourne dans
+un sous-processus dédié (resource.getrusage, ru_maxrss) sur un data/ vide.
+Le pic du build en mémoire croît avec la législature ; celui du build en
+flux doit rester à peu près constant (borné par le plus gros mois).
+"""
+import argparse
+import resource
+import runpy
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from synthetic import write_acteurs_zip, write_scrutins_zip  # noqa: E402
+
+ROOT = Path(__file__).resolve().parents[2]
+
+MODES = {
+    "mémoire": ["--offline"],
+    "flux": ["--offline", "--stream"],
+}
+
+
+def _run(workdir: Path, argv: list[str]):
+    """Exécuté dans le sous-processus : generate.py dans `workdir`."""
+    import os
+
+    os.chdir(workdir)
+    sys.argv = ["generate.py", *argv]
+    sys.path.insert(0, str(workdir / "scripts"))
+    t0 = time.perf_counter()
+    runpy.run_path(str(workdir / "scripts" / "generate.py"), run_name="__main__")
+    dt = time.perf_counter() - t0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # Ko sous Linux
+    print(f"RSS\t{rss}\t{dt:.2f}")
+
+
+def _workdir(base: Path, months: int, per_month: int) -> Path:
+    workdir = base / f"m{months}"
+    shutil.copytree(ROOT / "scripts", workdir / "scripts",
+                    ignore=shutil.ignore_patterns("__pycache__", "bench"))
+    (workdir / "data").mkdir(parents=True)
+    shutil.copy(ROOT / "data" / "themes.json", workdir / "data" / "themes.json")
+    cache = workdir / ".cache" / "an" / "17"
+    write_scrutins_zip(cache / "Scrutins.xml.zip", months * per_month, days=months * 30)
+    write_acteurs_zip(cache / "Acteurs.json.zip")
+    return workdir
+
+
+def _reset_data(workdir: Path):
+    for path in (workdir / "data").iterdir():
+        if path.name == "themes.json":
+            continue
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+    (workdir / ".cache" / "build.json").unlink(missing_ok=True)
+
+
+def _measure(workdir: Path, argv: list[str]) -> tuple[int, float]:
+    _reset_data(workdir)
+    out = subprocess.run(
+        [sys.executable, __file__, "--run", str(workdir), "--", *argv],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    _, rss, dt = out.strip().splitlines()[-1].split("\t")
+    return int(rss), float(dt)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--months", type=int, nargs="+", default=[6, 12, 24])
+    ap.add_argument("--per-month", type=int, default=150)
+    ap.add_argument("--run", type=Path, help=argparse.SUPPRESS)
+    ap.add_argument("argv", nargs="*", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.run:
+        _run(args.run, args.argv)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for months in args.months:
+            workdir = _workdir(Path(tmp), months, args.per_month)
+            # remplit le cache parsé : les mesures ne comptent que le build
+            _measure(workdir, MODES["flux"])
+            line = [f"{months:3d} mois, {months * args.per_month:5d} scrutins"]
+            for label, argv in MODES.items():
+                rss, dt = _measure(workdir, argv)
+                line.append(f"{label}: {rss / 1024:7.1f} Mo {dt:6.1f}s")
+            print("  ".join(line))
+            shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
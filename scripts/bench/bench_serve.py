@@ -0,0 +1,200 @@
+"""
+Test de charge du serveur de requêtes (serve.py) en local.
+
+    python scripts/bench/bench_serve.py [--data data] [--clients 32] [--duration 10]
+    python scripts/bench/bench_serve.py --url http://127.0.0.1:8080   # serveur déjà lancé
+
+Sans --url, lance serve.py sur un port libre dans un sous-processus. Des
+clients asyncio (une connexion keep-alive chacun) rejouent un mélange de
+requêtes tirées du jeu de données (listes filtrées, détails de scrutins,
+historiques et fiches de députés, chronologies de groupes), en trois
+phases :
+
+- froid   : chaque URL une fois (cache de réponses vide), sans limite de
+            durée ;
+- chaud   : mêmes URL en boucle, servies par le cache ;
+- 304     : mêmes URL avec If-None-Match (ETag de la phase froide).
+
+Les phases chaude et 304 durent --duration secondes chacune.
+
+Pour chaque phase : requêtes/s, latences p50/p95/p99, statuts ; puis l'état
+du cache (/health).
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+SCRIPTS = Path(__file__).resolve().parents[1]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _request(reader, writer, host: str, path: str, headers: dict | None = None):
+    """GET en keep-alive -> (statut, en-têtes, corps)."""
+    lines = [f"GET {path} HTTP/1.1", f"Host: {host}"]
+    lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    status = int(head[0].split(" ", 2)[1])
+    out = {}
+    for line in head[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            out[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(out.get("content-length") or 0))
+    return status, out, body
+
+
+async def _get_json(host: str, port: int, path: str):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, _, body = await _request(reader, writer, host, path)
+        return json.loads(body)
+    finally:
+        writer.close()
+
+
+def _urls(data_dir: Path, n: int, seed: int = 0) -> list[str]:
+    """n URL distinctes (ou presque) tirées du jeu de données."""
+    rng = random.Random(seed)
+    index = json.loads((data_dir / "index.json").read_text(encoding="utf-8"))
+    scrutins = index["scrutins"]
+    months = index["months"]
+    themes = sorted({t for s in scrutins for t in s.get("themes", [])})
+    deputies = [d["person_id"] for d in
+                json.loads((data_dir / "deputies.json").read_text(encoding="utf-8"))["deputies"]]
+    groups = [g["group_id"] for g in
+              json.loads((data_dir / "groups.json").read_text(encoding="utf-8"))["groups"]]
+
+    makers = [
+        lambda: f"/scrutins?theme={quote(rng.choice(themes))}&page={rng.randint(1, 3)}",
+        lambda: (f"/scrutins?from={rng.choice(months)}&to={rng.choice(months)}"
+                 f"&per_page={rng.choice([20, 50, 100])}"),
+        lambda: f"/scrutins/{rng.choice(scrutins)['id']}",
+        lambda: f"/deputies/{rng.choice(deputies)}",
+        lambda: (f"/deputies/{rng.choice(deputies)}/votes"
+                 f"?page={rng.randint(1, 4)}&position={rng.choice(['', 'FOR', 'AGAINST'])}"),
+        lambda: f"/groups/{rng.choice(groups)}/timeline?theme={quote(rng.choice(themes))}"
+                f"&window={rng.choice([1, 3, 12])}",
+        lambda: f"/deputies?group={rng.choice(groups)}&page={rng.randint(1, 2)}",
+    ]
+    urls = set()
+    for _ in range(n * 20):
+        if len(urls) >= n:
+            break
+        urls.add(rng.choice(makers)())
+    return sorted(urls)
+
+
+async def _phase(host: str, port: int, urls: list[str], clients: int,
+                 duration: float | None, etags: dict | None = None, record: dict | None = None):
+    """
+    Clients en parallèle sur `urls` pendant `duration` s (None : chaque URL
+    une fois) -> (n, durée, latences, statuts).
+    """
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    deadline = time.perf_counter() + (duration or float("inf"))
+    cursor = iter(range(len(urls) if duration is None else 1 << 62))
+
+    async def client():
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for i in cursor:
+                if time.perf_counter() >= deadline:
+                    break
+                path = urls[i % len(urls)]
+                headers = {"Accept-Encoding": "gzip"}
+                if etags is not None and path in etags:
+                    headers["If-None-Match"] = etags[path]
+                t0 = time.perf_counter()
+                status, out, _ = await _request(reader, writer, host, path, headers)
+                latencies.append(time.perf_counter() - t0)
+                statuses[status] = statuses.get(status, 0) + 1
+                if record is not None and "etag" in out:
+                    record[path] = out["etag"]
+        finally:
+            writer.close()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return len(latencies), time.perf_counter() - t0, latencies, statuses
+
+
+def _report(label: str, n: int, elapsed: float, latencies: list[float], statuses: dict):
+    latencies.sort()
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0
+
+    codes = " ".join(f"{k}×{v}" for k, v in sorted(statuses.items()))
+    print(f"   {label:<6} {n / elapsed:9.0f} req/s   p50 {pct(0.50):6.2f} ms   "
+          f"p95 {pct(0.95):6.2f} ms   p99 {pct(0.99):6.2f} ms   [{codes}]")
+
+
+async def _run(args, host: str, port: int):
+    for _ in range(100):
+        try:
+            await _get_json(host, port, "/health")
+            break
+        except OSError:
+            await asyncio.sleep(0.1)
+    else:
+        raise SystemExit("❌ serveur injoignable")
+
+    urls = _urls(args.data, args.urls)
+    print(f"{len(urls)} URL, {args.clients} clients, {args.duration:.0f}s par phase chaude")
+    etags: dict[str, str] = {}
+    n, elapsed, lat, st = await _phase(host, port, urls, args.clients, None, record=etags)
+    _report("froid", n, elapsed, lat, st)
+    n, elapsed, lat, st = await _phase(host, port, urls, args.clients, args.duration)
+    _report("chaud", n, elapsed, lat, st)
+    n, elapsed, lat, st = await _phase(host, port, urls, args.clients, args.duration,
+                                       etags=etags)
+    _report("304", n, elapsed, lat, st)
+    health = await _get_json(host, port, "/health")
+    print(f"   cache : {json.dumps(health['cache'])}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--data", type=Path, default=Path("data"))
+    ap.add_argument("--url", help="serveur déjà lancé (sinon serve.py est démarré)")
+    ap.add_argument("--clients", type=int, default=32)
+    ap.add_argument("--duration", type=float, default=10.0, help="secondes par phase chaude / 304")
+    ap.add_argument("--urls", type=int, default=5000, help="URL distinctes")
+    args = ap.parse_args()
+
+    proc = None
+    if args.url:
+        u = urlsplit(args.url)
+        host, port = u.hostname, u.port or 80
+    else:
+        host, port = "127.0.0.1", _free_port()
+        proc = subprocess.Popen(
+            [sys.executable, str(SCRIPTS / "serve.py"), "--data", str(args.data),
+             "--host", host, "--port", str(port)],
+            stdout=subprocess.DEVNULL,
+        )
+    try:
+        asyncio.run(_run(args, host, port))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
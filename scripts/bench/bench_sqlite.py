@@ -0,0 +1,173 @@
+"""
+Construction de la base SQLite (complète puis incrémentale sur un mois) et
+temps de requêtes représentatives, comparés au parcours des fichiers JSON.
+
+    python scripts/bench/bench_sqlite.py [--data data] [--db /tmp/votes.sqlite]
+
+Les mois sont relus depuis data/scrutins/*.json (historique ou colonnaire),
+plus un scrutin de contrôle (député sans groupe, décompte complet) dont les
+lignes en base sont vérifiées.
+"""
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import columnar  # noqa: E402
+from aggregate import accumulate  # noqa: E402
+from database import export_sqlite  # noqa: E402
+
+QUERIES = {
+    "groupe x thème x année": """
+        SELECT s.id, s.date, v.position, COUNT(*)
+        FROM scrutin_themes t
+        JOIN scrutins s ON s.id = t.scrutin_id
+        JOIN votes v ON v.scrutin_id = s.id
+        WHERE t.theme = :theme AND v.group_id = :group
+          AND s.date BETWEEN :start AND :end
+        GROUP BY s.id, v.position
+    """,
+    "historique d'un député": """
+        SELECT s.date, s.title, v.position
+        FROM votes v JOIN scrutins s ON s.id = v.scrutin_id
+        WHERE v.person_id = :person
+        ORDER BY s.date DESC
+    """,
+    "votes d'un scrutin": """
+        SELECT g.acronym, v.position, COUNT(*)
+        FROM votes v LEFT JOIN groups g ON g.group_id = v.group_id
+        WHERE v.scrutin_id = :scrutin
+        GROUP BY g.acronym, v.position
+    """,
+    "scrutins par mois": """
+        SELECT month, COUNT(*), SUM(count_for), SUM(count_against)
+        FROM scrutins GROUP BY month ORDER BY month
+    """,
+}
+
+
+def _load(data: Path) -> list[dict]:
+    people_doc = json.loads((data / "people.json").read_text(encoding="utf-8"))
+    scrutins = []
+    for path in sorted((data / "scrutins").glob("*.json")):
+        month = json.loads(path.read_text(encoding="utf-8"))
+        scrutins.extend(columnar.decode_month(month, people_doc)["scrutins"])
+    return scrutins
+
+
+def _check_scrutin(scrutins: list[dict]) -> dict:
+    """Scrutin sans thème du dernier mois : un député sans groupe, décompte complet."""
+    last = max(scrutins, key=lambda s: s["date"])
+    vote = {**next(v for v in last["votes"] if v.get("group")), "position": "ABSTAIN"}
+    return {
+        **{k: v for k, v in last.items() if k not in ("themes", "votes")},
+        "id": f"{last['id']}-CHECK", "title": "Scrutin de contrôle",
+        "counts": {"for": 0, "against": 0, "abstention": 2, "nonvoting": 0},
+        "votes": [
+            vote,
+            {"person_id": "PA-CHECK", "name": "Député sans groupe", "group": None,
+             "constituency": None, "position": "ABSTAIN"},
+        ],
+    }
+
+
+def _verify(con: sqlite3.Connection, check: dict):
+    """Lignes du scrutin de contrôle : abstentions et personne sans groupe."""
+    abstain = con.execute("SELECT count_abstain FROM scrutins WHERE id = ?",
+                          (check["id"],)).fetchone()
+    if abstain != (2,):
+        print(f"❌ count_abstain {abstain}, (2,) attendu")
+        sys.exit(1)
+    group = con.execute("SELECT group_id FROM people WHERE person_id = 'PA-CHECK'").fetchone()
+    if group != (None,):
+        print(f"❌ député sans groupe : {group}, (None,) attendu")
+        sys.exit(1)
+
+
+def _json_scan(data: Path, params: dict) -> int:
+    """Même question que "groupe x thème x année", en relisant les mois."""
+    t0 = time.perf_counter()
+    scrutins = _load(data)
+    rows = Counter()
+    for s in scrutins:
+        if (params["theme"] in s.get("themes", [])
+                and params["start"] <= s["date"] <= params["end"]):
+            for v in s["votes"]:
+                if v.get("group") == params["group"]:
+                    rows[s["id"], v["position"]] += 1
+    print(f"{'JSON (relecture)':>24}: {(time.perf_counter() - t0) * 1000:9.1f} ms  "
+          f"{len(rows)} lignes")
+    return len(rows)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--data", type=Path, default=Path("data"))
+    ap.add_argument("--db", type=Path, default=Path("/tmp/bench_votes.sqlite"))
+    ap.add_argument("--repeat", type=int, default=20, help="exécutions par requête")
+    args = ap.parse_args()
+
+    scrutins = _load(args.data)
+    check = _check_scrutin(scrutins)
+    scrutins.append(check)
+    acc = accumulate(scrutins)
+    n_votes = sum(len(s["votes"]) for s in scrutins)
+    print(f"{len(scrutins)} scrutins, {n_votes} votes")
+
+    t0 = time.perf_counter()
+    export_sqlite(args.db, scrutins, "bench-1", acc)
+    dt = time.perf_counter() - t0
+    print(f"base complète: {dt:.2f}s ({n_votes / dt:,.0f} votes/s), "
+          f"{args.db.stat().st_size / 1e6:.1f} Mo")
+
+    last = max(s["date"][:7] for s in scrutins)
+    t0 = time.perf_counter()
+    n = export_sqlite(args.db, scrutins, "bench-2", acc,
+                      changed_months={last}, previous_build="bench-1")
+    print(f"incrémental ({last}): {time.perf_counter() - t0:.2f}s, {n} scrutins réécrits")
+
+    con = sqlite3.connect(args.db)
+    count = con.execute("SELECT COUNT(*) FROM votes").fetchone()[0]
+    if count != n_votes:
+        print(f"❌ {count} votes en base, {n_votes} attendus")
+        sys.exit(1)
+    _verify(con, check)
+
+    # paramètres : le groupe, le thème et l'année les plus fréquents
+    group = con.execute("SELECT group_id FROM votes WHERE group_id IS NOT NULL "
+                        "GROUP BY group_id ORDER BY COUNT(*) DESC LIMIT 1").fetchone()[0]
+    theme = con.execute("SELECT theme FROM scrutin_themes WHERE theme != 'autre' "
+                        "GROUP BY theme ORDER BY COUNT(*) DESC LIMIT 1").fetchone()[0]
+    year = con.execute("SELECT substr(date, 1, 4) FROM scrutins GROUP BY 1 "
+                       "ORDER BY COUNT(*) DESC LIMIT 1").fetchone()[0]
+    params = {
+        "group": group, "theme": theme,
+        "start": f"{year}-01-01", "end": f"{year}-12-31",
+        "person": con.execute("SELECT person_id FROM people LIMIT 1").fetchone()[0],
+        "scrutin": con.execute("SELECT id FROM scrutins ORDER BY date DESC LIMIT 1").fetchone()[0],
+    }
+    print(f"groupe {group}, thème {theme}, année {year}")
+
+    results = {}
+    for label, sql in QUERIES.items():
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            rows = con.execute(sql, params).fetchall()
+        dt = (time.perf_counter() - t0) / args.repeat
+        results[label] = len(rows)
+        print(f"{label:>24}: {dt * 1000:9.2f} ms  {len(rows)} lignes")
+    con.close()
+
+    if _json_scan(args.data, params) != results["groupe x thème x année"]:
+        print("❌ résultats SQLite et JSON différents")
+        sys.exit(1)
+    print("✅ mêmes résultats")
+
+
+if __name__ == "__main__":
+    main()
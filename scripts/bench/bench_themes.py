@@ -0,0 +1,96 @@
+"""
+Compare l'ancienne boucle d'assign_themes (`kw.lower() in hay` pour chaque
+mot-clé) et ThemeMatcher (regex unique + mémo par titre).
+
+    python scripts/bench/bench_themes.py [--extra 500] [--repeat 3]
+
+Les titres viennent de data/index.json. --extra ajoute des thèmes
+synthétiques (mots de 5 à 12 lettres tirés du vocabulaire des titres) pour
+simuler un themes.json de plusieurs centaines de mots-clés. Les sorties sont
+comparées en mode par défaut (sous-chaînes, accents significatifs).
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from themes import ThemeMatcher  # noqa: E402
+
+
+def _legacy(texts: list[str], themes: list[dict]) -> list[list[str]]:
+    out = []
+    for text in texts:
+        hay = text.lower()
+        found = []
+        for t in themes:
+            for kw in t.get("keywords", []):
+                if kw.lower() in hay:
+                    found.append(t["slug"])
+                    break
+        out.append(sorted(set(found)) if found else ["autre"])
+    return out
+
+
+def _extra_themes(texts: list[str], n_keywords: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    vocab = sorted({w for t in texts for w in re.findall(r"\w{5,12}", t.lower())})
+    words = rng.sample(vocab, min(n_keywords, len(vocab)))
+    return [
+        {"slug": f"extra-{i}", "label": f"Extra {i}", "keywords": words[i:i + 10]}
+        for i in range(0, len(words), 10)
+    ]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--data", type=Path, default=Path("data"))
+    ap.add_argument("--extra", type=int, default=500, help="mots-clés synthétiques en plus")
+    ap.add_argument("--repeat", type=int, default=3, help="passes sur les titres")
+    args = ap.parse_args()
+
+    cfg = json.loads((args.data / "themes.json").read_text(encoding="utf-8"))
+    index = json.loads((args.data / "index.json").read_text(encoding="utf-8"))
+    texts = [f'{s.get("title","")} {s.get("object","")}' for s in index["scrutins"]]
+    themes = cfg["themes"] + _extra_themes(texts, args.extra)
+    texts = texts * args.repeat
+    n_kw = sum(len(t["keywords"]) for t in themes)
+    print(f"{len(texts)} textes ({len(set(texts))} distincts), {n_kw} mots-clés")
+
+    t0 = time.perf_counter()
+    expected = _legacy(texts, themes)
+    legacy_dt = time.perf_counter() - t0
+    print(f"  boucle: {legacy_dt:7.3f}s")
+
+    t0 = time.perf_counter()
+    matcher = ThemeMatcher(themes)
+    build_dt = time.perf_counter() - t0
+    got = [matcher.match(t) for t in texts]
+    dt = time.perf_counter() - t0
+    print(f" matcher: {dt:7.3f}s  (compilation {build_dt:.3f}s)  speedup x{legacy_dt / dt:.1f}")
+
+    nomemo = ThemeMatcher(themes)
+    t0 = time.perf_counter()
+    for t in texts:
+        nomemo._match(t)
+    print(f" sans mémo: {time.perf_counter() - t0:5.3f}s")
+
+    if got != expected:
+        bad = sum(a != b for a, b in zip(got, expected))
+        print(f"❌ {bad} textes différents")
+        sys.exit(1)
+    print("✅ thèmes identiques")
+
+    for label, kwargs in [("frontières de mots", {"word_boundary": True}),
+                          ("sans accents", {"fold_accents": True})]:
+        m = ThemeMatcher(themes, **kwargs)
+        diff = sum(m.match(t) != e for t, e in zip(texts[:len(texts) // args.repeat], expected))
+        print(f"  {label}: {diff} textes classés autrement")
+
+
+if __name__ == "__main__":
+    main()
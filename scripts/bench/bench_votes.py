@@ -0,0 +1,85 @@
+"""
+Microbenchmark de _extract_votes sur un scrutin synthétique plénier
+(577 votants), contre l'ancienne remontée d'ancêtres avec XPath.
+
+    python scripts/bench/bench_votes.py [--deputies 577] [--repeat 20]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from lxml import etree
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sources.an import _BUCKET_TO_POS, _MAX_ANCESTORS, _dedup_votes, _extract_votes  # noqa: E402
+from synthetic import chamber, scrutin_xml  # noqa: E402
+
+
+def _extract_votes_ancestor_walk(scrutin_node) -> list[dict]:
+    """Implémentation historique : XPath par ancêtre pour chaque acteurRef."""
+    votes = []
+    for a in scrutin_node.xpath(".//*[local-name()='acteurRef']"):
+        pid = (a.text or "").strip()
+        if not pid:
+            continue
+        pos = None
+        group = None
+        cur = a
+        for _ in range(_MAX_ANCESTORS):
+            cur = cur.getparent()
+            if cur is None:
+                break
+            lname = cur.tag.split("}")[-1]
+            if pos is None and lname in _BUCKET_TO_POS:
+                pos = _BUCKET_TO_POS[lname]
+            if group is None:
+                g = cur.xpath("string(.//*[local-name()='organeRef'][1])")
+                g = g.strip() if isinstance(g, str) else ""
+                if g:
+                    group = g
+            if pos and group:
+                break
+        if not pos:
+            continue
+        votes.append({"person_id": pid, "position": pos, "group": group,
+                      "constituency": None, "name": None})
+    return _dedup_votes(votes)
+
+
+def _bench(fn, root, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(root)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--deputies", type=int, default=577)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    positions = list(_BUCKET_TO_POS.values())
+    ballots = [(pid, gid, positions[i % 4 * 2])
+               for i, (pid, gid) in enumerate(chamber(args.deputies))]
+    maps = [(ballots[0][0], "AGAINST")]
+    root = etree.fromstring(scrutin_xml(1, "2025-01-01", "scrutin plénier", ballots, maps))
+
+    old = _extract_votes_ancestor_walk(root)
+    new = _extract_votes(root)
+    assert old == new, "sorties différentes"
+
+    t_old = _bench(_extract_votes_ancestor_walk, root, max(1, args.repeat // 10))
+    t_new = _bench(_extract_votes, root, args.repeat)
+    print(f"{len(new)} votes")
+    print(f"ancestor walk: {t_old * 1000:8.2f} ms")
+    print(f"tracker:       {t_new * 1000:8.2f} ms")
+    print(f"speedup: x{t_old / t_new:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Parité et temps des deux chemins d'agrégation (Python / NumPy), et
+comparaison avec l'agrégation d'origine (commit BASELINE).
+
+    python scripts/bench/check_aggregate.py [--data data] [--synthetic N] [--repeat N]
+
+Relit les fichiers data/scrutins/*.json commités, reconstruit la VoteTable
+et vérifie que l'accumulateur (députés, groupes, people, historiques avec
+marques de loyauté, dissidents par scrutin, périodes d'appartenance) donne
+exactement les mêmes dicts (arrondis compris) avec et sans NumPy. Avec
+--synthetic, le jeu est complété par N scrutins aléatoires (doublons de
+mise au point, parfois sous un autre organe, députés sans groupe,
+changements de groupe) pour exercer les cas limites.
+
+Référence : aggregate_deputies / aggregate_groups relus du commit BASELINE
+(git show). Les compteurs des députés doivent être identiques sur tout le
+jeu ; les fiches complètes (groupe courant, stats de groupe, cohésion,
+membres) sur un jeu synthétique sans changement de groupe ni mise au point
+sous un autre organe, seuls cas où les règles ont changé depuis (périodes
+d'appartenance, groupe détenu).
+
+Temps : meilleur de --repeat passes par chemin ; le chemin choisi par
+accumulate() (seuil VECTORIZE_MIN_VOTES) est indiqué.
+"""
+import argparse
+import json
+import random
+import subprocess
+import sys
+import time
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from aggregate import VECTORIZE_MIN_VOTES, accumulate, np  # noqa: E402
+from synthetic import GROUPS, chamber  # noqa: E402
+from votes import POSITIONS, VoteTable  # noqa: E402
+
+
+def _load(data_dir: Path) -> list[dict]:
+    scrutins = []
+    for path in sorted((data_dir / "scrutins").glob("*.json")):
+        scrutins.extend(json.loads(path.read_text(encoding="utf-8"))["scrutins"])
+    scrutins.sort(key=lambda s: (s["date"], s["id"]), reverse=True)
+    return scrutins
+
+
+ROOT = Path(__file__).resolve().parents[2]
+BASELINE = "961f2c4"
+
+
+def _synthetic(n: int, seed: int = 0, moves: bool = True) -> list[dict]:
+    """
+    N scrutins aléatoires ; moves=False : ni changement de groupe ni mise
+    au point sous un autre organe.
+    """
+    rng = random.Random(seed)
+    members = chamber()
+    names = {gid: (acronym, name) for gid, acronym, name, _ in GROUPS}
+    scrutins = []
+    for i in range(n):
+        votes = []
+        for k, (pid, gid) in enumerate(members):
+            if rng.random() < 0.3:
+                continue
+            gid = None if k % 97 == 0 else gid
+            # changements de groupe en cours de législature
+            if moves and k % 53 == 0 and i % 7 < 3:
+                gid = GROUPS[(k // 53 + 1) % len(GROUPS)][0]
+            v = {"person_id": pid, "position": rng.choice(POSITIONS),
+                 "group": gid, "constituency": None, "name": f"Député {k}"}
+            if gid:
+                v["group_acronym"], v["group_name"] = names[gid]
+            votes.append(v)
+        if votes and rng.random() < 0.2:
+            dup = {**rng.choice(votes), "position": rng.choice(POSITIONS)}
+            # mise au point sous un autre organe que le groupe du député
+            if moves and rng.random() < 0.5:
+                gid, dup["group_acronym"], dup["group_name"], _ = GROUPS[i % len(GROUPS)]
+                dup["group"] = gid
+            votes.append(dup)
+        scrutins.append({
+            "id": f"AN-17-S{i}", "chamber": "AN",
+            "date": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            "title": f"Scrutin {i}", "votes": votes,
+        })
+    return scrutins
+
+
+def _baseline():
+    """Module aggregate.py du commit BASELINE, None hors d'un clone git."""
+    try:
+        source = subprocess.run(
+            ["git", "show", f"{BASELINE}:scripts/aggregate.py"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    module = types.ModuleType("aggregate_baseline")
+    exec(compile(source, f"{BASELINE}:scripts/aggregate.py", "exec"), module.__dict__)
+    return module
+
+
+def _plain(scrutins: list[dict]) -> list[dict]:
+    """Scrutins aux votes en dicts, comme les lisait l'agrégation d'origine."""
+    return [{**s, "votes": list(s["votes"])} for s in scrutins]
+
+
+def _expect(label: str, ok: bool):
+    if not ok:
+        print(f"❌ {label}")
+        sys.exit(1)
+    print(f"✅ {label}")
+
+
+def _check_baseline(scrutins: list[dict], n_synthetic: int):
+    baseline = _baseline()
+    if baseline is None:
+        print(f"⚠️ commit {BASELINE} introuvable : comparaison à la référence sautée")
+        return
+
+    def counts(deputies):
+        return {d["person_id"]: (d["chamber"], d["stats"]) for d in deputies}
+
+    deputies = accumulate(scrutins).deputies()
+    _expect(f"compteurs des députés identiques à {BASELINE}",
+            counts(deputies) == counts(baseline.aggregate_deputies(_plain(scrutins))))
+
+    stable = _synthetic(max(n_synthetic, 100), seed=1, moves=False)
+    VoteTable.from_scrutins(stable)
+    acc = accumulate(stable)
+    deputies = acc.deputies()
+    plain = _plain(stable)
+    ref_deputies = baseline.aggregate_deputies(plain)
+    _expect(f"fiches députés et groupes identiques à {BASELINE} (sans changement de groupe)",
+            deputies == ref_deputies
+            and acc.groups(deputies) == baseline.aggregate_groups(plain, ref_deputies))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--data", type=Path, default=Path("data"))
+    ap.add_argument("--synthetic", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=5, help="passes par chemin")
+    args = ap.parse_args()
+
+    scrutins = _load(args.data) + _synthetic(args.synthetic)
+    VoteTable.from_scrutins(scrutins)
+    n_votes = sum(len(s["votes"]) for s in scrutins)
+    print(f"{len(scrutins)} scrutins, {n_votes} votes")
+
+    out = {}
+    best = {}
+    for label, vectorized in [("python", False), ("numpy", True)]:
+        best[label] = float("inf")
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            acc = accumulate(scrutins, vectorized=vectorized)
+            deputies = acc.deputies()
+            groups = acc.groups(deputies)
+            people = acc.people()
+            votes = dict(acc.deputy_votes())
+            rebels = list(acc.rebels())
+            affiliations = acc.affiliations()
+            best[label] = min(best[label], time.perf_counter() - t0)
+        out[label] = (deputies, groups, people, votes, rebels, affiliations)
+        print(f"{label:>6}: {best[label]:6.3f}s  ({len(deputies)} députés, {len(groups)} groupes)")
+
+    default = "numpy" if np is not None and n_votes >= VECTORIZE_MIN_VOTES else "python"
+    faster = min(best, key=best.get)
+    print(f"accumulate() : chemin {default} (seuil {VECTORIZE_MIN_VOTES} votes)")
+    if faster != default:
+        print(f"⚠️ {faster} plus rapide que {default} sur ce volume "
+              f"({best[faster]:.3f}s contre {best[default]:.3f}s)")
+
+    _expect("sorties Python et NumPy identiques", out["python"] == out["numpy"])
+    _check_baseline(scrutins, args.synthetic)
+
+
+if __name__ == "__main__":
+    main()
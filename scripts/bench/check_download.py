@@ -0,0 +1,193 @@
+"""
+Cache HTTP des téléchargements (sources/download.py) contre un serveur
+local (http.server), sans réseau.
+
+    python scripts/bench/check_download.py
+
+Cas vérifiés, chacun sur le même fichier de cache :
+- premier téléchargement (200) puis requête conditionnelle -> 304 ;
+- ressource modifiée (nouvel ETag) -> 200, nouveau contenu ;
+- transfert coupé -> .part, reprise Range + If-Range -> 206 ;
+- reprise alors que la ressource a changé (If-Range ne correspond plus)
+  -> 200 complet ;
+- reprise refusée (416) ou 206 qui ne démarre pas à l'offset demandé
+  -> .part abandonné, téléchargement complet ;
+- ETag faible : If-Range porte Last-Modified ;
+- corps servi avec Content-Encoding: gzip, coupé puis repris : le fichier
+  garde les octets transférés (offsets de reprise cohérents).
+"""
+import gzip
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx  # noqa: E402
+
+from sources.download import _part_path, fetch  # noqa: E402
+
+
+class _State:
+    """Ressource servie, comportement de la prochaine réponse, requêtes reçues."""
+
+    def __init__(self):
+        self.set(b"v1 " * 20000, '"v1"', "Mon, 01 Sep 2025 00:00:00 GMT")
+        self.mode = None
+        self.encoding = None
+        self.requests: list[dict] = []
+
+    def set(self, body: bytes, etag: str, last_modified: str):
+        self.body, self.etag, self.last_modified = body, etag, last_modified
+
+
+STATE = _State()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body: bytes = b"", headers: dict | None = None,
+              length: int | None = None):
+        self.send_response(status)
+        base = {"ETag": STATE.etag, "Last-Modified": STATE.last_modified}
+        if STATE.encoding:
+            base["Content-Encoding"] = STATE.encoding
+        for k, v in {**base, **(headers or {})}.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body) if length is None else length))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        h = {k.lower(): v for k, v in self.headers.items()}
+        STATE.requests.append(h)
+        mode, STATE.mode = STATE.mode, None
+        body = STATE.body
+
+        if mode == "cut":
+            # moitié du corps annoncé puis fermeture
+            self.close_connection = True
+            self._send(200, body[:len(body) // 2], length=len(body))
+            return
+        if h.get("if-none-match") == STATE.etag and "range" not in h:
+            self._send(304)
+            return
+        if "range" in h:
+            if mode == "416":
+                self._send(416, headers={"Content-Range": f"bytes */{len(body)}"})
+                return
+            if h.get("if-range") in (STATE.etag, STATE.last_modified):
+                start = int(h["range"].removeprefix("bytes=").rstrip("-"))
+                if mode == "bad-206":
+                    start = 0
+                self._send(206, body[start:], {
+                    "Content-Range": f"bytes {start}-{len(body) - 1}/{len(body)}",
+                })
+                return
+        self._send(200, body)
+
+
+class _Server(ThreadingHTTPServer):
+
+    def handle_error(self, request, client_address):
+        # connexion fermée par le client (reprise abandonnée) : attendu
+        pass
+
+
+def _expect(label: str, ok: bool):
+    if not ok:
+        print(f"❌ {label}")
+        sys.exit(1)
+    print(f"✅ {label}")
+
+
+def _interrupt(client: httpx.Client, url: str, dest: Path):
+    """Transfert coupé : laisse un .part de la moitié du corps."""
+    STATE.mode = "cut"
+    try:
+        fetch(client, url, dest)
+    except httpx.HTTPError:
+        pass
+    else:
+        _expect("transfert coupé -> erreur", False)
+    _expect("transfert coupé -> .part partiel",
+            _part_path(dest).stat().st_size == len(STATE.body) // 2)
+
+
+def main():
+    server = _Server(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/archive.zip"
+
+    with tempfile.TemporaryDirectory() as tmp, httpx.Client(timeout=10) as client:
+        dest = Path(tmp) / "archive.zip"
+
+        def last():
+            return STATE.requests[-1]
+
+        _expect("200 initial", fetch(client, url, dest) and dest.read_bytes() == STATE.body)
+        _expect("304 : fichier gardé",
+                not fetch(client, url, dest) and last().get("if-none-match") == '"v1"')
+
+        STATE.set(b"v2 " * 25000, '"v2"', "Tue, 02 Sep 2025 00:00:00 GMT")
+        _expect("ressource modifiée -> 200",
+                fetch(client, url, dest) and dest.read_bytes() == STATE.body)
+
+        STATE.set(b"v3 " * 30000, '"v3"', "Wed, 03 Sep 2025 00:00:00 GMT")
+        _interrupt(client, url, dest)
+        offset = len(STATE.body) // 2
+        ok = fetch(client, url, dest)
+        _expect("reprise Range + If-Range -> 206",
+                ok and last().get("range") == f"bytes={offset}-"
+                and last().get("if-range") == '"v3"' and dest.read_bytes() == STATE.body
+                and not _part_path(dest).exists())
+
+        STATE.set(b"v4 " * 30000, '"v4"', "Thu, 04 Sep 2025 00:00:00 GMT")
+        _interrupt(client, url, dest)
+        STATE.set(b"v5 " * 35000, '"v5"', "Fri, 05 Sep 2025 00:00:00 GMT")
+        _expect("If-Range périmé -> 200 complet",
+                fetch(client, url, dest) and last().get("if-range") == '"v4"'
+                and dest.read_bytes() == STATE.body)
+
+        # ressources modifiées : sinon la reprise abandonnée finit en 304
+        STATE.set(b"v6 " * 30000, '"v6"', "Sat, 06 Sep 2025 00:00:00 GMT")
+        _interrupt(client, url, dest)
+        STATE.mode = "416"
+        n = len(STATE.requests)
+        _expect("416 -> téléchargement complet",
+                fetch(client, url, dest) and dest.read_bytes() == STATE.body
+                and len(STATE.requests) == n + 2 and "range" not in last())
+
+        STATE.set(b"v7 " * 30000, '"v7"', "Sun, 07 Sep 2025 00:00:00 GMT")
+        _interrupt(client, url, dest)
+        STATE.mode = "bad-206"
+        n = len(STATE.requests)
+        _expect("206 décalé -> téléchargement complet",
+                fetch(client, url, dest) and dest.read_bytes() == STATE.body
+                and len(STATE.requests) == n + 2 and "range" not in last())
+
+        STATE.set(b"v8 " * 30000, 'W/"v8"', "Mon, 08 Sep 2025 00:00:00 GMT")
+        _interrupt(client, url, dest)
+        _expect("ETag faible -> If-Range sur Last-Modified",
+                fetch(client, url, dest) and last().get("if-range") == STATE.last_modified
+                and dest.read_bytes() == STATE.body)
+
+        STATE.set(gzip.compress(b"v9 " * 30000, mtime=0), '"v9"',
+                  "Tue, 09 Sep 2025 00:00:00 GMT")
+        STATE.encoding = "gzip"
+        _interrupt(client, url, dest)
+        _expect("Content-Encoding: gzip -> reprise sur les octets transférés",
+                fetch(client, url, dest) and last().get("range") == f"bytes={len(STATE.body) // 2}-"
+                and dest.read_bytes() == STATE.body)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Jeux de données synthétiques au format open data AN, pour les benchmarks.
+
+Les XML produits reprennent la structure des fichiers de `Scrutins.xml.zip`
+(namespace, `syntheseVote/decompte`, `ventilationVotes/.../decompteNominatif`,
+`miseAuPoint`, éléments `xsi:nil`) afin d'exercer les mêmes chemins de code
+que les vrais dumps quand le cache `.cache/an/<législature>` n'est pas disponible.
+"""
+import json
+import random
+import zipfile
+from datetime import date, timedelta
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+NS = "http://schemas.assemblee-nationale.fr/referentiel"
+XSI = "http://www.w3.org/2001/XMLSchema-instance"
+
+ASSEMBLEE = "PO838901"
+
+# (organeRef, acronyme, libellé, effectif) — 577 sièges
+GROUPS = [
+    ("PO845401", "RN", "Rassemblement National", 123),
+    ("PO845407", "EPR", "Ensemble pour la République", 92),
+    ("PO845413", "LFI-NFP", "La France insoumise - Nouveau Front Populaire", 71),
+    ("PO845419", "SOC", "Socialistes et apparentés", 66),
+    ("PO845425", "DR", "Droite Républicaine", 49),
+    ("PO845439", "EcoS", "Écologiste et Social", 38),
+    ("PO845454", "Dem", "Les Démocrates", 36),
+    ("PO845470", "HOR", "Horizons & Indépendants", 34),
+    ("PO845485", "LIOT", "Libertés, Indépendants, Outre-mer et Territoires", 23),
+    ("PO845514", "GDR", "Gauche Démocrate et Républicaine", 17),
+    ("PO872880", "UDR", "Union des droites pour la République", 16),
+    ("PO840056", "NI", "Non inscrit", 12),
+]
+
+BUCKETS = {
+    "FOR": "pours",
+    "AGAINST": "contres",
+    "ABSTAIN": "abstentions",
+    "NONVOTING": "nonVotants",
+}
+
+TITLES = [
+    "l'amendement n° {n} de M. Dupont à l'article 3 du projet de loi de finances pour 2025 (première lecture).",
+    "l'ensemble de la proposition de loi visant à renforcer l'accès aux soins dans les hôpitaux (première lecture).",
+    "la motion de censure déposée en application de l'article 49, alinéa 3, de la Constitution.",
+    "l'article premier du projet de loi relatif à l'énergie et au climat (deuxième lecture).",
+    "l'amendement n° {n} de Mme Martin après l'article 12 de la proposition de loi sur le logement.",
+    "la proposition de résolution tendant à la création d'une commission d'enquête sur la protection de l'enfance.",
+]
+
+
+def chamber(n_deputies: int = 577) -> list[tuple[str, str]]:
+    """Retourne [(acteurRef, organeRef)] pour une assemblée de `n_deputies` sièges."""
+    total = sum(g[3] for g in GROUPS)
+    members = []
+    uid = 793000
+    for gid, _, _, size in GROUPS:
+        for _ in range(max(1, round(size * n_deputies / total))):
+            members.append((f"PA{uid}", gid))
+            uid += 1
+    return members[:n_deputies]
+
+
+def _nominatif(ballots: list[tuple[str, str]], indent: str) -> str:
+    out = []
+    by_bucket = {b: [] for b in BUCKETS.values()}
+    for pid, pos in ballots:
+        by_bucket[BUCKETS[pos]].append(pid)
+    for bucket in ("nonVotants", "pours", "contres", "abstentions"):
+        pids = by_bucket[bucket]
+        if not pids:
+            out.append(f'{indent}<{bucket} xsi:nil="true"/>')
+            continue
+        out.append(f"{indent}<{bucket}>")
+        for pid in pids:
+            out.append(
+                f"{indent}  <votant>\n"
+                f"{indent}    <acteurRef>{pid}</acteurRef>\n"
+                f"{indent}    <mandatRef>PM{pid[2:]}</mandatRef>\n"
+                f"{indent}    <parDelegation>false</parDelegation>\n"
+                f"{indent}  </votant>"
+            )
+        out.append(f"{indent}</{bucket}>")
+    return "\n".join(out)
+
+
+def scrutin_xml(numero: int, date_str: str, title: str,
+                ballots: list[tuple[str, str, str]],
+                mises_au_point: list[tuple[str, str]] = ()) -> bytes:
+    """
+    ballots: [(acteurRef, organeRef, position)]
+    mises_au_point: [(acteurRef, position)]
+    """
+    counts = {p: 0 for p in BUCKETS}
+    per_group: dict[str, list[tuple[str, str]]] = {}
+    for pid, gid, pos in ballots:
+        counts[pos] += 1
+        per_group.setdefault(gid, []).append((pid, pos))
+
+    groupes = []
+    for gid, votes in per_group.items():
+        c = {p: 0 for p in BUCKETS}
+        for _, pos in votes:
+            c[pos] += 1
+        majo = max(c, key=c.get)
+        groupes.append(f"""        <groupe>
+          <organeRef>{gid}</organeRef>
+          <nombreMembresGroupe>{len(votes)}</nombreMembresGroupe>
+          <vote>
+            <positionMajoritaire>{BUCKETS[majo][:-1]}</positionMajoritaire>
+            <decompteVoix>
+              <nonVotants>{c['NONVOTING']}</nonVotants>
+              <pour>{c['FOR']}</pour>
+              <contre>{c['AGAINST']}</contre>
+              <abstentions>{c['ABSTAIN']}</abstentions>
+              <nonVotantsVolontaires>0</nonVotantsVolontaires>
+            </decompteVoix>
+            <decompteNominatif>
+{_nominatif(votes, "              ")}
+            </decompteNominatif>
+          </vote>
+        </groupe>""")
+
+    if mises_au_point:
+        map_xml = f"""  <miseAuPoint>
+{_nominatif(list(mises_au_point), "    ")}
+    <dysfonctionnement xsi:nil="true"/>
+  </miseAuPoint>"""
+    else:
+        map_xml = '  <miseAuPoint xsi:nil="true"/>'
+
+    adopted = counts["FOR"] > counts["AGAINST"]
+    xml = f"""<?xml version="1.0" encoding="UTF-8"?>
+<scrutin xmlns="{NS}" xmlns:xsi="{XSI}">
+  <uid>VTANR5L17V{numero}</uid>
+  <numero>{numero}</numero>
+  <organeRef>{ASSEMBLEE}</organeRef>
+  <legislature>17</legislature>
+  <sessionRef>SCR5A2024E1</sessionRef>
+  <seanceRef>RUANR5L17S2024IDS28000</seanceRef>
+  <dateScrutin>{date_str}</dateScrutin>
+  <quantiemeJourSeance>1</quantiemeJourSeance>
+  <typeVote>
+    <codeTypeVote>SPO</codeTypeVote>
+    <libelleTypeVote>scrutin public ordinaire</libelleTypeVote>
+    <typeMajorite>majorité absolue des suffrages exprimés</typeMajorite>
+  </typeVote>
+  <sort>
+    <code>{"adopté" if adopted else "rejeté"}</code>
+    <libelle>L'Assemblée nationale {"a adopté" if adopted else "n'a pas adopté"}.</libelle>
+  </sort>
+  <titre>{escape(title)}</titre>
+  <demandeur>
+    <texte>Président du groupe "Rassemblement National"</texte>
+    <referenceLegislative xsi:nil="true"/>
+  </demandeur>
+  <objet>
+    <libelle>{escape(title)}</libelle>
+    <dossierLegislatif xsi:nil="true"/>
+    <referenceLegislative xsi:nil="true"/>
+  </objet>
+  <modePublicationDesVotes>DecompteNominatif</modePublicationDesVotes>
+  <syntheseVote>
+    <nombreVotants>{len(ballots)}</nombreVotants>
+    <suffragesExprimes>{counts['FOR'] + counts['AGAINST']}</suffragesExprimes>
+    <nbrSuffragesRequis>{(counts['FOR'] + counts['AGAINST']) // 2 + 1}</nbrSuffragesRequis>
+    <annonce>L'Assemblée nationale {"a adopté" if adopted else "n'a pas adopté"}.</annonce>
+    <decompte>
+      <nonVotants>{counts['NONVOTING']}</nonVotants>
+      <pour>{counts['FOR']}</pour>
+      <contre>{counts['AGAINST']}</contre>
+      <abstentions>{counts['ABSTAIN']}</abstentions>
+      <nonVotantsVolontaires>0</nonVotantsVolontaires>
+    </decompte>
+  </syntheseVote>
+  <ventilationVotes>
+    <organe>
+      <organeRef>{ASSEMBLEE}</organeRef>
+      <groupes>
+{chr(10).join(groupes)}
+      </groupes>
+    </organe>
+  </ventilationVotes>
+{map_xml}
+</scrutin>
+"""
+    return xml.encode("utf-8")
+
+
+def random_scrutin(numero: int, members: list[tuple[str, str]],
+                   rng: random.Random, day: date) -> bytes:
+    """Scrutin plausible : chaque groupe suit une consigne avec quelques dissidents."""
+    positions = list(BUCKETS)
+    line = {gid: rng.choice(positions[:3]) for gid, *_ in GROUPS}
+    turnout = rng.choice([0.1, 0.3, 0.9, 1.0])
+    ballots = []
+    for pid, gid in members:
+        if rng.random() > turnout:
+            continue
+        pos = line[gid] if rng.random() < 0.95 else rng.choice(positions)
+        ballots.append((pid, gid, pos))
+    maps = []
+    if ballots and rng.random() < 0.1:
+        pid, _, pos = rng.choice(ballots)
+        maps.append((pid, rng.choice([p for p in positions if p != pos])))
+    title = rng.choice(TITLES).format(n=rng.randint(1, 3000))
+    return scrutin_xml(numero, day.isoformat(), title, ballots, maps)
+
+
+def write_scrutins_zip(path: Path, n: int, n_deputies: int = 577, seed: int = 0,
+                       days: int = 600, composite: bool = False) -> Path:
+    """
+    Ecrit un `Scrutins.xml.zip` de `n` scrutins répartis sur `days` jours
+    (~2 ans) ; composite : un seul XML <scrutins> comme les dumps des
+    anciennes législatures.
+    """
+    rng = random.Random(seed)
+    members = chamber(n_deputies)
+    start = date(2024, 10, 1)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    xmls = (
+        random_scrutin(i, members, rng, start + timedelta(days=i * days // max(n, 1)))
+        for i in range(1, n + 1)
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        if not composite:
+            for i, xml in enumerate(xmls, start=1):
+                zf.writestr(f"xml/VTANR5L17V{i}.xml", xml)
+            return path
+        root = f'<scrutin xmlns="{NS}" xmlns:xsi="{XSI}">'.encode()
+        with zf.open("Scrutins.xml", "w") as f:
+            f.write(f'<?xml version="1.0" encoding="UTF-8"?>\n'
+                    f'<scrutins xmlns="{NS}" xmlns:xsi="{XSI}">\n'.encode())
+            for xml in xmls:
+                body = xml.split(b"\n", 1)[1].replace(root, b"<scrutin>", 1)
+                f.write(body)
+            f.write(b"</scrutins>\n")
+    return path
+
+
+def write_acteurs_zip(path: Path, n_deputies: int = 577) -> Path:
+    """Ecrit un dump AMO multi-fichiers (`json/acteur/*.json`, `json/organe/*.json`)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i, (pid, _) in enumerate(chamber(n_deputies)):
+            zf.writestr(f"json/acteur/{pid}.json", json.dumps({"acteur": {
+                "uid": {"#text": pid},
+                "etatCivil": {"ident": {"prenom": f"Prénom{i}", "nom": f"Nom{i}"}},
+            }}))
+        for gid, acronym, name, _ in GROUPS + [(ASSEMBLEE, "Assemblée", "Assemblée nationale", 0)]:
+            zf.writestr(f"json/organe/{gid}.json", json.dumps({"organe": {
+                "uid": gid, "libelle": name, "libelleAbrege": acronym,
+            }}))
+    return path
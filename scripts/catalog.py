@@ -0,0 +1,84 @@
+"""
+Catalogue paginé des scrutins (data/catalog/) avec index de recherche.
+
+- catalog/meta.json          : taille de page, nombre de pages, total, mois,
+                               effectifs par thème et par résultat
+- catalog/pages/NNNN.json    : lignes de l'index (mêmes champs que
+                               index.json), PAGE_SIZE par page, du plus
+                               récent au plus ancien
+- catalog/tokens/<pp>.json   : index inversé des titres, une tranche par
+                               préfixe de 2 caractères :
+                               {"token": [rangs, ...]}
+- catalog/facets.json        : rangs par thème et par result_status
+
+Un rang est la position d'un scrutin dans le catalogue : il est sur la
+page rang // page_size. Les listes de rangs sont triées (donc du plus
+récent au plus ancien) et s'intersectent directement côté client.
+
+Les tokens sont les mots des titres en minuscules et sans accents
+(fold_accents), d'au moins 2 caractères, hors mots vides. Une recherche ne
+charge que les tranches des préfixes de ses mots, puis les pages des
+lignes à afficher. Le dernier mot tapé matche en préfixe ("hopit" trouve
+"hopital" et "hopitaux"), ce qui tient lieu de racinisation.
+"""
+import re
+
+from themes import fold_accents
+
+PAGE_SIZE = 200
+PREFIX_LEN = 2
+
+_TOKEN = re.compile(r"\w+")
+
+# mots trop fréquents pour servir à filtrer (présents dans la plupart des titres)
+STOPWORDS = frozenset("""
+    au aux ce ces cet cette d dans de des du en et il l la le les leur leurs
+    n ne par pas pour qu que qui sa se ses son sur un une
+""".split())
+
+
+def tokenize(text: str) -> list[str]:
+    """'L'amendement n° 12 à l'article 3' -> ['amendement', '12', 'article']"""
+    seen = {}
+    for tok in _TOKEN.findall(fold_accents((text or "").lower())):
+        if len(tok) >= PREFIX_LEN and tok not in STOPWORDS:
+            seen.setdefault(tok, None)
+    return list(seen)
+
+
+def page_name(n: int) -> str:
+    return f"{n:04d}"
+
+
+def build_catalog(index_items: list[dict], generated_at: str,
+                  months: list[str]) -> tuple[dict, list[list[dict]], dict, dict]:
+    """
+    index_items (déjà triés du plus récent au plus ancien) ->
+    (meta, pages, tranches {préfixe: {token: rangs}}, facettes)
+    """
+    pages = [index_items[i:i + PAGE_SIZE] for i in range(0, len(index_items), PAGE_SIZE)]
+
+    shards: dict[str, dict[str, list[int]]] = {}
+    themes: dict[str, list[int]] = {}
+    results: dict[str, list[int]] = {}
+    for rank, item in enumerate(index_items):
+        for tok in tokenize(item["title"]):
+            shards.setdefault(tok[:PREFIX_LEN], {}).setdefault(tok, []).append(rank)
+        for slug in item["themes"] or []:
+            themes.setdefault(slug, []).append(rank)
+        if item["result_status"]:
+            results.setdefault(item["result_status"], []).append(rank)
+
+    meta = {
+        "generated_at": generated_at,
+        "version": 1,
+        "page_size": PAGE_SIZE,
+        "pages": len(pages),
+        "total": len(index_items),
+        "months": months,
+        "prefix_len": PREFIX_LEN,
+        "themes": {slug: len(r) for slug, r in themes.items()},
+        "result_status": {status: len(r) for status, r in results.items()},
+    }
+    facets = {"themes": themes, "result_status": results}
+    return meta, pages, shards, facets
@@ -0,0 +1,121 @@
+"""
+Format colonnaire des fichiers data/scrutins/YYYY-MM.json (version 1).
+
+Au lieu d'une liste de dicts par scrutin (nom, groupe, libellés recopiés
+à chaque vote), chaque scrutin porte trois tableaux parallèles :
+
+    "votes": {"person": [12, 40, ...], "group": [3, 3, ...], "position": [0, 1, ...]}
+
+- person   : indice dans people.json["people"]
+- group    : indice dans people.json["groups"] (-1 = sans groupe)
+- position : indice dans POSITIONS
+
+people.json porte alors en plus "format", "version", "groups" et
+"dictionary" : l'empreinte des deux dictionnaires. Un fichier de mois n'est
+lisible qu'avec le people.json de même empreinte.
+
+decode_month() est le décodeur de référence : il reconstruit exactement le
+fichier de mois au format historique.
+"""
+import hashlib
+import json
+
+from votes import POSITIONS
+
+FORMAT = "columnar"
+VERSION = 1
+
+
+def dictionaries(table, people: list[dict]) -> tuple[list[dict], list[int], list[int]]:
+    """
+    Dictionnaire des groupes (trié par id) et correspondances
+    code VoteTable -> indice pour les personnes (ordre de `people`)
+    et les groupes.
+    """
+    # lecture seule : une personne absente de la table n'y est pas ajoutée
+    person_index = [-1] * len(table.person_ids)
+    for i, p in enumerate(people):
+        code = table.find_person(p["person_id"])
+        if code is not None:
+            person_index[code] = i
+
+    codes = sorted(range(1, len(table.group_ids)), key=lambda g: table.group_ids[g])
+    groups = [
+        {
+            "group_id": table.group_ids[g],
+            "acronym": table.group_acronyms[g],
+            "name": table.group_names[g],
+        }
+        for g in codes
+    ]
+    group_index = [-1] * len(table.group_ids)
+    for i, g in enumerate(codes):
+        group_index[g] = i
+    return groups, person_index, group_index
+
+
+def fingerprint(people: list[dict], groups: list[dict]) -> str:
+    """Empreinte des dictionnaires : change dès qu'un indice change."""
+    key = [[p["person_id"] for p in people], [g["group_id"] for g in groups]]
+    return hashlib.sha1(json.dumps(key).encode("utf-8")).hexdigest()[:16]
+
+
+def encode_scrutin(s: dict, person_index: list[int], group_index: list[int]) -> dict:
+    """Scrutin dont les votes (VoteSlice) sont remplacés par les tableaux."""
+    sl = s["votes"]
+    table = sl.table
+    out = {k: v for k, v in s.items() if k != "votes"}
+    out["votes"] = {
+        "person": [person_index[c] for c in table.person[sl.start:sl.stop]],
+        "group": [group_index[c] for c in table.group[sl.start:sl.stop]],
+        "position": table.position[sl.start:sl.stop].tolist(),
+    }
+    return out
+
+
+def encode_month(month: str, items: list[dict], dictionary: str,
+                 person_index: list[int], group_index: list[int]) -> dict:
+    return {
+        "format": FORMAT,
+        "version": VERSION,
+        "dictionary": dictionary,
+        "month": month,
+        "scrutins": [encode_scrutin(s, person_index, group_index) for s in items],
+    }
+
+
+def decode_month(month: dict, people_doc: dict) -> dict:
+    """
+    Fichier de mois colonnaire + people.json -> fichier de mois au format
+    historique (votes en dicts). Un fichier historique est rendu tel quel.
+    """
+    if month.get("format") != FORMAT:
+        return month
+    if month.get("version") != VERSION:
+        raise ValueError(f"version {month.get('version')} du format colonnaire non supportée")
+    if month.get("dictionary") != people_doc.get("dictionary"):
+        raise ValueError("people.json ne correspond pas à ce fichier de mois")
+
+    people = people_doc["people"]
+    groups = people_doc["groups"]
+    scrutins = []
+    for s in month["scrutins"]:
+        cols = s["votes"]
+        votes = []
+        for p, g, pos in zip(cols["person"], cols["group"], cols["position"]):
+            person = people[p]
+            v = {
+                "person_id": person["person_id"],
+                "position": POSITIONS[pos],
+                "group": None,
+                "constituency": None,
+                "name": person["name"],
+            }
+            if g >= 0:
+                group = groups[g]
+                v["group"] = group["group_id"]
+                v["group_name"] = group["name"]
+                v["group_acronym"] = group["acronym"]
+            votes.append(v)
+        scrutins.append({**s, "votes": votes})
+    return {"month": month["month"], "scrutins": scrutins}
@@ -0,0 +1,245 @@
+"""
+Cube de statistiques pré-calculé : groupe × thème × mois et député × thème.
+
+Toutes les mesures sont des comptages entiers, donc additives : une fenêtre
+de mois quelconque se déduit de deux cases du cube cumulé, en O(1).
+
+- group_cube : pour chaque (groupe, thème, mois), cumul depuis le premier
+  mois de GROUP_MEASURES. Le thème "*" (indice 0) compte chaque scrutin une
+  fois, quel que soit son nombre de thèmes. L'axe des mois est continu (les
+  mois sans scrutin répètent le cumul précédent) : une fenêtre glissante de
+  n mois est values[..., m] - values[..., m - n].
+- deputy_cube : pour chaque (député, thème), DEPUTY_MEASURES sur tout
+  l'historique (premier vote par scrutin, marques de loyauté comprises).
+
+Taux dérivés (voir rates) :
+- cohésion = Σ voix de la position majoritaire / Σ voix du groupe, soit la
+  cohésion des fiches groupes pondérée par le nombre de votants ;
+- participation = part des voix qui ne sont pas des non-votants.
+
+Avec NumPy, les cases sont remplies par bincount et cumulées par cumsum ;
+sinon par des boucles Python. Les deux chemins donnent les mêmes entiers.
+"""
+from itertools import chain
+
+from aggregate import DISSENT, LOYAL, POSITION_KEYS, VoteAccumulator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ALL_THEMES = "*"
+
+GROUP_MEASURES = [*POSITION_KEYS, "scrutins", "majority"]
+DEPUTY_MEASURES = [*POSITION_KEYS, "loyal", "dissent"]
+
+
+# ---------------------------------------------------------------------------
+# Axes
+# ---------------------------------------------------------------------------
+
+def _month_axis(months) -> list[str]:
+    """Mois continus du premier au dernier de `months` (YYYY-MM)."""
+    months = sorted(months)
+    if not months:
+        return []
+    year, month = map(int, months[0].split("-"))
+    axis = []
+    while True:
+        key = f"{year:04d}-{month:02d}"
+        axis.append(key)
+        if key >= months[-1]:
+            return axis
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _theme_axis(scrutins: list[dict]):
+    """
+    (thèmes, [indices de thèmes de chaque scrutin]) ; "*" en tête, présent
+    dans chaque scrutin.
+    """
+    themes = [ALL_THEMES, *sorted({t for s in scrutins for t in s.get("themes", [])})]
+    index = {t: i for i, t in enumerate(themes)}
+    per_scrutin = [
+        [0, *(index[t] for t in dict.fromkeys(s.get("themes", [])))]
+        for s in scrutins
+    ]
+    return themes, per_scrutin
+
+
+# ---------------------------------------------------------------------------
+# Groupe × thème × mois
+# ---------------------------------------------------------------------------
+
+def _group_cells(acc: VoteAccumulator, listed: dict[str, int], months: dict[str, int],
+                 themes_by_id: dict[str, list[int]]):
+    """(indice groupe, indice mois, indices thèmes, mesures) par (groupe, scrutin)."""
+    for gid, per_scrutin in acc.group_votes():
+        i = listed.get(gid)
+        if i is None:
+            continue
+        for r in per_scrutin:
+            counts = [r["group_counts"][key] for key in POSITION_KEYS]
+            yield (i, months[r["date"][:7]], themes_by_id[r["scrutin_id"]],
+                   [*counts, 1, max(counts)])
+
+
+def _group_py(cells, shape):
+    n_groups, n_themes, n_months, n_measures = shape
+    values = [[[[0] * n_measures for _ in range(n_months)] for _ in range(n_themes)]
+              for _ in range(n_groups)]
+    for i, m, themes, measures in cells:
+        for t in themes:
+            cell = values[i][t][m]
+            for j, v in enumerate(measures):
+                cell[j] += v
+    for per_theme in values:
+        for per_month in per_theme:
+            for prev, cell in zip(per_month, per_month[1:]):
+                for j in range(n_measures):
+                    cell[j] += prev[j]
+    return values
+
+
+def _group_np(cells, shape):
+    n_groups, n_themes, n_months, n_measures = shape
+    flat, measures = [], []
+    for i, m, themes, values in cells:
+        for t in themes:
+            flat.append((i * n_themes + t) * n_months + m)
+            measures.append(values)
+    n_cells = n_groups * n_themes * n_months
+    values = np.zeros((n_cells, n_measures), dtype=np.int64)
+    if flat:
+        measures = np.asarray(measures, dtype=np.int64)
+        flat = np.asarray(flat, dtype=np.int64)
+        for j in range(n_measures):
+            values[:, j] = np.bincount(flat, weights=measures[:, j], minlength=n_cells)
+    return values.reshape(shape).cumsum(axis=2).tolist()
+
+
+def group_cube(acc: VoteAccumulator, groups: list[dict],
+               vectorized: bool | None = None) -> dict:
+    """
+    Cube cumulé groupe × thème × mois pour les groupes de `groups` (fiches,
+    même ordre) : {"groups", "themes", "months", "measures", "values"},
+    values[g][t][m] = GROUP_MEASURES cumulées jusqu'au mois m inclus.
+    """
+    if vectorized is None:
+        vectorized = np is not None
+    themes, per_scrutin = _theme_axis(acc.scrutins)
+    themes_by_id: dict[str, list[int]] = {}
+    for s, ts in zip(acc.scrutins, per_scrutin):
+        themes_by_id.setdefault(s["id"], ts)
+    months = _month_axis({s["date"][:7] for s in acc.scrutins})
+    listed = {g["group_id"]: i for i, g in enumerate(groups)}
+
+    cells = _group_cells(acc, listed, {m: i for i, m in enumerate(months)}, themes_by_id)
+    shape = (len(groups), len(themes), len(months), len(GROUP_MEASURES))
+    values = (_group_np if vectorized else _group_py)(cells, shape)
+    return {
+        "groups": [g["group_id"] for g in groups],
+        "themes": themes,
+        "months": months,
+        "measures": GROUP_MEASURES,
+        "values": values,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Député × thème
+# ---------------------------------------------------------------------------
+
+def _deputy_py(histories, per_scrutin: list[list[int]], n_themes: int):
+    people, values = [], []
+    for p, votes in histories:
+        row = [[0] * len(DEPUTY_MEASURES) for _ in range(n_themes)]
+        for k, pos, flag in votes:
+            for t in per_scrutin[k]:
+                cell = row[t]
+                cell[pos] += 1
+                if flag == LOYAL:
+                    cell[4] += 1
+                elif flag == DISSENT:
+                    cell[5] += 1
+        people.append(p)
+        values.append(row)
+    return people, values
+
+
+def _deputy_np(histories, per_scrutin: list[list[int]], n_themes: int):
+    people, sizes, votes = [], [], []
+    for p, v in histories:
+        people.append(p)
+        sizes.append(len(v))
+        votes.append(v)
+    n_votes = sum(sizes)
+    k, pos, flag = (
+        np.fromiter((x[j] for x in chain.from_iterable(votes)), dtype=np.int64, count=n_votes)
+        for j in range(3)
+    )
+    who = np.repeat(np.arange(len(people)), sizes)
+
+    # thèmes des scrutins en CSR, puis une ligne par (vote, thème)
+    n_per = np.fromiter((len(ts) for ts in per_scrutin), dtype=np.int64,
+                        count=len(per_scrutin))
+    ptr = np.concatenate(([0], n_per.cumsum()))
+    flat_themes = np.fromiter(chain.from_iterable(per_scrutin), dtype=np.int64, count=ptr[-1])
+    reps = n_per[k]
+    row = np.repeat(np.arange(n_votes), reps)
+    offset = np.arange(len(row)) - np.repeat(np.cumsum(reps) - reps, reps)
+    theme = flat_themes[ptr[k][row] + offset]
+    cell = (who[row] * n_themes + theme) * len(DEPUTY_MEASURES)
+
+    size = len(people) * n_themes * len(DEPUTY_MEASURES)
+    values = np.bincount(cell + pos[row], minlength=size)
+    flagged = flag[row] > 0
+    values += np.bincount(cell[flagged] + 3 + flag[row][flagged], minlength=size)
+    return people, values.reshape(len(people), n_themes, len(DEPUTY_MEASURES)).tolist()
+
+
+def deputy_cube(acc: VoteAccumulator, vectorized: bool | None = None) -> dict:
+    """
+    Cube député × thème : {"deputies", "themes", "measures", "values"},
+    values[d][t] = DEPUTY_MEASURES du député sur les scrutins du thème.
+    Députés triés par person_id.
+    """
+    if vectorized is None:
+        vectorized = np is not None
+    themes, per_scrutin = _theme_axis(acc.scrutins)
+    people, values = (_deputy_np if vectorized else _deputy_py)(
+        acc.histories(flags=True), per_scrutin, len(themes)
+    )
+    ids = [acc.table.person_ids[p] for p in people]
+    order = sorted(range(len(ids)), key=ids.__getitem__)
+    return {
+        "deputies": [ids[i] for i in order],
+        "themes": themes,
+        "measures": DEPUTY_MEASURES,
+        "values": [values[i] for i in order],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Lecture
+# ---------------------------------------------------------------------------
+
+def window(cube: dict, group: int, theme: int, first: int, last: int) -> list[int]:
+    """GROUP_MEASURES du groupe sur les mois first..last inclus (indices)."""
+    per_month = cube["values"][group][theme]
+    if first > 0:
+        return [b - a for a, b in zip(per_month[first - 1], per_month[last])]
+    return list(per_month[last])
+
+
+def rates(measures: list[int]) -> dict:
+    """Cohésion et participation (%) de mesures GROUP_MEASURES."""
+    total = sum(measures[:len(POSITION_KEYS)])
+    if not total:
+        return {"cohesion": None, "participation": None}
+    nonvoting = measures[POSITION_KEYS.index("nonvoting")]
+    return {
+        "cohesion": round(measures[-1] / total * 100, 1),
+        "participation": round((total - nonvoting) / total * 100, 1),
+    }
@@ -0,0 +1,242 @@
+"""
+Export SQLite des scrutins, pour les requêtes ad hoc.
+
+Une base unique (ex: data/votes.sqlite) construite depuis les mêmes
+scrutins normalisés qu'export_all :
+
+    scrutins(id, chamber, date, month, title, object, scrutin_type,
+             result_status, count_for, count_against, count_abstain,
+             count_nonvoting, source_url)
+    votes(scrutin_id, person_id, group_id, position)
+    people(person_id, name, chamber, group_id)
+    groups(group_id, acronym, name)
+    scrutin_themes(scrutin_id, theme)
+    meta(key, value)
+
+Exemple : votes du groupe PO845401 sur les scrutins "budget" de 2025
+
+    SELECT s.id, s.date, v.position, COUNT(*)
+    FROM scrutin_themes t
+    JOIN scrutins s ON s.id = t.scrutin_id
+    JOIN votes v ON v.scrutin_id = s.id
+    WHERE t.theme = 'budget' AND v.group_id = 'PO845401'
+      AND s.date BETWEEN '2025-01-01' AND '2025-12-31'
+    GROUP BY s.id, v.position;
+
+Tout est écrit dans une seule transaction (executemany), base en WAL.
+En incrémental, seuls les scrutins des mois modifiés sont mis à jour
+(upsert, votes et thèmes remplacés) ; people et groups sont remplacés et
+les scrutins disparus supprimés.
+"""
+import sqlite3
+from pathlib import Path
+
+from aggregate import VoteAccumulator
+from votes import POSITIONS
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS scrutins (
+    id TEXT PRIMARY KEY,
+    chamber TEXT NOT NULL,
+    date TEXT NOT NULL,
+    month TEXT NOT NULL,
+    title TEXT,
+    object TEXT,
+    scrutin_type TEXT,
+    result_status TEXT,
+    count_for INTEGER,
+    count_against INTEGER,
+    count_abstain INTEGER,
+    count_nonvoting INTEGER,
+    source_url TEXT
+);
+CREATE TABLE IF NOT EXISTS votes (
+    scrutin_id TEXT NOT NULL,
+    person_id TEXT NOT NULL,
+    group_id TEXT,
+    position TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS people (
+    person_id TEXT PRIMARY KEY,
+    name TEXT,
+    chamber TEXT,
+    group_id TEXT
+);
+CREATE TABLE IF NOT EXISTS groups (
+    group_id TEXT PRIMARY KEY,
+    acronym TEXT,
+    name TEXT
+);
+CREATE TABLE IF NOT EXISTS scrutin_themes (
+    scrutin_id TEXT NOT NULL,
+    theme TEXT NOT NULL,
+    PRIMARY KEY (scrutin_id, theme)
+) WITHOUT ROWID;
+"""
+
+# créés en fin de transaction : au premier build, plus rapide que de les
+# tenir à jour pendant les insertions
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS scrutins_date ON scrutins (date);
+CREATE INDEX IF NOT EXISTS scrutins_month ON scrutins (month);
+CREATE INDEX IF NOT EXISTS votes_scrutin ON votes (scrutin_id);
+CREATE INDEX IF NOT EXISTS votes_person ON votes (person_id, scrutin_id);
+CREATE INDEX IF NOT EXISTS votes_group ON votes (group_id, scrutin_id);
+CREATE INDEX IF NOT EXISTS themes_theme ON scrutin_themes (theme, scrutin_id);
+"""
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    # isolation_level=None : transactions explicites (BEGIN / COMMIT)
+    con = sqlite3.connect(path, isolation_level=None)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    return con
+
+
+def _remove_db(path: Path):
+    for p in (path, path.with_name(path.name + "-wal"), path.with_name(path.name + "-shm")):
+        p.unlink(missing_ok=True)
+
+
+def _meta(con: sqlite3.Connection) -> dict:
+    try:
+        return dict(con.execute("SELECT key, value FROM meta"))
+    except sqlite3.DatabaseError:
+        return {}
+
+
+def _scrutin_row(s: dict) -> tuple:
+    counts = s.get("counts") or {}
+    return (
+        s["id"], s["chamber"], s["date"], s["date"][:7], s.get("title"),
+        s.get("object"), s.get("scrutin_type"), s.get("result_status"),
+        counts.get("for"), counts.get("against"), counts.get("abstention"),
+        counts.get("nonvoting"), s.get("source_url"),
+    )
+
+
+def _vote_rows(items: list[dict]):
+    """(scrutin_id, person_id, group_id, position) depuis la table de votes."""
+    for s in items:
+        sl = s["votes"]
+        table = sl.table
+        person_ids = table.person_ids
+        group_ids = table.group_ids
+        sid = s["id"]
+        for p, g, pos in zip(table.person[sl.start:sl.stop],
+                             table.group[sl.start:sl.stop],
+                             table.position[sl.start:sl.stop]):
+            yield sid, person_ids[p], group_ids[g], POSITIONS[pos]
+
+
+def export_sqlite(path: Path, scrutins: list[dict], generated_at: str,
+                  acc: VoteAccumulator, changed_months: set[str] | None = None,
+                  previous_build: str | None = None) -> int:
+    """
+    Ecrit (ou met à jour) la base SQLite `path`.
+
+    changed_months: mois dont les scrutins sont réécrits ; None = base
+    reconstruite entièrement.
+    previous_build: generated_at du build précédent. La mise à jour
+    incrémentale n'est faite que si la base en est issue (sinon des mois
+    modifiés entre-temps manqueraient).
+
+    Retourne le nombre de scrutins (re)écrits.
+    """
+    con = _connect(path) if path.exists() else None
+    if con is not None:
+        meta = _meta(con)
+        if (changed_months is None or previous_build is None
+                or meta.get("schema_version") != str(SCHEMA_VERSION)
+                or meta.get("generated_at") != previous_build):
+            con.close()
+            con = None
+    if con is None:
+        changed_months = None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _remove_db(path)
+        con = _connect(path)
+        con.executescript(_SCHEMA)
+
+    if changed_months is None:
+        items = scrutins
+    else:
+        items = [s for s in scrutins if s["date"][:7] in changed_months]
+
+    try:
+        con.execute("BEGIN")
+
+        # scrutins disparus de la source
+        con.execute("CREATE TEMP TABLE current_ids (id TEXT PRIMARY KEY)")
+        con.executemany("INSERT OR IGNORE INTO current_ids VALUES (?)",
+                        ((s["id"],) for s in scrutins))
+        gone = "SELECT id FROM scrutins WHERE id NOT IN (SELECT id FROM current_ids)"
+        con.execute(f"DELETE FROM votes WHERE scrutin_id IN ({gone})")
+        con.execute(f"DELETE FROM scrutin_themes WHERE scrutin_id IN ({gone})")
+        con.execute(f"DELETE FROM scrutins WHERE id IN ({gone})")
+        con.execute("DROP TABLE current_ids")
+
+        # votes et thèmes des scrutins touchés : remplacés en bloc
+        if changed_months is not None:
+            ids = [(s["id"],) for s in items]
+            con.executemany("DELETE FROM votes WHERE scrutin_id = ?", ids)
+            con.executemany("DELETE FROM scrutin_themes WHERE scrutin_id = ?", ids)
+
+        con.executemany(
+            """INSERT INTO scrutins VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)
+               ON CONFLICT (id) DO UPDATE SET
+                 chamber=excluded.chamber, date=excluded.date, month=excluded.month,
+                 title=excluded.title, object=excluded.object,
+                 scrutin_type=excluded.scrutin_type, result_status=excluded.result_status,
+                 count_for=excluded.count_for, count_against=excluded.count_against,
+                 count_abstain=excluded.count_abstain,
+                 count_nonvoting=excluded.count_nonvoting,
+                 source_url=excluded.source_url""",
+            (_scrutin_row(s) for s in items),
+        )
+        con.executemany("INSERT INTO votes VALUES (?,?,?,?)", _vote_rows(items))
+        con.executemany(
+            "INSERT OR IGNORE INTO scrutin_themes VALUES (?,?)",
+            ((s["id"], t) for s in items for t in s.get("themes") or []),
+        )
+
+        # référentiels (quelques centaines de lignes) : remplacés en entier
+        con.execute("DELETE FROM groups")
+        con.execute("DELETE FROM people")
+        table = acc.table
+        if table is not None:
+            con.executemany(
+                "INSERT INTO groups VALUES (?,?,?)",
+                ((table.group_ids[g], table.group_acronyms[g], table.group_names[g])
+                 for g in range(1, len(table.group_ids))),
+            )
+        con.executemany(
+            "INSERT INTO people VALUES (?,?,?,?)",
+            ((p["person_id"], p["name"], p["chamber"], p.get("group")) for p in acc.people()),
+        )
+
+        con.executemany(
+            "INSERT OR REPLACE INTO meta VALUES (?,?)",
+            [("schema_version", str(SCHEMA_VERSION)), ("generated_at", generated_at)],
+        )
+        for stmt in _INDEXES.strip().split(";"):
+            if stmt.strip():
+                con.execute(stmt)
+        # statistiques pour le planificateur : sans elles, une requête
+        # groupe + thème + période parcourt tous les votes du groupe
+        con.execute("ANALYZE")
+        con.execute("COMMIT")
+    except BaseException:
+        if con.in_transaction:
+            con.execute("ROLLBACK")
+        raise
+    finally:
+        con.close()
+    return len(items)
@@ -0,0 +1,184 @@
+"""
+Export Parquet des votes pour la chaîne d'analyse (pyarrow, optionnel).
+
+    <dir>/votes/month=YYYY-MM/part-0.parquet   un fichier par mois
+    <dir>/scrutins.parquet                      table de dimension
+
+votes : (scrutin_id, date, person_id, group_id, position), partitionné par
+mois (partitionnement "hive", lisible par pyarrow.dataset, DuckDB, Spark,
+Polars...). scrutin_id, person_id, group_id et position sont des colonnes
+dictionnaire : les indices sont pris tels quels dans les colonnes de la
+VoteTable, sans reconstruire un dict par vote.
+
+scrutins : une ligne par scrutin, les thèmes en colonne liste.
+
+    import pyarrow.dataset as ds
+    votes = ds.dataset("parquet/votes", partitioning="hive")
+    votes.to_table(filter=ds.field("month") == "2025-03")
+
+Les mois sont écrits l'un après l'autre (un seul mois en mémoire côté
+Arrow) ; avec changed_months, seuls ces mois sont réécrits.
+"""
+import json
+import os
+from array import array
+from datetime import date
+from pathlib import Path
+
+from aggregate import VoteAccumulator
+from votes import POSITIONS
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+COMPRESSION = "zstd"
+PART_NAME = "part-0.parquet"
+# generated_at du dernier export (préfixe "_" : ignoré par pyarrow.dataset)
+BUILD_NAME = "_build.json"
+
+if pa is not None:
+    VOTES_SCHEMA = pa.schema([
+        ("scrutin_id", pa.dictionary(pa.int32(), pa.string())),
+        ("date", pa.date32()),
+        ("person_id", pa.dictionary(pa.int32(), pa.string())),
+        ("group_id", pa.dictionary(pa.int32(), pa.string())),
+        ("position", pa.dictionary(pa.int8(), pa.string())),
+    ])
+    SCRUTINS_SCHEMA = pa.schema([
+        ("scrutin_id", pa.string()),
+        ("chamber", pa.dictionary(pa.int8(), pa.string())),
+        ("date", pa.date32()),
+        ("month", pa.string()),
+        ("title", pa.string()),
+        ("object", pa.string()),
+        ("scrutin_type", pa.dictionary(pa.int8(), pa.string())),
+        ("result_status", pa.dictionary(pa.int8(), pa.string())),
+        ("count_for", pa.int32()),
+        ("count_against", pa.int32()),
+        ("count_abstain", pa.int32()),
+        ("count_nonvoting", pa.int32()),
+        ("source_url", pa.string()),
+        ("themes", pa.list_(pa.string())),
+    ])
+
+
+def _codes(values, arrow_type) -> "pa.Array":
+    """array.array (int32 / int8) -> pa.Array sans copie élément par élément."""
+    return pa.Array.from_buffers(arrow_type, len(values), [None, pa.py_buffer(values)])
+
+
+def _month_batch(items: list[dict], table) -> "pa.RecordBatch":
+    """Votes d'un mois : colonnes Arrow construites depuis la VoteTable."""
+    person = array("i")
+    group = array("i")
+    position = array("b")
+    scrutin = array("i")
+    for k, s in enumerate(items):
+        sl = s["votes"]
+        person.extend(table.person[sl.start:sl.stop])
+        group.extend(table.group[sl.start:sl.stop])
+        position.extend(table.position[sl.start:sl.stop])
+        scrutin.extend(array("i", [k]) * len(sl))
+
+    scrutin_idx = _codes(scrutin, pa.int32())
+    dates = pa.array([date.fromisoformat(s["date"]) for s in items], pa.date32())
+    # code groupe 0 = sans groupe -> null ; les autres décalés de 1
+    group_codes = _codes(group, pa.int32())
+    no_group = pc.equal(group_codes, 0)
+    group_idx = pc.if_else(no_group, None, pc.subtract(group_codes, 1))
+
+    return pa.RecordBatch.from_arrays([
+        pa.DictionaryArray.from_arrays(scrutin_idx, pa.array([s["id"] for s in items], pa.string())),
+        dates.take(scrutin_idx),
+        pa.DictionaryArray.from_arrays(_codes(person, pa.int32()),
+                                       pa.array(table.person_ids, pa.string())),
+        pa.DictionaryArray.from_arrays(group_idx, pa.array(table.group_ids[1:], pa.string())),
+        pa.DictionaryArray.from_arrays(_codes(position, pa.int8()),
+                                       pa.array(POSITIONS, pa.string())),
+    ], schema=VOTES_SCHEMA)
+
+
+def _scrutins_table(scrutins: list[dict]) -> "pa.Table":
+    rows = sorted(scrutins, key=lambda x: (x["date"], x["id"]), reverse=True)
+    counts = [s.get("counts") or {} for s in rows]
+    columns = {
+        "scrutin_id": [s["id"] for s in rows],
+        "chamber": [s["chamber"] for s in rows],
+        "date": [date.fromisoformat(s["date"]) for s in rows],
+        "month": [s["date"][:7] for s in rows],
+        "title": [s.get("title") for s in rows],
+        "object": [s.get("object") for s in rows],
+        "scrutin_type": [s.get("scrutin_type") for s in rows],
+        "result_status": [s.get("result_status") for s in rows],
+        "count_for": [c.get("for") for c in counts],
+        "count_against": [c.get("against") for c in counts],
+        "count_abstain": [c.get("abstention") for c in counts],
+        "count_nonvoting": [c.get("nonvoting") for c in counts],
+        "source_url": [s.get("source_url") for s in rows],
+        "themes": [s.get("themes") or [] for s in rows],
+    }
+    return pa.table(
+        [pa.array(columns[f.name], f.type) if not pa.types.is_dictionary(f.type)
+         else pa.array(columns[f.name], pa.string()).dictionary_encode().cast(f.type)
+         for f in SCRUTINS_SCHEMA],
+        schema=SCRUTINS_SCHEMA,
+    )
+
+
+def _write_table(path: Path, table: "pa.Table"):
+    # écriture dans un fichier temporaire : un lecteur ne voit jamais de
+    # fichier Parquet tronqué
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    pq.write_table(table, tmp, compression=COMPRESSION)
+    os.replace(tmp, path)
+
+
+def export_parquet(out_dir: Path, scrutins: list[dict], generated_at: str,
+                   acc: VoteAccumulator, changed_months: set[str] | None = None,
+                   previous_build: str | None = None) -> list[str]:
+    """
+    Ecrit le jeu de données Parquet dans `out_dir`.
+    changed_months: si fourni, seuls ces mois (et les partitions manquantes)
+    sont réécrits ; les mois disparus sont supprimés.
+    previous_build: generated_at du build précédent ; si le jeu de données
+    n'en est pas issu, tous les mois sont réécrits.
+    Retourne la liste des mois écrits.
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow n'est pas installé (pip install pyarrow)")
+
+    build_path = out_dir / BUILD_NAME
+    try:
+        last = json.loads(build_path.read_text(encoding="utf-8")).get("generated_at")
+    except (OSError, ValueError):
+        last = None
+    if previous_build is None or last != previous_build:
+        changed_months = None
+
+    votes_dir = out_dir / "votes"
+    written = []
+    table = acc.table
+    for month_key, items in sorted(acc.by_month.items()):
+        path = votes_dir / f"month={month_key}" / PART_NAME
+        if (changed_months is not None and month_key not in changed_months
+                and path.exists()):
+            continue
+        items.sort(key=lambda x: (x["date"], x["id"]), reverse=True)
+        _write_table(path, pa.Table.from_batches([_month_batch(items, table)]))
+        written.append(month_key)
+
+    if votes_dir.exists():
+        for part in votes_dir.glob("month=*"):
+            if part.name.removeprefix("month=") not in acc.by_month:
+                for f in part.iterdir():
+                    f.unlink()
+                part.rmdir()
+
+    _write_table(out_dir / "scrutins.parquet", _scrutins_table(scrutins))
+    build_path.write_text(json.dumps({"generated_at": generated_at}) + "\n", encoding="utf-8")
+    return written
@@ -1,87 +1,343 @@
 import json
 from pathlib import Path
-from collections import defaultdict
 
+import affiliations
+import agreement
+import catalog
+import columnar
+import cube
+import instrument
+from artifacts import ArtifactWriter
+from aggregate import VoteAccumulator, accumulate
+from votes import VoteSlice, VoteTable
 
-def _write_json(path: Path, obj: dict):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(
-        json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
-        encoding="utf-8",
-    )
+# formats des fichiers data/scrutins/YYYY-MM.json
+MONTH_FORMATS = ("legacy", columnar.FORMAT)
 
+# lignes de data/deputies/<id>.json (voir VoteAccumulator.deputy_votes)
+DEPUTY_VOTE_COLUMNS = ["scrutin_id", "date", "position", "loyalty", "title", "result_status"]
 
-def export_all(data_dir: Path, scrutins: list[dict], generated_at: str,
-               deputies: list[dict] = None, groups: list[dict] = None):
-    """
-    Ecrit:
-    - data/index.json (liste filtrable)
-    - data/people.json (référentiel minimal)
-    - data/scrutins/YYYY.json (détails + votes)
-    """
-    # index léger
-    index_items = []
-    for s in scrutins:
-        index_items.append(
-            {
-                "id": s["id"],
-                "chamber": s["chamber"],
-                "date": s["date"],
-                "title": s["title"],
-                "scrutin_type": s.get("scrutin_type"),
-                "result_status": s.get("result_status"),
-                "counts": s.get("counts"),
-                "themes": s.get("themes", []),
-                "source_url": s.get("source_url"),
-            }
-        )
+
+def _json_default(o):
+    # votes en colonnes : dicts historiques reconstruits à l'écriture
+    if isinstance(o, VoteSlice):
+        return list(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def _write_json(out: ArtifactWriter, path: Path, obj: dict, compact: bool = False):
+    if compact:
+        text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"),
+                          sort_keys=True, default=_json_default)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=True,
+                          default=_json_default)
+    return out.write(path, (text + "\n").encode("utf-8"))
+
+
+def _read_json(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _remove_stale(out: ArtifactWriter, directory: Path, keep: set[str]):
+    """Supprime les <stem>.json de `directory` absents de `keep`."""
+    if directory.exists():
+        for path in directory.glob("*.json"):
+            if path.stem not in keep:
+                out.remove(path)
+
+
+def index_item(s: dict) -> dict:
+    """Ligne de data/index.json (scrutin sans ses votes)."""
+    return {
+        "id": s["id"],
+        "chamber": s["chamber"],
+        "date": s["date"],
+        "title": s["title"],
+        "scrutin_type": s.get("scrutin_type"),
+        "result_status": s.get("result_status"),
+        "counts": s.get("counts"),
+        "themes": s.get("themes", []),
+        "source_url": s.get("source_url"),
+    }
+
+
+def write_index(out: ArtifactWriter, data_dir: Path, index_items: list[dict],
+                generated_at: str, minify: bool = False):
+    """data/index.json + data/catalog/ (voir catalog.py)."""
     index_items.sort(key=lambda x: (x["date"], x["id"]), reverse=True)
     # liste des mois disponibles pour le chargement on-demand
-    months = sorted(set(s["date"][:7] for s in scrutins))
-    _write_json(data_dir / "index.json", {
+    months = sorted(set(s["date"][:7] for s in index_items))
+    _write_json(out, data_dir / "index.json", {
         "generated_at": generated_at,
         "months": months,
         "scrutins": index_items,
-    })
+    }, compact=minify)
+
+    # catalogue paginé : la première page suffit au premier affichage
+    meta, pages, shards, facets = catalog.build_catalog(index_items, generated_at, months)
+    catalog_dir = data_dir / "catalog"
+    _write_json(out, catalog_dir / "meta.json", meta, compact=minify)
+    _write_json(out, catalog_dir / "facets.json", facets, compact=True)
+    for n, rows in enumerate(pages):
+        _write_json(out, catalog_dir / "pages" / f"{catalog.page_name(n)}.json",
+                    {"page": n, "scrutins": rows}, compact=True)
+    _remove_stale(out, catalog_dir / "pages", {catalog.page_name(n) for n in range(len(pages))})
+    for prefix, tokens in shards.items():
+        _write_json(out, catalog_dir / "tokens" / f"{prefix}.json", tokens, compact=True)
+    _remove_stale(out, catalog_dir / "tokens", set(shards))
+
 
+def people_document(acc: VoteAccumulator, generated_at: str,
+                    month_format: str = "legacy") -> tuple[dict, list[int], list[int]]:
+    """
+    Contenu de data/people.json, et en colonnaire les correspondances
+    code VoteTable -> indice (voir columnar.dictionaries).
+    """
     # people minimal (on enrichira plus tard)
-    people_map = {}
-    for s in scrutins:
-        for v in s.get("votes", []):
-            pid = v["person_id"]
-            if pid not in people_map:
-                people_map[pid] = {"person_id": pid, "name": v.get("name"), "chamber": s["chamber"]}
-            if v.get("group"):
-                people_map[pid]["group"] = v["group"]
-            if v.get("constituency"):
-                people_map[pid]["constituency"] = v["constituency"]
-            if v.get("name"):
-                people_map[pid]["name"] = v["name"]
-
-    people_list = sorted(people_map.values(), key=lambda p: ((p.get("name") or ""), p["person_id"]))
-    _write_json(data_dir / "people.json", {"generated_at": generated_at, "people": people_list})
-
-    # détails par mois (YYYY-MM) pour éviter les fichiers > 100 Mo
-    by_month = defaultdict(list)
-    for s in scrutins:
-        month_key = s["date"][:7]  # "2025-03"
-        by_month[month_key].append(s)
-
-    for month_key, items in by_month.items():
-        items.sort(key=lambda x: (x["date"], x["id"]), reverse=True)
-        _write_json(data_dir / "scrutins" / f"{month_key}.json",
-                    {"month": month_key, "scrutins": items})
-
-    # fiches députés
+    people = acc.people()
+    people_doc = {"generated_at": generated_at, "people": people}
+    person_index = group_index = None
+    if month_format == columnar.FORMAT:
+        groups_dict, person_index, group_index = columnar.dictionaries(
+            acc.table if acc.table is not None else VoteTable(), people)
+        people_doc.update({
+            "format": columnar.FORMAT,
+            "version": columnar.VERSION,
+            "groups": groups_dict,
+            "dictionary": columnar.fingerprint(people, groups_dict),
+        })
+    return people_doc, person_index, group_index
+
+
+def months_reusable(data_dir: Path, month_format: str, dictionary: str | None) -> bool:
+    """
+    Les mois déjà écrits sont-ils lisibles avec le people.json à venir ?
+    Les mois colonnaires pointent dans people.json : un changement de
+    format ou de dictionnaire oblige à réécrire tous les mois.
+    """
+    previous = _read_json(data_dir / "people.json")
+    return ((previous.get("format", "legacy"), previous.get("dictionary"))
+            == (month_format, dictionary))
+
+
+def write_people(out: ArtifactWriter, data_dir: Path, people_doc: dict, minify: bool = False):
+    _write_json(out, data_dir / "people.json", people_doc, compact=minify)
+
+
+def remove_stale_months(out: ArtifactWriter, data_dir: Path, months: set[str]):
+    """Supprime les data/scrutins/YYYY-MM.json des mois disparus."""
+    _remove_stale(out, data_dir / "scrutins", months)
+
+
+def write_month(out: ArtifactWriter, data_dir: Path, month_key: str, items: list[dict],
+                month_format: str = "legacy", people_doc: dict = None,
+                person_index: list[int] = None, group_index: list[int] = None,
+                minify: bool = False) -> bool:
+    """data/scrutins/YYYY-MM.json ; retourne True si le fichier a été écrit."""
+    items.sort(key=lambda x: (x["date"], x["id"]), reverse=True)
+    if month_format == columnar.FORMAT:
+        doc = columnar.encode_month(month_key, items, people_doc["dictionary"],
+                                    person_index, group_index)
+    else:
+        doc = {"month": month_key, "scrutins": items}
+    return _write_json(out, data_dir / "scrutins" / f"{month_key}.json", doc, compact=minify)
+
+
+def write_profiles(out: ArtifactWriter, data_dir: Path, acc: VoteAccumulator,
+                   generated_at: str, deputies: list[dict] = None,
+                   groups: list[dict] = None, minify: bool = False):
+    """data/deputies.json, data/groups.json et leurs fiches par id."""
+    # fiches députés + historique de chacun (une requête par fiche)
     if deputies is not None:
-        _write_json(data_dir / "deputies.json", {
+        _write_json(out, data_dir / "deputies.json", {
             "generated_at": generated_at,
             "deputies": deputies,
-        })
+        }, compact=minify)
+        written = set()
+        for pid, votes in acc.deputy_votes():
+            _write_json(out, data_dir / "deputies" / f"{pid}.json", {
+                "person_id": pid,
+                "columns": DEPUTY_VOTE_COLUMNS,
+                "votes": votes,
+            }, compact=True)
+            written.add(pid)
+        _remove_stale(out, data_dir / "deputies", written)
 
-    # fiches groupes
+    # fiches groupes + votes du groupe par scrutin
     if groups is not None:
-        _write_json(data_dir / "groups.json", {
+        _write_json(out, data_dir / "groups.json", {
             "generated_at": generated_at,
             "groups": groups,
-        })
\ No newline at end of file
+        }, compact=minify)
+        listed = {g["group_id"] for g in groups}
+        written = set()
+        for gid, per_scrutin in acc.group_votes():
+            if gid not in listed:
+                continue
+            _write_json(out, data_dir / "groups" / f"{gid}.json", {
+                "group_id": gid,
+                "per_scrutin": per_scrutin,
+            }, compact=True)
+            written.add(gid)
+        _remove_stale(out, data_dir / "groups", written)
+
+
+def write_affiliations(out: ArtifactWriter, data_dir: Path, acc: VoteAccumulator,
+                       generated_at: str):
+    """data/affiliations.json : périodes d'appartenance aux groupes par député."""
+    index = affiliations.AffiliationIndex.from_accumulator(acc)
+    _write_json(out, data_dir / "affiliations.json", {
+        "generated_at": generated_at,
+        "columns": affiliations.COLUMNS,
+        "people": index.to_dict(),
+    }, compact=True)
+
+
+def write_agreement(out: ArtifactWriter, data_dir: Path, acc: VoteAccumulator,
+                    generated_at: str, groups: list[dict] = None, minify: bool = False):
+    """data/agreement/ : voisins de vote des députés et matrice des groupes."""
+    _write_json(out, data_dir / "agreement" / "deputies.json", {
+        "generated_at": generated_at,
+        "k": agreement.TOP_K,
+        "min_common": agreement.MIN_COMMON,
+        "columns": ["person_id", "agreement", "common"],
+        "neighbours": agreement.deputy_neighbours(acc),
+    }, compact=True)
+    if groups is not None:
+        _write_json(out, data_dir / "agreement" / "groups.json", {
+            "generated_at": generated_at,
+            **agreement.group_matrix(acc, groups),
+        }, compact=minify)
+
+
+def write_loyalty(out: ArtifactWriter, data_dir: Path, acc: VoteAccumulator,
+                  generated_at: str, minify: bool = False):
+    """
+    data/loyalty/ : loyauté de chaque député envers la majorité de son
+    groupe (deputies.json) et dissidents de chaque scrutin (rebels.json).
+    """
+    deputies = {}
+    for pid, loyal, dissent, dissent_scrutins in acc.loyalty():
+        flagged = loyal + dissent
+        deputies[pid] = {
+            "loyal": loyal,
+            "dissent": dissent,
+            "rate": round(loyal / flagged * 100, 1) if flagged else None,
+            "dissent_scrutins": dissent_scrutins,
+        }
+    _write_json(out, data_dir / "loyalty" / "deputies.json", {
+        "generated_at": generated_at,
+        "deputies": deputies,
+    }, compact=True)
+    _write_json(out, data_dir / "loyalty" / "rebels.json", {
+        "generated_at": generated_at,
+        "columns": ["person_id", "group_id", "position"],
+        "rebels": dict(acc.rebels()),
+    }, compact=True)
+
+
+def write_cube(out: ArtifactWriter, data_dir: Path, acc: VoteAccumulator,
+               generated_at: str, groups: list[dict] = None):
+    """
+    data/cube/ : comptages cumulés groupe × thème × mois (groups.json) et
+    comptages député × thème (deputies.json), voir cube.py.
+    """
+    if groups is not None:
+        _write_json(out, data_dir / "cube" / "groups.json", {
+            "generated_at": generated_at,
+            "cumulative": True,
+            **cube.group_cube(acc, groups),
+        }, compact=True)
+    _write_json(out, data_dir / "cube" / "deputies.json", {
+        "generated_at": generated_at,
+        **cube.deputy_cube(acc),
+    }, compact=True)
+
+
+def export_all(data_dir: Path, scrutins: list[dict], generated_at: str,
+               deputies: list[dict] = None, groups: list[dict] = None,
+               changed_months: set[str] | None = None,
+               acc: VoteAccumulator = None,
+               month_format: str = "legacy", minify: bool = False,
+               assets: bool = False):
+    """
+    Ecrit:
+    - data/index.json (liste filtrable)
+    - data/catalog/ (index paginé + index de recherche, voir catalog.py)
+    - data/people.json (référentiel minimal)
+    - data/scrutins/YYYY-MM.json (détails + votes)
+    - data/deputies/PAxxxx.json (historique de vote d'un député)
+    - data/groups/POxxxx.json (votes du groupe par scrutin)
+    - data/affiliations.json (périodes d'appartenance aux groupes)
+    - data/agreement/ (taux d'accord entre députés et entre groupes)
+    - data/loyalty/ (votes fidèles / dissidents par député et par scrutin)
+    - data/cube/ (comptages par groupe × thème × mois et député × thème)
+
+    changed_months: si fourni, seuls ces mois (et les fichiers manquants) sont
+    réécrits dans data/scrutins/ ; les mois disparus sont supprimés.
+    acc: VoteAccumulator déjà alimenté par `scrutins` (people, mois,
+    historiques) ; recalculé si absent.
+    month_format: "legacy" (votes en dicts) ou "columnar" (tableaux
+    d'indices vers people.json, voir columnar.py).
+    minify: JSON sans indentation ni espaces pour tous les fichiers.
+    assets: copies au nom haché + variantes .gz/.br, voir artifacts.py.
+    Dans tous les cas un fichier au contenu inchangé n'est pas réécrit.
+
+    Tous les scrutins sont en mémoire ; pipeline.py enchaîne les mêmes
+    étapes mois par mois.
+
+    Retourne la liste des mois (re)écrits.
+    """
+    if month_format not in MONTH_FORMATS:
+        raise ValueError(f"format de mois inconnu: {month_format}")
+    out = ArtifactWriter(data_dir, assets=assets)
+
+    # index léger
+    with instrument.stage("index") as st:
+        write_index(out, data_dir, [index_item(s) for s in scrutins], generated_at, minify)
+        st.items = len(scrutins)
+
+    if acc is None:
+        acc = accumulate(scrutins)
+
+    with instrument.stage("months") as st:
+        people_doc, person_index, group_index = people_document(acc, generated_at, month_format)
+        if not months_reusable(data_dir, month_format, people_doc.get("dictionary")):
+            changed_months = None
+        write_people(out, data_dir, people_doc, minify)
+
+        # détails par mois (YYYY-MM) pour éviter les fichiers > 100 Mo
+        by_month = acc.by_month
+        scrutins_dir = data_dir / "scrutins"
+        written_months = []
+        for month_key, items in by_month.items():
+            path = scrutins_dir / f"{month_key}.json"
+            if (changed_months is not None and month_key not in changed_months
+                    and path.exists()):
+                continue
+            if write_month(out, data_dir, month_key, items, month_format,
+                           people_doc, person_index, group_index, minify):
+                written_months.append(month_key)
+
+        remove_stale_months(out, data_dir, set(by_month))
+        st.items = len(written_months)
+
+    with instrument.stage("profiles"):
+        write_profiles(out, data_dir, acc, generated_at, deputies, groups, minify)
+        write_affiliations(out, data_dir, acc, generated_at)
+
+    with instrument.stage("agreement"):
+        write_agreement(out, data_dir, acc, generated_at, groups, minify)
+
+    with instrument.stage("loyalty"):
+        write_loyalty(out, data_dir, acc, generated_at, minify)
+
+    with instrument.stage("cube"):
+        write_cube(out, data_dir, acc, generated_at, groups)
+
+    out.close()
+    return written_months
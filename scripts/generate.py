@@ -1,43 +1,317 @@
-from datetime import datetime, timezone
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import traceback
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-import shutil
 
-from sources.an import fetch_an_scrutins
-from normalize import normalize_an
+import instrument
+from sources import DEFAULT_SOURCES, SOURCES, exported, load_scrutins, prepare_sources
 from themes import load_themes, assign_themes
-from aggregate import aggregate_deputies, aggregate_groups
-from export import export_all
+from aggregate import accumulate
+from export import MONTH_FORMATS, export_all
+from database import export_sqlite
+from dataset import export_parquet
+from pipeline import build_streaming
+from publish import Publisher, write_status
 
 
 ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = ROOT / "data"
 
+# état du dernier build (empreinte de la config des thèmes, options d'export,
+# date de génération)
+BUILD_STATE = Path(".cache") / "build.json"
 
-def main():
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Génère data/ depuis l'open data AN.")
+    ap.add_argument(
+        "--sources", nargs="+", choices=list(SOURCES), default=DEFAULT_SOURCES,
+        metavar="SOURCE",
+        help=f"sources à agréger, préparées en parallèle ({', '.join(SOURCES)})",
+    )
+    ap.add_argument(
+        "--workers", type=int, default=1,
+        help="processus pour le parsing XML (1 = séquentiel, 0 = un par CPU)",
+    )
+    ap.add_argument(
+        "--full", action="store_true",
+        help="ignore le manifeste de build : tout reparser et réécrire",
+    )
+    ap.add_argument(
+        "--offline", action="store_true",
+        help="utilise les archives en cache sans interroger data.assemblee-nationale.fr",
+    )
+    ap.add_argument(
+        "--format", choices=MONTH_FORMATS, default="legacy",
+        help="format des fichiers data/scrutins/ (columnar: votes en tableaux d'indices)",
+    )
+    ap.add_argument(
+        "--minify", action="store_true",
+        help="JSON sans indentation",
+    )
+    ap.add_argument(
+        "--assets", action="store_true",
+        help="copies au nom haché + .gz/.br dans data/assets/ (cache long côté hébergeur)",
+    )
+    ap.add_argument(
+        "--sqlite", type=Path, metavar="PATH",
+        help="écrit aussi une base SQLite (ex: data/votes.sqlite), mise à jour en incrémental",
+    )
+    ap.add_argument(
+        "--parquet", type=Path, metavar="DIR",
+        help="écrit aussi les votes en Parquet partitionné par mois (nécessite pyarrow)",
+    )
+    ap.add_argument(
+        "--stream", action="store_true",
+        help="build en flux, un mois à la fois (mémoire bornée par le plus gros mois)",
+    )
+    ap.add_argument(
+        "--report", type=Path, metavar="PATH",
+        help="écrit le rapport du build (durée, CPU, mémoire, volumes par étape) en JSON",
+    )
+    ap.add_argument(
+        "--profile", action="append", default=[], metavar="STAGE",
+        help="exécute l'étape sous cProfile -> .cache/profile/<étape>.pstats "
+             "(ex: themes, prepare/an-17/parse, export/months ; répétable)",
+    )
+    ap.add_argument(
+        "--trace-memory", action="store_true",
+        help="pic des allocations Python par étape (tracemalloc, build nettement plus lent)",
+    )
+    ap.add_argument(
+        "--watch", action="store_true",
+        help="reste actif : interroge les archives AN toutes les --interval secondes, "
+             "reconstruit les mois changés à part et publie par bascule du lien --publish",
+    )
+    ap.add_argument(
+        "--interval", type=float, default=900, metavar="SECONDS",
+        help="délai entre deux débuts de build en mode --watch (défaut : 900)",
+    )
+    ap.add_argument(
+        "--publish", type=Path, metavar="PATH",
+        help="lien symbolique publié en mode --watch (défaut : site/data)",
+    )
+    ap.add_argument(
+        "--status", type=Path, metavar="PATH",
+        help="état et durées du dernier build en mode --watch "
+             "(défaut : status.json à côté du lien)",
+    )
+    ap.add_argument(
+        "--cycles", type=int, default=0, metavar="N",
+        help="en mode --watch, s'arrête après N builds (0 = sans fin)",
+    )
+    args = ap.parse_args(argv)
+    if args.stream and (args.sqlite or args.parquet):
+        ap.error("--stream ne s'utilise pas avec --sqlite / --parquet (tous les votes en mémoire)")
+    if not args.watch and (args.publish or args.status or args.cycles):
+        ap.error("--publish / --status / --cycles s'utilisent avec --watch")
+    if args.watch:
+        args.publish = args.publish or ROOT / "site" / "data"
+        args.status = args.status or args.publish.with_name("status.json")
+    return args
+
+
+def _load_build_state() -> dict:
+    try:
+        return json.loads(BUILD_STATE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.watch:
+        watch(args, argv)
+        return
     generated_at = datetime.now(timezone.utc).isoformat()
 
+    report = instrument.RunReport(profile=args.profile, trace_memory=args.trace_memory)
+    with instrument.activate(report):
+        _build(args, generated_at)
+
+    report.print_summary()
+    if args.report:
+        report.write(args.report, generated_at=generated_at,
+                     argv=sys.argv[1:] if argv is None else list(argv))
+        print(f"OK: rapport écrit dans {args.report}.")
+
+
+def _stages(d: dict) -> list[dict]:
+    """Durées par étape d'un rapport, pour le fichier d'état."""
+    keys = ("name", "wall_s", "cpu_s", "items", "bytes_written")
+    return [{k: st[k] for k in keys} for st in d["stages"]]
+
+
+def watch(args, argv=None):
+    """
+    Mode --watch : un build par cycle dans un répertoire à part (publish.py),
+    publié seulement si des mois ont changé ; un échec laisse la version
+    publiée en place. Le premier build, et celui qui suit un échec,
+    réécrivent tous les mois : les caches de sources ont pu avancer sans que
+    la version publiée suive.
+    """
+    publisher = Publisher(args.publish)
+    status = {
+        "pid": os.getpid(),
+        "publish": str(args.publish),
+        "interval_s": args.interval,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "builds": 0,
+        "failures": 0,
+        "last_build": None,
+        "last_published": None,
+    }
+    rewrite = True
+    try:
+        while True:
+            started = datetime.now(timezone.utc)
+            generated_at = started.isoformat()
+            write_status(args.status, {**status, "state": "building",
+                                       "building_since": generated_at})
+            build = {"started_at": generated_at}
+            report = instrument.RunReport(profile=args.profile, trace_memory=args.trace_memory)
+            try:
+                staging = publisher.prepare(DATA_DIR, inputs=[DATA_DIR / "themes.json"])
+                with instrument.activate(report):
+                    summary = _build(args, generated_at, staging,
+                                     rewrite=rewrite, skip_unchanged=not rewrite)
+                if summary is None:
+                    publisher.discard()
+                    build["result"] = "unchanged"
+                else:
+                    release = publisher.publish(started.strftime("%Y%m%dT%H%M%SZ"))
+                    build.update(result="published", release=release.name, **summary)
+                    status["last_published"] = {"release": release.name,
+                                                "generated_at": generated_at}
+                    rewrite = False
+                    print(f"OK: {args.publish} -> {release.name}.")
+            except Exception as e:
+                publisher.discard()
+                traceback.print_exc()
+                build.update(result="failed", error=f"{type(e).__name__}: {e}")
+                status["failures"] += 1
+                rewrite = True
+                print(f"❌ build échoué, {args.publish} inchangé : {e}")
+
+            d = report.to_dict()
+            build.update(finished_at=datetime.now(timezone.utc).isoformat(),
+                         wall_s=d["wall_s"], cpu_s=d["cpu_s"],
+                         rss_max_bytes=d["rss_max_bytes"], stages=_stages(d))
+            status["builds"] += 1
+            status["last_build"] = build
+            report.print_summary()
+            if args.report:
+                report.write(args.report, generated_at=generated_at,
+                             argv=sys.argv[1:] if argv is None else list(argv))
+
+            if args.cycles and status["builds"] >= args.cycles:
+                write_status(args.status, {**status, "state": "stopped"})
+                return
+            next_check = started + timedelta(seconds=args.interval)
+            write_status(args.status, {**status, "state": "idle",
+                                       "next_check_at": next_check.isoformat()})
+            time.sleep(max(0.0, (next_check - datetime.now(timezone.utc)).total_seconds()))
+    except KeyboardInterrupt:
+        publisher.discard()
+        write_status(args.status, {**status, "state": "stopped"})
+        print("OK: mode --watch arrêté.")
+
+
+def _build(args, generated_at: str, data_dir: Path = DATA_DIR,
+           rewrite: bool = False, skip_unchanged: bool = False) -> dict | None:
+    """
+    Build dans `data_dir`. rewrite: réécrit tous les mois ; skip_unchanged:
+    ne rien écrire (-> None) si aucun mois n'a changé depuis le dernier
+    build. Retourne des volumes du build pour le fichier d'état.
+    """
     cfg = load_themes(DATA_DIR / "themes.json")
+    themes_key = hashlib.sha1(json.dumps(cfg, sort_keys=True).encode("utf-8")).hexdigest()
+
+    # build incrémental : seuls les mois touchés sont réécrits
+    changed_months = None if args.full else set()
+    fetch_opts = {
+        "workers": args.workers,
+        "changed_months": changed_months,
+        "incremental": not args.full,
+        "refresh": not args.offline,
+    }
+    # les thèmes sont recopiés dans chaque scrutin, et le format d'export
+    # s'applique à tous les mois
+    state = _load_build_state()
+    export_key = {"format": args.format, "minify": args.minify, "assets": args.assets}
+    rewrite_all = (rewrite or state.get("themes") != themes_key
+                   or state.get("export") != export_key)
 
-    raw_an = fetch_an_scrutins()
-    scrutins = normalize_an(raw_an)
+    acteurs, organes, months = prepare_sources(args.sources, **fetch_opts)
+    if rewrite_all:
+        changed_months = None
+    elif skip_unchanged and changed_months is not None and not changed_months:
+        print("OK: aucun mois modifié depuis le dernier build.")
+        return None
 
-    scrutins = assign_themes(scrutins, cfg)
-    
-    # ✅ CLEAN BUILD: supprimer les anciens fichiers par année
-    scrutins_dir = DATA_DIR / "scrutins"
-    if scrutins_dir.exists():
-        shutil.rmtree(scrutins_dir)
-    scrutins_dir.mkdir(parents=True, exist_ok=True)
+    if args.stream:
+        with instrument.stage("build"):
+            acc, deputies, groups, written = build_streaming(
+                data_dir, generated_at, months, acteurs, organes, cfg,
+                changed_months=changed_months, month_format=args.format,
+                minify=args.minify, assets=args.assets,
+            )
+        scrutins = acc.scrutins
+    else:
+        scrutins = load_scrutins(acteurs, organes, months)
 
-    # agrégation par député et par groupe
-    deputies = aggregate_deputies(scrutins)
-    groups = aggregate_groups(scrutins, deputies)
+        with instrument.stage("themes") as st:
+            scrutins = assign_themes(scrutins, cfg)
+            st.items = len(scrutins)
 
-    export_all(DATA_DIR, scrutins, generated_at, deputies, groups)
+        # agrégation par député et par groupe : une seule passe sur les votes
+        with instrument.stage("aggregate") as st:
+            acc = accumulate(scrutins)
+            deputies = acc.deputies()
+            groups = acc.groups(deputies)
+            st.items = len(deputies) + len(groups)
 
-    print(f"OK: {len(scrutins)} scrutins AN exportés.")
+        with instrument.stage("export") as st:
+            written = export_all(data_dir, scrutins, generated_at, deputies, groups,
+                       changed_months=changed_months,
+                       acc=acc, month_format=args.format, minify=args.minify,
+                       assets=args.assets)
+            st.items = len(written)
+
+    print(f"OK: {len(scrutins)} scrutins exportés ({', '.join(args.sources)}).")
+    if changed_months is not None:
+        print(f"OK: {len(written)} mois réécrits.")
     print(f"OK: {len(deputies)} fiches députés, {len(groups)} fiches groupes.")
 
+    if args.sqlite:
+        with instrument.stage("sqlite") as st:
+            n = export_sqlite(args.sqlite, scrutins, generated_at, acc,
+                              changed_months=changed_months,
+                              previous_build=state.get("generated_at"))
+            st.items = n
+        print(f"OK: {n} scrutins écrits dans {args.sqlite}.")
+
+    if args.parquet:
+        with instrument.stage("parquet") as st:
+            months = export_parquet(args.parquet, scrutins, generated_at, acc,
+                                    changed_months=changed_months,
+                                    previous_build=state.get("generated_at"))
+            st.items = len(months)
+        print(f"OK: {len(months)} mois Parquet écrits dans {args.parquet}.")
+
+    exported()
+    BUILD_STATE.parent.mkdir(parents=True, exist_ok=True)
+    BUILD_STATE.write_text(
+        json.dumps({"themes": themes_key, "export": export_key,
+                    "generated_at": generated_at}) + "\n", encoding="utf-8")
+    return {"scrutins": len(scrutins), "months_written": len(written),
+            "deputies": len(deputies), "groups": len(groups)}
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
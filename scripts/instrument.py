@@ -0,0 +1,244 @@
+"""
+Mesures par étape du build (téléchargement, parsing, enrichissement,
+thèmes, agrégation, écriture...).
+
+    with instrument.stage("parse") as st:
+        ...
+        st.items = n
+
+Pour chaque étape : temps mur, temps CPU (processus + workers terminés
+pendant l'étape), RSS max du processus à la fin de l'étape, pic des
+allocations Python (tracemalloc, optionnel : ralentit nettement le build),
+nombre d'éléments et octets écrits (ArtifactWriter). Une étape rejouée
+(ex: une fois par mois en mode --stream) cumule ses mesures. Les étapes
+imbriquées sont nommées "parent/enfant".
+
+Sans RunReport actif, stage() ne mesure rien : les modules instrumentés
+fonctionnent aussi hors de generate.py (benchmarks).
+
+profile: étapes à exécuter sous cProfile, sortie dans
+<profile_dir>/<étape>.pstats (python -m pstats, snakeviz...). Un seul
+profileur à la fois : une étape profilée à l'intérieur d'une autre étape
+profilée est ignorée.
+"""
+import cProfile
+import json
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+# ru_maxrss : Ko sous Linux, octets sous macOS
+_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+class Stage:
+
+    __slots__ = ("name", "calls", "wall", "cpu", "rss_max", "py_peak", "items", "bytes")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.rss_max = 0
+        self.py_peak = None
+        self.items = None
+        self.bytes = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "wall_s": round(self.wall, 4),
+            "cpu_s": round(self.cpu, 4),
+            "rss_max_bytes": self.rss_max,
+            "py_peak_bytes": self.py_peak,
+            "items": self.items,
+            "bytes_written": self.bytes,
+        }
+
+
+def _cpu() -> float:
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+def _rss_max() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_UNIT
+
+
+class RunReport:
+
+    def __init__(self, profile=(), profile_dir: Path = Path(".cache") / "profile",
+                 trace_memory: bool = False, prefix: str = ""):
+        self.profile = set(profile)
+        # nom de l'étape englobante (rapport d'un worker, voir isolated())
+        self.prefix = prefix
+        self.profile_dir = profile_dir
+        self.trace_memory = trace_memory
+        self.stages: dict[str, Stage] = {}
+        self._stack: list[list] = []  # [Stage, pic tracemalloc des enfants]
+        self._profiling = False
+        self._t0 = time.perf_counter()
+        self._cpu0 = _cpu()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name: str):
+        name = f"{self._stack[-1][0].name if self._stack else self.prefix}/{name}".lstrip("/")
+        st = self.stages.get(name)
+        if st is None:
+            st = self.stages[name] = Stage(name)
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            if self._stack:
+                frame = self._stack[-1]
+                frame[1] = max(frame[1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        self._stack.append([st, 0])
+
+        profiler = None
+        if name in self.profile and not self._profiling:
+            profiler = cProfile.Profile()
+            self._profiling = True
+            profiler.enable()
+        t0 = time.perf_counter()
+        cpu0 = _cpu()
+        try:
+            yield st
+        finally:
+            st.wall += time.perf_counter() - t0
+            st.cpu += _cpu() - cpu0
+            st.calls += 1
+            if profiler is not None:
+                profiler.disable()
+                self._profiling = False
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(self.profile_dir / f"{name.replace('/', '.')}.pstats")
+            st.rss_max = max(st.rss_max, _rss_max())
+            _, children_peak = self._stack.pop()
+            if tracing:
+                peak = max(children_peak, tracemalloc.get_traced_memory()[1])
+                st.py_peak = max(st.py_peak or 0, peak)
+                if self._stack:
+                    frame = self._stack[-1]
+                    frame[1] = max(frame[1], peak)
+
+    def add_bytes(self, n: int):
+        for st, _ in self._stack:
+            st.bytes += n
+
+    def merge(self, stages: list[dict]):
+        """Etapes mesurées ailleurs (rapport d'un worker, noms complets)."""
+        for d in stages:
+            name = d["name"]
+            st = self.stages.get(name)
+            if st is None:
+                st = self.stages[name] = Stage(name)
+            st.calls += d["calls"]
+            st.wall += d["wall_s"]
+            st.cpu += d["cpu_s"]
+            st.rss_max = max(st.rss_max, d["rss_max_bytes"])
+            if d["py_peak_bytes"] is not None:
+                st.py_peak = max(st.py_peak or 0, d["py_peak_bytes"])
+                if self._stack:
+                    frame = self._stack[-1]
+                    frame[1] = max(frame[1], d["py_peak_bytes"])
+            if d["items"] is not None:
+                st.items = (st.items or 0) + d["items"]
+            st.bytes += d["bytes_written"]
+
+    def to_dict(self) -> dict:
+        return {
+            "wall_s": round(time.perf_counter() - self._t0, 4),
+            "cpu_s": round(_cpu() - self._cpu0, 4),
+            "rss_max_bytes": _rss_max(),
+            "py_peak_bytes": max((st.py_peak or 0 for st in self.stages.values()), default=0)
+            if self.trace_memory else None,
+            "stages": [st.to_dict() for st in self.stages.values()],
+        }
+
+    def write(self, path: Path, **extra):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({**extra, **self.to_dict()}, indent=2) + "\n",
+                        encoding="utf-8")
+
+    def print_summary(self):
+        d = self.to_dict()
+        print("⏱️  Etapes :")
+        print(f"   {'étape':<28} {'mur':>8} {'cpu':>8} {'rss max':>9} {'py pic':>9}"
+              f" {'éléments':>9} {'écrit':>9}")
+        for st in self.stages.values():
+            depth = st.name.count("/")
+            label = "  " * depth + st.name.rsplit("/", 1)[-1]
+            if st.calls > 1:
+                label += f" ×{st.calls}"
+            print(f"   {label:<28} {st.wall:7.2f}s {st.cpu:7.2f}s {_mb(st.rss_max):>9}"
+                  f" {_mb(st.py_peak):>9} {'' if st.items is None else st.items:>9}"
+                  f" {_mb(st.bytes) if st.bytes else '':>9}")
+        print(f"   {'total':<28} {d['wall_s']:7.2f}s {d['cpu_s']:7.2f}s"
+              f" {_mb(d['rss_max_bytes']):>9}")
+
+
+def _mb(n: int | None) -> str:
+    return "" if n is None else f"{n / 1e6:.1f} Mo"
+
+
+# rapport actif (generate.py) ; None : stage() ne mesure rien
+_ACTIVE: RunReport | None = None
+
+
+class _NullStage:
+    """Remplaçant sans effet quand aucun rapport n'est actif."""
+
+    items = None
+    bytes = 0
+
+
+@contextmanager
+def stage(name: str):
+    if _ACTIVE is None:
+        yield _NullStage()
+        return
+    with _ACTIVE.stage(name) as st:
+        yield st
+
+
+def add_bytes(n: int):
+    if _ACTIVE is not None:
+        _ACTIVE.add_bytes(n)
+
+
+def merge(stages: list[dict]):
+    if _ACTIVE is not None:
+        _ACTIVE.merge(stages)
+
+
+@contextmanager
+def activate(report: RunReport | None):
+    global _ACTIVE
+    previous, _ACTIVE = _ACTIVE, report
+    try:
+        yield report
+    finally:
+        _ACTIVE = previous
+
+
+@contextmanager
+def isolated():
+    """
+    Rapport vierge, mêmes options que le rapport actif (ou None) : pour une
+    tâche exécutée dans un worker, dont les étapes sont renvoyées avec son
+    résultat puis fusionnées (RunReport.merge).
+    """
+    if _ACTIVE is None:
+        yield None
+        return
+    prefix = _ACTIVE._stack[-1][0].name if _ACTIVE._stack else ""
+    report = RunReport(_ACTIVE.profile, _ACTIVE.profile_dir, _ACTIVE.trace_memory, prefix)
+    with activate(report):
+        yield report
@@ -0,0 +1,140 @@
+"""
+Build en flux : mémoire bornée par le plus gros mois, pas par la législature.
+
+    parse -> enrichit -> normalise -> thèmes -> accumule -> écrit le mois
+
+Les scrutins sont relus mois par mois dans le cache parsé de chaque source
+(sources.iter_months), du plus récent au plus ancien. Pour chaque mois, les
+votes compacts sont ajoutés à la VoteTable (codes et noms résolus), chaque
+scrutin, déjà normalisé par sa source, est classé par thèmes, le
+VoteAccumulator met à jour ses compteurs et le fichier du mois est écrit
+dès que le mois est complet. Les lignes de la table sont ensuite libérées :
+il ne reste en mémoire que les compteurs, les historiques compacts (un int
+par vote de député) et l'index léger des scrutins.
+
+L'ordre d'ajout est celui du build en mémoire (scrutins du plus récent au
+plus ancien) : les fichiers produits sont identiques.
+
+- Les mois colonnaires pointent dans people.json, connu seulement en fin de
+  passe : ils sont écrits dans une seconde passe sur le cache, toujours
+  mois par mois, limitée aux mois à réécrire.
+- L'accumulateur suit le chemin Python (compteurs au fil de l'eau) : le
+  chemin NumPy compte toutes les lignes de la table en une fois.
+"""
+from pathlib import Path
+
+import columnar
+import instrument
+from aggregate import VoteAccumulator
+from artifacts import ArtifactWriter
+from export import (MONTH_FORMATS, index_item, months_reusable, people_document,
+                    remove_stale_months, write_affiliations, write_agreement,
+                    write_cube, write_index, write_loyalty, write_month, write_people,
+                    write_profiles)
+from sources import iter_months
+from themes import ThemeMatcher, assign_themes
+from votes import VoteTable
+
+
+def stream_scrutins(months: dict[str, list[str]], table: VoteTable, cfg: dict,
+                    matcher: ThemeMatcher):
+    """(mois, scrutins prêts à exporter), un mois à la fois."""
+    # pas de `yield` dans une étape mesurée : l'appelant mesure les siennes
+    months_iter = iter_months(months)
+    while True:
+        with instrument.stage("load") as st:
+            month, items = next(months_iter, (None, None))
+            st.items = (st.items or 0) + len(items or ())
+        if month is None:
+            return
+        with instrument.stage("enrich"):
+            for s in items:
+                s["votes"] = table.append(s["votes"])
+        with instrument.stage("themes"):
+            items = assign_themes(items, cfg, matcher)
+        yield month, items
+
+
+def _release(table: VoteTable, items: list[dict]):
+    """Mois écrit : ses lignes de votes ne servent plus."""
+    table.clear_rows()
+    for s in items:
+        s["votes"] = None
+
+
+def build_streaming(data_dir: Path, generated_at: str, months: dict[str, list[str]],
+                    acteurs: dict, organes: dict, cfg: dict,
+                    changed_months: set[str] | None = None,
+                    month_format: str = "legacy", minify: bool = False,
+                    assets: bool = False):
+    """
+    Equivalent en flux de accumulate() + export_all() (mêmes fichiers).
+    months: mois du cache parsé de chaque source (sources.prepare_sources).
+    Retourne (accumulateur, députés, groupes, mois réécrits).
+    """
+    if month_format not in MONTH_FORMATS:
+        raise ValueError(f"format de mois inconnu: {month_format}")
+    out = ArtifactWriter(data_dir, assets=assets)
+    table = VoteTable(acteurs, organes)
+    acc = VoteAccumulator(vectorized=False)
+    matcher = ThemeMatcher.from_config(cfg)
+
+    def needed(month: str) -> bool:
+        return (changed_months is None or month in changed_months
+                or not (data_dir / "scrutins" / f"{month}.json").exists())
+
+    # en historique, le dictionnaire est connu d'avance (aucun)
+    deferred = month_format == columnar.FORMAT
+    if not deferred and not months_reusable(data_dir, month_format, None):
+        changed_months = None
+
+    index_items = []
+    seen_months = set()
+    written = []
+    for month, items in stream_scrutins(months, table, cfg, matcher):
+        with instrument.stage("aggregate"):
+            for s in items:
+                acc.add(s)
+                index_items.append(index_item(s))
+            seen_months.add(month)
+            acc.by_month.pop(month, None)
+        if not deferred and needed(month):
+            with instrument.stage("months"):
+                if write_month(out, data_dir, month, items, month_format, minify=minify):
+                    written.append(month)
+        _release(table, items)
+
+    with instrument.stage("aggregate"):
+        people_doc, person_index, group_index = people_document(acc, generated_at, month_format)
+    if deferred:
+        if not months_reusable(data_dir, month_format, people_doc["dictionary"]):
+            changed_months = None
+        todo = {key: [m for m in ms if needed(m)] for key, ms in months.items()}
+        for month, items in stream_scrutins(todo, table, cfg, matcher):
+            with instrument.stage("months"):
+                if write_month(out, data_dir, month, items, month_format,
+                               people_doc, person_index, group_index, minify):
+                    written.append(month)
+            _release(table, items)
+    with instrument.stage("months"):
+        write_people(out, data_dir, people_doc, minify)
+        remove_stale_months(out, data_dir, seen_months)
+
+    with instrument.stage("index") as st:
+        write_index(out, data_dir, index_items, generated_at, minify)
+        st.items = len(index_items)
+    with instrument.stage("aggregate"):
+        deputies = acc.deputies()
+        groups = acc.groups(deputies)
+    with instrument.stage("profiles"):
+        write_profiles(out, data_dir, acc, generated_at, deputies, groups, minify)
+        write_affiliations(out, data_dir, acc, generated_at)
+    with instrument.stage("agreement"):
+        write_agreement(out, data_dir, acc, generated_at, groups, minify)
+    with instrument.stage("loyalty"):
+        write_loyalty(out, data_dir, acc, generated_at, minify)
+    with instrument.stage("cube"):
+        write_cube(out, data_dir, acc, generated_at, groups)
+
+    out.close()
+    return acc, deputies, groups, sorted(written)
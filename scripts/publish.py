@@ -0,0 +1,106 @@
+"""
+Publication atomique de data/ (mode --watch de generate.py).
+
+    <lien>                             lien symbolique -> version publiée
+    <lien>.releases/<horodatage>/      versions, les KEEP_RELEASES dernières
+    <lien>.releases/.staging/          build en cours
+
+Un build part d'une copie par liens durs de la version publiée (de data/
+pour le premier) : le build incrémental ne réécrit que les fichiers
+changés, et ArtifactWriter remplace un fichier par renommage, sans toucher
+la version publiée qui partage tous les autres. La copie est ensuite
+renommée en version et le lien basculé par os.replace d'un lien temporaire :
+un lecteur qui passe par <lien>/ voit l'ancienne ou la nouvelle version
+entière, jamais un build en cours, et n'attend jamais le build.
+
+Les versions précédentes sont gardées un temps pour les lecteurs qui les
+ont déjà résolues (serve.py en recharge une nouvelle dans la seconde).
+"""
+import json
+import os
+import shutil
+from pathlib import Path
+
+from artifacts import write_atomic
+
+KEEP_RELEASES = 3
+STAGING_NAME = ".staging"
+
+
+def _link_or_copy(src, dst):
+    """Lien dur, copie si le système de fichiers n'en a pas."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+class Publisher:
+
+    def __init__(self, link: Path, keep: int = KEEP_RELEASES):
+        if link.exists() and not link.is_symlink():
+            raise ValueError(f"{link} existe et n'est pas un lien symbolique")
+        self.link = link
+        self.keep = keep
+        self.releases = link.with_name(f"{link.name}.releases")
+        self.staging = self.releases / STAGING_NAME
+
+    def current(self) -> Path | None:
+        """Version publiée, None avant la première."""
+        if not self.link.is_symlink():
+            return None
+        target = self.link.resolve()
+        return target if target.is_dir() else None
+
+    def prepare(self, seed: Path, inputs: list[Path] = ()) -> Path:
+        """
+        Répertoire de build vierge : copie de la version publiée, ou de
+        `seed` avant la première. `inputs` (fichiers de config, ex:
+        themes.json) sont recopiés à la racine depuis leur emplacement.
+        """
+        self.discard()
+        base = self.current() or seed
+        self.releases.mkdir(parents=True, exist_ok=True)
+        if base.is_dir():
+            shutil.copytree(base, self.staging, copy_function=_link_or_copy,
+                            ignore=shutil.ignore_patterns(".*.tmp"))
+        else:
+            self.staging.mkdir()
+        for path in inputs:
+            write_atomic(self.staging / path.name, path.read_bytes())
+        return self.staging
+
+    def publish(self, name: str) -> Path:
+        """Renomme le build en version `name` et y fait pointer le lien."""
+        target = self.releases / name
+        i = 1
+        while target.exists():
+            target = self.releases / f"{name}-{i}"
+            i += 1
+        os.rename(self.staging, target)
+
+        self.link.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.link.with_name(f".{self.link.name}.tmp")
+        tmp.unlink(missing_ok=True)
+        os.symlink(os.path.relpath(target, self.link.parent), tmp)
+        os.replace(tmp, self.link)
+        self.prune()
+        return target
+
+    def discard(self):
+        if self.staging.exists():
+            shutil.rmtree(self.staging)
+
+    def prune(self):
+        """Supprime les versions au-delà des `keep` dernières."""
+        current = self.current()
+        releases = sorted(p for p in self.releases.iterdir()
+                          if p.is_dir() and p.name != STAGING_NAME)
+        for path in releases[:-self.keep]:
+            if path != current:
+                shutil.rmtree(path)
+
+
+def write_status(path: Path, status: dict):
+    """Fichier d'état du mode --watch, remplacé en un renommage."""
+    write_atomic(path, (json.dumps(status, indent=2, ensure_ascii=False) + "\n").encode("utf-8"))
@@ -0,0 +1,644 @@
+"""
+Serveur local de requêtes sur data/ (tableaux de bord internes).
+
+    python scripts/serve.py [--data data] [--host 127.0.0.1] [--port 8080]
+
+Au lieu de relire et filtrer les data/*.json de leur côté, les tableaux de
+bord interrogent ce serveur (GET, réponses JSON) :
+
+    /health                          génération, volumes, état du cache
+    /scrutins?theme=&result=&from=&to=&q=&page=&per_page=
+    /scrutins/<id>                   détail et votes (fichier du mois)
+    /deputies?group=&q=&page=&per_page=
+    /deputies/<id>                   fiche + périodes d'appartenance
+    /deputies/<id>/votes?position=&loyalty=&from=&to=&page=&per_page=
+    /groups                          fiches groupes (sans les membres)
+    /groups/<id>                     fiche complète
+    /groups/<id>/timeline?theme=&window=
+                                     par mois : comptages, cohésion,
+                                     participation (cube.py) et effectif
+                                     (affiliations.py)
+
+Les listes sont paginées : {"total", "page", "per_page", "pages", "items"},
+page à partir de 1, per_page au plus MAX_PER_PAGE.
+
+Chargement : les fichiers légers (index, fiches, périodes, cube) sont lus
+une fois et indexés (rangs par thème et par résultat, dates triées pour la
+bisection). Les fichiers de mois et les historiques de députés sont lus à
+la demande, retrouvés par l'index id -> mois, et gardés dans de petits LRU :
+un mois lu une fois est gardé scrutin par scrutin, déjà sérialisé (JSON
+compact, renvoyé tel quel), plus léger que ses dicts de votes.
+data/manifest.json est surveillé : un nouveau build recharge les données
+et vide le cache. Si --data est un lien symbolique (generate.py --watch),
+un chargement lit la version pointée au moment du chargement, jusqu'au
+suivant : jamais un mélange de deux builds.
+
+Chaque réponse est sérialisée une fois puis gardée dans un LRU borné en
+octets (clé : chemin + paramètres triés), avec son ETag (sha1 du corps) et
+sa variante gzip, calculée à la première demande. If-None-Match -> 304.
+Un calcul de réponse (cache manquant) passe par un unique thread : les
+lectures de fichiers ne bloquent pas la boucle, et les structures du jeu
+de données n'ont qu'un écrivain.
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import re
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import columnar
+import cube
+from affiliations import AffiliationIndex
+from catalog import tokenize
+
+ROOT = Path(__file__).resolve().parents[1]
+
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 500
+
+CACHE_BYTES = 64 * 1024 * 1024
+MONTH_CACHE_BYTES = 32 * 1024 * 1024
+DEPUTY_CACHE = 64
+# délai minimal entre deux vérifications du manifeste (secondes)
+RELOAD_INTERVAL = 1.0
+# en dessous, la compression ne vaut pas l'aller-retour
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+
+MAX_HEADER_BYTES = 64 * 1024
+
+
+class HttpError(Exception):
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class LRUCache:
+    """LRU borné en nombre d'entrées et/ou en octets (taille donnée à put)."""
+
+    def __init__(self, max_entries: int = 0, max_bytes: int = 0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._items: OrderedDict = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key):
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return item[0]
+
+    def put(self, key, value, size: int = 0):
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        self._items[key] = (value, size)
+        self.bytes += size
+        while self._items and (
+                (self.max_entries and len(self._items) > self.max_entries)
+                or (self.max_bytes and self.bytes > self.max_bytes)):
+            _, (_, n) = self._items.popitem(last=False)
+            self.bytes -= n
+
+    def resize(self, key, size: int):
+        """Nouvelle taille d'une entrée présente (variante ajoutée)."""
+        item = self._items.get(key)
+        if item is not None:
+            self.put(key, item[0], size)
+
+    def clear(self):
+        self._items.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._items),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total * 100, 1) if total else None,
+        }
+
+
+def _read_json(path: Path, default=None):
+    try:
+        return json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return default
+
+
+def _dumps(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _stat(path: Path):
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+# ---------------------------------------------------------------------------
+# Données
+# ---------------------------------------------------------------------------
+
+class Dataset:
+    """data/ chargé une fois, fichiers de mois et historiques à la demande."""
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = data_dir
+        self.load()
+
+    def load(self):
+        # version résolue une fois (lien symbolique basculé par --watch)
+        self.root = data_dir = self.data_dir.resolve()
+        self.version = _stat(data_dir / "manifest.json")
+        index = _read_json(data_dir / "index.json")
+        if index is None:
+            raise FileNotFoundError(f"{data_dir / 'index.json'} illisible : lancer generate.py")
+        self.generated_at = index.get("generated_at")
+
+        # scrutins du plus récent au plus ancien ; le rang sert de clé
+        scrutins = index.get("scrutins", [])
+        scrutins.sort(key=lambda s: (s["date"], s["id"]), reverse=True)
+        self.scrutins = scrutins
+        self.rank_of = {s["id"]: r for r, s in enumerate(scrutins)}
+        self.dates_asc = [s["date"] for s in reversed(scrutins)]
+        self.by_theme: dict[str, list[int]] = {}
+        self.by_result: dict[str, list[int]] = {}
+        for r, s in enumerate(scrutins):
+            for t in s.get("themes") or []:
+                self.by_theme.setdefault(t, []).append(r)
+            self.by_result.setdefault(s.get("result_status") or "", []).append(r)
+        self._tokens: list[set[str]] | None = None
+
+        deputies = _read_json(data_dir / "deputies.json", {}).get("deputies", [])
+        self.deputies = deputies
+        self.deputy_by_id = {d["person_id"]: d for d in deputies}
+        groups = _read_json(data_dir / "groups.json", {}).get("groups", [])
+        self.groups = groups
+        self.group_by_id = {g["group_id"]: g for g in groups}
+
+        self.people_doc = _read_json(data_dir / "people.json", {})
+        periods = _read_json(data_dir / "affiliations.json", {}).get("people", {})
+        self.affiliations = AffiliationIndex(periods)
+        self.cube = _read_json(data_dir / "cube" / "groups.json")
+
+        self._months = LRUCache(max_bytes=MONTH_CACHE_BYTES)
+        self._deputy_votes = LRUCache(DEPUTY_CACHE)
+
+    def changed(self) -> bool:
+        return _stat(self.data_dir / "manifest.json") != self.version
+
+    # -- lectures à la demande ---------------------------------------------
+
+    def month(self, key: str) -> dict[str, bytes]:
+        """id -> scrutin du mois sérialisé (format historique, votes en dicts)."""
+        by_id = self._months.get(key)
+        if by_id is None:
+            raw = _read_json(self.root / "scrutins" / f"{key}.json")
+            if raw is None:
+                raise HttpError(404, f"mois {key} introuvable")
+            by_id = {
+                s["id"]: _dumps(s)
+                for s in columnar.decode_month(raw, self.people_doc)["scrutins"]
+            }
+            self._months.put(key, by_id, sum(map(len, by_id.values())))
+        return by_id
+
+    def deputy_votes(self, pid: str) -> dict:
+        doc = self._deputy_votes.get(pid)
+        if doc is None:
+            doc = _read_json(self.root / "deputies" / f"{pid}.json")
+            if doc is None:
+                raise HttpError(404, f"historique de {pid} introuvable")
+            self._deputy_votes.put(pid, doc)
+        return doc
+
+    def tokens(self) -> list[set[str]]:
+        """Mots des titres par rang (calculés à la première recherche)."""
+        if self._tokens is None:
+            self._tokens = [set(tokenize(s.get("title"))) for s in self.scrutins]
+        return self._tokens
+
+    def date_ranks(self, first: str | None, last: str | None) -> range:
+        """Rangs des scrutins datés de first à last inclus (YYYY-MM-DD ou préfixe)."""
+        n = len(self.dates_asc)
+        lo = bisect_left(self.dates_asc, first) if first else 0
+        # "2025-03" couvre tout le mois : borne haute étendue
+        hi = bisect_right(self.dates_asc, last + "\uffff") if last else n
+        return range(n - hi, n - lo)
+
+
+# ---------------------------------------------------------------------------
+# Requêtes
+# ---------------------------------------------------------------------------
+
+def _int_param(params: dict, name: str, default: int, lo: int, hi: int | None = None) -> int:
+    raw = params.get(name)
+    if raw is None or raw == "":
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise HttpError(400, f"{name} doit être un entier") from None
+    if value < lo or (hi is not None and value > hi):
+        raise HttpError(400, f"{name} hors bornes ({lo}..{hi if hi is not None else ''})")
+    return value
+
+
+def _paginate(params: dict, rows: list) -> dict:
+    per_page = _int_param(params, "per_page", DEFAULT_PER_PAGE, 1, MAX_PER_PAGE)
+    page = _int_param(params, "page", 1, 1)
+    total = len(rows)
+    start = (page - 1) * per_page
+    return {
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "pages": (total + per_page - 1) // per_page,
+        "items": list(rows[start:start + per_page]),
+    }
+
+
+def _intersect(ranks: range, lists: list[list[int]]) -> list[int]:
+    """Rangs de `ranks` présents dans toutes les listes triées `lists`."""
+    if not lists:
+        return list(ranks)
+    lists = sorted(lists, key=len)
+    first = lists[0]
+    result = first[bisect_left(first, ranks.start):bisect_left(first, ranks.stop)]
+    for other in lists[1:]:
+        keep = set(other)
+        result = [r for r in result if r in keep]
+    return result
+
+
+def q_scrutins(ds: Dataset, params: dict) -> dict:
+    lists = []
+    if params.get("theme"):
+        lists.append(ds.by_theme.get(params["theme"], []))
+    if "result" in params:
+        lists.append(ds.by_result.get(params["result"], []))
+    ranks = _intersect(ds.date_ranks(params.get("from"), params.get("to")), lists)
+    words = tokenize(params.get("q", ""))
+    if words:
+        tokens = ds.tokens()
+        # dernier mot en préfixe, comme la recherche du catalogue
+        *exact, last = words
+        ranks = [
+            r for r in ranks
+            if all(w in tokens[r] for w in exact) and any(t.startswith(last) for t in tokens[r])
+        ]
+    page = _paginate(params, ranks)
+    page["items"] = [ds.scrutins[r] for r in page["items"]]
+    return page
+
+
+def q_scrutin(ds: Dataset, params: dict, sid: str) -> bytes:
+    r = ds.rank_of.get(sid)
+    if r is None:
+        raise HttpError(404, f"scrutin {sid} introuvable")
+    s = ds.month(ds.scrutins[r]["date"][:7]).get(sid)
+    if s is None:
+        raise HttpError(404, f"scrutin {sid} absent de son fichier de mois")
+    return s
+
+
+def q_deputies(ds: Dataset, params: dict) -> dict:
+    rows = ds.deputies
+    if params.get("group"):
+        rows = [d for d in rows if d.get("group") == params["group"]]
+    q = params.get("q", "").strip().lower()
+    if q:
+        rows = [d for d in rows if q in (d.get("name") or "").lower()]
+    return _paginate(params, rows)
+
+
+def q_deputy(ds: Dataset, params: dict, pid: str) -> dict:
+    dep = ds.deputy_by_id.get(pid)
+    if dep is None:
+        raise HttpError(404, f"député {pid} introuvable")
+    return {**dep, "affiliations": ds.affiliations.periods(pid)}
+
+
+def q_deputy_votes(ds: Dataset, params: dict, pid: str) -> dict:
+    doc = ds.deputy_votes(pid)
+    columns = doc["columns"]
+    rows = doc["votes"]
+    first, last = params.get("from"), params.get("to")
+    if first or last:
+        date = columns.index("date")
+        last = last + "\uffff" if last else None
+        rows = [v for v in rows
+                if (not first or v[date] >= first) and (not last or v[date] <= last)]
+    if params.get("position"):
+        pos = columns.index("position")
+        rows = [v for v in rows if v[pos] == params["position"]]
+    if params.get("loyalty") and "loyalty" in columns:
+        flag = {"loyal": 1, "dissent": 0}.get(params["loyalty"])
+        if flag is None:
+            raise HttpError(400, "loyalty : loyal ou dissent")
+        i = columns.index("loyalty")
+        rows = [v for v in rows if v[i] == flag]
+    page = _paginate(params, rows)
+    page["items"] = [dict(zip(columns, v)) for v in page["items"]]
+    return {"person_id": pid, **page}
+
+
+def q_groups(ds: Dataset, params: dict) -> dict:
+    return {
+        "generated_at": ds.generated_at,
+        "groups": [{k: v for k, v in g.items() if k != "members"} for g in ds.groups],
+    }
+
+
+def q_group(ds: Dataset, params: dict, gid: str) -> dict:
+    g = ds.group_by_id.get(gid)
+    if g is None:
+        raise HttpError(404, f"groupe {gid} introuvable")
+    return g
+
+
+def q_group_timeline(ds: Dataset, params: dict, gid: str) -> dict:
+    if gid not in ds.group_by_id:
+        raise HttpError(404, f"groupe {gid} introuvable")
+    c = ds.cube
+    if c is None or gid not in c["groups"]:
+        raise HttpError(404, f"pas de cube pour {gid} : relancer generate.py")
+    theme = params.get("theme") or cube.ALL_THEMES
+    if theme not in c["themes"]:
+        raise HttpError(404, f"thème {theme} inconnu")
+    window = _int_param(params, "window", 1, 1, len(c["months"]) or 1)
+    g, t = c["groups"].index(gid), c["themes"].index(theme)
+
+    months = []
+    for m, month in enumerate(c["months"]):
+        measures = cube.window(c, g, t, max(0, m - window + 1), m)
+        # effectif au dernier jour possible du mois
+        members = ds.affiliations.members(gid, month + "-31")
+        months.append({
+            "month": month,
+            **dict(zip(c["measures"], measures)),
+            **cube.rates(measures),
+            "members": len(members),
+        })
+    return {"group_id": gid, "theme": theme, "window": window, "months": months}
+
+
+ROUTES = [
+    (re.compile(r"/scrutins"), q_scrutins),
+    (re.compile(r"/scrutins/([^/]+)"), q_scrutin),
+    (re.compile(r"/deputies"), q_deputies),
+    (re.compile(r"/deputies/([^/]+)"), q_deputy),
+    (re.compile(r"/deputies/([^/]+)/votes"), q_deputy_votes),
+    (re.compile(r"/groups"), q_groups),
+    (re.compile(r"/groups/([^/]+)"), q_group),
+    (re.compile(r"/groups/([^/]+)/timeline"), q_group_timeline),
+]
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (t.strip().removeprefix("W/") for t in header.split(","))
+
+
+class Response:
+    """Corps sérialisé, ETag et variante gzip (calculée à la demande)."""
+
+    __slots__ = ("body", "etag", "gz")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        self.gz = None
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + (len(self.gz) if self.gz else 0)
+
+
+class QueryServer:
+
+    def __init__(self, data_dir: Path, cache_bytes: int = CACHE_BYTES):
+        self.data = Dataset(data_dir)
+        self.cache = LRUCache(max_bytes=cache_bytes)
+        # calculs hors boucle, un seul à la fois (voir docstring du module)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="query")
+        self._checked = time.monotonic()
+        self.requests = 0
+        self.started = time.time()
+
+    # -- requêtes ------------------------------------------------------------
+
+    def _compute(self, path: str, params: dict) -> Response:
+        for pattern, handler in ROUTES:
+            m = pattern.fullmatch(path)
+            if m:
+                obj = handler(self.data, params, *(unquote(g) for g in m.groups()))
+                break
+        else:
+            raise HttpError(404, f"route inconnue : {path}")
+        # bytes : réponse déjà sérialisée (scrutin d'un mois en cache)
+        return Response(obj if isinstance(obj, bytes) else _dumps(obj))
+
+    def _health(self) -> dict:
+        ds = self.data
+        return {
+            "generated_at": ds.generated_at,
+            "scrutins": len(ds.scrutins),
+            "deputies": len(ds.deputies),
+            "groups": len(ds.groups),
+            "requests": self.requests,
+            "uptime_s": round(time.time() - self.started, 1),
+            "cache": self.cache.stats(),
+        }
+
+    async def _maybe_reload(self, loop):
+        now = time.monotonic()
+        if now - self._checked < RELOAD_INTERVAL:
+            return
+        self._checked = now
+        if not await loop.run_in_executor(self._executor, self.data.changed):
+            return
+        # nouveau jeu chargé à part : en cas d'échec l'ancien reste servi
+        try:
+            data = await loop.run_in_executor(self._executor, Dataset, self.data.data_dir)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️  rechargement impossible, données précédentes conservées : {e}",
+                  flush=True)
+            # pas de nouvel essai avant le prochain manifeste
+            self.data.version = _stat(self.data.data_dir / "manifest.json")
+            return
+        self.data = data
+        self.cache.clear()
+        print(f"🔄 données rechargées ({data.generated_at})", flush=True)
+
+    async def respond(self, method: str, target: str, headers: dict):
+        """-> (statut, en-têtes, corps)"""
+        self.requests += 1
+        if method not in ("GET", "HEAD"):
+            return self._error(405, f"méthode {method} non supportée")
+        loop = asyncio.get_running_loop()
+        await self._maybe_reload(loop)
+
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        params = dict(parse_qsl(url.query))
+        if path == "/health":
+            body = json.dumps(self._health(), ensure_ascii=False).encode("utf-8")
+            return 200, {"Content-Type": "application/json; charset=utf-8",
+                         "Cache-Control": "no-store"}, body
+
+        key = path + "?" + "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+        resp = self.cache.get(key)
+        cache_status = "HIT"
+        if resp is None:
+            cache_status = "MISS"
+            try:
+                resp = await loop.run_in_executor(self._executor, self._compute, path, params)
+            except HttpError as e:
+                return self._error(e.status, e.message)
+            self.cache.put(key, resp, resp.size)
+
+        gzip_ok = "gzip" in headers.get("accept-encoding", "") and len(resp.body) >= GZIP_MIN_BYTES
+        etag = resp.etag[:-1] + '-gz"' if gzip_ok else resp.etag
+        out = {
+            "Content-Type": "application/json; charset=utf-8",
+            "ETag": etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+            "X-Cache": cache_status,
+        }
+        if _etag_matches(headers.get("if-none-match"), etag):
+            return 304, out, b""
+        if gzip_ok:
+            out["Content-Encoding"] = "gzip"
+            if resp.gz is None:
+                resp.gz = await loop.run_in_executor(
+                    self._executor, lambda: gzip.compress(resp.body, GZIP_LEVEL, mtime=0))
+                self.cache.resize(key, resp.size)
+            body = resp.gz
+        else:
+            body = resp.body
+        return 200, out, body
+
+    @staticmethod
+    def _error(status: int, message: str):
+        body = json.dumps({"error": message}, ensure_ascii=False).encode("utf-8")
+        return status, {"Content-Type": "application/json; charset=utf-8",
+                        "Cache-Control": "no-store"}, body
+
+    # -- connexions ----------------------------------------------------------
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Une connexion : requêtes HTTP/1.1 successives (keep-alive)."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                        ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                if length:
+                    await reader.readexactly(length)
+
+                try:
+                    status, out, body = await self.respond(method, target, headers)
+                except Exception as e:  # noqa: BLE001 - la connexion doit survivre
+                    print(f"❌ {method} {target} : {e!r}", flush=True)
+                    status, out, body = self._error(500, "erreur interne")
+
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version == "HTTP/1.1")
+                out["Content-Length"] = str(len(body))
+                out["Connection"] = "keep-alive" if keep_alive else "close"
+                head = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+                head += [f"{k}: {v}" for k, v in out.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+                if method != "HEAD" and status != 304:
+                    writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int):
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+        addr = server.sockets[0].getsockname()
+        print(f"✅ {len(self.data.scrutins)} scrutins servis sur http://{addr[0]}:{addr[1]}",
+              flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Serveur local de requêtes sur data/.")
+    ap.add_argument("--data", type=Path, default=ROOT / "data",
+                    help="dossier produit par generate.py")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8080)
+    ap.add_argument("--cache-mb", type=int, default=CACHE_BYTES // (1024 * 1024),
+                    help="taille du cache de réponses (Mo)")
+    return ap.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        server = QueryServer(args.data, cache_bytes=args.cache_mb * 1024 * 1024)
+    except FileNotFoundError as e:
+        raise SystemExit(f"❌ {e}") from None
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
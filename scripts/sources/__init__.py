@@ -0,0 +1,211 @@
+"""
+Registre des sources de scrutins (une chambre, une législature).
+
+Une source a sa clé (ex: "an-17"), son espace de cache et son manifeste à
+elle, et fournit :
+- prepare(...) : télécharge ses archives, charge ses référentiels et met à
+  jour son cache de scrutins parsés -> (acteurs, organes, mois) ;
+- iter_months(mois) : ses scrutins normalisés (format commun export, votes
+  compacts), un mois à la fois, du plus récent au plus ancien.
+
+prepare_sources() prépare plusieurs sources en parallèle (un processus par
+source) : ajouter une législature ne reparse pas les autres, dont le cache
+reste valide. iter_months() fusionne ensuite les sources mois par mois.
+Les mois à réécrire sont gardés dans .cache/sources.json jusqu'à
+exported(), appelé par le build une fois l'export terminé.
+"""
+import hashlib
+import json
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import repeat
+from pathlib import Path
+
+import instrument
+from votes import VoteTable
+
+
+class Source(ABC):
+    """
+    Interface d'une source ; les implémentations s'enregistrent avec
+    register(). Une source incomplète ne peut pas être instanciée.
+    """
+
+    key: str = ""
+    chamber: str = ""
+
+    @abstractmethod
+    def prepare(self, workers: int = 1, changed_months: set | None = None,
+                incremental: bool = True,
+                refresh: bool = True) -> tuple[dict, dict, list[str]]:
+        """changed_months: reçoit les mois à réécrire (voir sources.an)."""
+
+    @abstractmethod
+    def iter_months(self, months: list[str]):
+        """(mois, scrutins normalisés) pour chaque mois de `months`."""
+
+
+# clé -> source, dans l'ordre d'enregistrement (du plus ancien au plus récent)
+SOURCES: dict[str, Source] = {}
+
+DEFAULT_SOURCES = ["an-17"]
+
+# sources du dernier build et empreinte des référentiels fusionnés
+_STATE_PATH = Path(".cache") / "sources.json"
+
+
+def register(source: Source) -> Source:
+    SOURCES[source.key] = source
+    return source
+
+
+def _prepare_one(key: str, workers: int, incremental: bool, refresh: bool):
+    changed: set[str] = set()
+    # mesures prises dans le worker, renvoyées avec le résultat
+    with instrument.isolated() as report, instrument.stage(key):
+        acteurs, organes, months = SOURCES[key].prepare(
+            workers, changed_months=changed, incremental=incremental, refresh=refresh,
+        )
+    stages = report.to_dict()["stages"] if report is not None else []
+    return acteurs, organes, months, changed, stages
+
+
+def _load_state() -> dict:
+    try:
+        return json.loads(_STATE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(state: dict):
+    _STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _STATE_PATH.with_name(f".{_STATE_PATH.name}.tmp")
+    tmp.write_text(json.dumps(state) + "\n", encoding="utf-8")
+    os.replace(tmp, _STATE_PATH)
+
+
+def exported():
+    """
+    À appeler une fois l'export terminé : les mois notés par le dernier
+    prepare_sources() sont écrits. Un build interrompu avant ne les perd
+    pas, le suivant les réécrit.
+    """
+    state = _load_state()
+    if state.get("pending"):
+        _save_state({**state, "pending": []})
+
+
+def prepare_sources(keys: list[str], workers: int = 1,
+                    changed_months: set | None = None,
+                    incremental: bool = True,
+                    refresh: bool = True) -> tuple[dict, dict, dict[str, list[str]]]:
+    """
+    Prépare les sources `keys` ; plusieurs sources sont préparées en
+    parallèle, les `workers` processus de parsing étant répartis entre elles.
+    Retourne (acteurs, organes, {clé: mois}) ; les référentiels sont
+    fusionnés, la source la plus récente l'emportant.
+
+    changed_months: reçoit l'union des mois à réécrire de chaque source, ou
+    tous les mois si la liste des sources ou les référentiels fusionnés ont
+    changé (un mois peut mêler deux législatures, les noms sont partagés),
+    plus ceux d'un build précédent qui n'est pas allé jusqu'à exported().
+    """
+    keys = [k for k in SOURCES if k in set(keys)]
+    with instrument.stage("prepare"):
+        workers = workers or os.cpu_count() or 1
+        per_source = max(1, workers // len(keys))
+
+        with ProcessPoolExecutor(max_workers=len(keys)) if len(keys) > 1 else nullcontext() as pool:
+            mapper = pool.map if pool is not None else map
+            results = list(mapper(_prepare_one, keys, repeat(per_source),
+                                  repeat(incremental), repeat(refresh)))
+
+        acteurs: dict[str, dict] = {}
+        organes: dict[str, dict] = {}
+        months: dict[str, list[str]] = {}
+        changed: set[str] = set()
+        for key, (a, o, m, c, stages) in zip(keys, results):
+            acteurs.update(a)
+            organes.update(o)
+            months[key] = m
+            changed.update(c)
+            instrument.merge(stages)
+
+        state = {
+            "sources": keys,
+            "referential": hashlib.sha1(
+                json.dumps([acteurs, organes], sort_keys=True).encode("utf-8")
+            ).hexdigest(),
+        }
+        previous = _load_state()
+        if {k: previous.get(k) for k in state} != state:
+            changed.update(m for ms in months.values() for m in ms)
+        # les manifestes des sources sont déjà à jour : les mois à réécrire
+        # restent notés jusqu'à ce qu'un export les consomme (exported())
+        changed.update(previous.get("pending", []))
+        state["pending"] = sorted(changed)
+        if previous != state:
+            _save_state(state)
+    if changed_months is not None:
+        changed_months.update(changed)
+    return acteurs, organes, months
+
+
+def iter_months(months: dict[str, list[str]]):
+    """
+    (mois, scrutins normalisés triés par (date, id) décroissants), du plus
+    récent au plus ancien, toutes sources confondues. Votes compacts.
+    """
+    by_source = {key: set(ms) for key, ms in months.items()}
+    for month in sorted(set().union(*by_source.values()), reverse=True):
+        items = [
+            s
+            for key, ms in by_source.items() if month in ms
+            for _, recs in SOURCES[key].iter_months([month])
+            for s in recs
+        ]
+        if len(by_source) > 1:
+            items.sort(key=lambda s: (s["date"], s["id"]), reverse=True)
+        yield month, items
+
+
+def fetch_scrutins(keys: list[str], limit: int = 0, workers: int = 1,
+                   changed_months: set | None = None,
+                   incremental: bool = True,
+                   refresh: bool = True) -> list[dict]:
+    """
+    Tous les scrutins normalisés des sources `keys`, du plus récent au plus
+    ancien ; les votes de chaque scrutin sont une VoteSlice d'une VoteTable
+    commune. Paramètres : voir prepare_sources et sources.an.
+    """
+    acteurs, organes, months = prepare_sources(
+        keys, workers, changed_months=changed_months,
+        incremental=incremental, refresh=refresh,
+    )
+    return load_scrutins(acteurs, organes, months, limit)
+
+
+def load_scrutins(acteurs: dict, organes: dict, months: dict[str, list[str]],
+                  limit: int = 0) -> list[dict]:
+    """Scrutins de sources déjà préparées (prepare_sources), voir fetch_scrutins."""
+    with instrument.stage("load") as st:
+        scrutins = [s for _, items in iter_months(months) for s in items]
+        st.items = len(scrutins)
+    print(f"✅ {len(scrutins)} scrutins parsés")
+    if limit:
+        scrutins = scrutins[:limit]
+
+    # votes en colonnes, noms résolus une fois par député / groupe
+    with instrument.stage("enrich") as st:
+        table = VoteTable(acteurs, organes)
+        for s in scrutins:
+            s["votes"] = table.append(s["votes"])
+        st.items = len(table)
+
+    return scrutins
+
+
+# enregistre les législatures AN
+from sources import an  # noqa: E402,F401
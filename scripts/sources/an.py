@@ -1,10 +1,28 @@
+import hashlib
+import io
+import os
+import re
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import repeat
 from pathlib import Path
 import json
 
-import httpx
 from lxml import etree
 
+import instrument
+from normalize import normalize_an_scrutin
+from sources import Source, register
+from sources.download import fetch_all
+from votes import VoteTable
+
+try:  # optionnel : parsing JSON plus rapide
+    import orjson
+except ImportError:
+    orjson = None
+
+# législature en cours
 AN_LEGISLATURE = "17"
 
 AN_ZIP_URL = (
@@ -18,24 +36,53 @@ AN_ACTEURS_URL = (
     "AMO10_deputes_actifs_mandats_actifs_organes.json.zip"
 )
 
+_AN_REPOSITORY = "https://data.assemblee-nationale.fr/static/openData/repository/"
+
+# référentiel historique (députés et organes de toute la législature) : le
+# dump "actifs" n'existe que pour la législature en cours
+_AN_AMO_HISTORIQUE = (
+    "amo/tous_acteurs_tous_mandats_tous_organes_historique/"
+    "AMO30_tous_acteurs_tous_mandats_tous_organes_historique.json.zip"
+)
+
+# législature -> (archive des scrutins, référentiel acteurs / organes)
+AN_URLS = {
+    "14": (_AN_REPOSITORY + "14/loi/scrutins/Scrutins_XIV.xml.zip",
+           _AN_REPOSITORY + "14/" + _AN_AMO_HISTORIQUE),
+    "15": (_AN_REPOSITORY + "15/loi/scrutins/Scrutins_XV.xml.zip",
+           _AN_REPOSITORY + "15/" + _AN_AMO_HISTORIQUE),
+    "16": (_AN_REPOSITORY + "16/loi/scrutins/Scrutins.xml.zip",
+           _AN_REPOSITORY + "16/" + _AN_AMO_HISTORIQUE),
+    "17": (AN_ZIP_URL, AN_ACTEURS_URL),
+}
+
 
 # ---------------------------------------------------------------------------
 # Utils
 # ---------------------------------------------------------------------------
 
-def _cache_dir() -> Path:
-    return Path(".cache") / "an"
+def _cache_dir(legislature: str = AN_LEGISLATURE) -> Path:
+    """Espace de cache d'une législature : .cache/an/<législature>/."""
+    return Path(".cache") / "an" / legislature
+
+
+def _migrate_flat_cache():
+    """
+    Ancien cache à plat (.cache/an/*, législature en cours seule) : déplacé
+    dans .cache/an/<AN_LEGISLATURE>/ pour ne rien retélécharger ni reparser.
+    """
+    root = Path(".cache") / "an"
+    dest = _cache_dir()
+    if dest.exists() or not (root / "Scrutins.xml.zip").exists():
+        return
+    dest.mkdir()
+    for path in list(root.iterdir()):
+        if path.name not in AN_URLS:
+            path.rename(dest / path.name)
 
 
 def _download(url: str, dest: Path):
-    dest.parent.mkdir(parents=True, exist_ok=True)
-    print(f"📥 Téléchargement de {dest.name}...")
-    with httpx.stream("GET", url, timeout=120.0, follow_redirects=True) as r:
-        r.raise_for_status()
-        with open(dest, "wb") as f:
-            for chunk in r.iter_bytes():
-                f.write(chunk)
-    print(f"✅ {dest.name} téléchargé")
+    fetch_all([(url, dest)], offline_ok=False)
 
 
 def _date_only(s: str | None) -> str | None:
@@ -65,64 +112,116 @@ def _first_text(node, local_name: str) -> str | None:
 # Votes
 # ---------------------------------------------------------------------------
 
-def _extract_votes(scrutin_node) -> list[dict]:
-    votes = []
-
-    bucket_to_pos = {
-        "pour": "FOR",
-        "pours": "FOR",
-        "contre": "AGAINST",
-        "contres": "AGAINST",
-        "abstention": "ABSTAIN",
-        "abstentions": "ABSTAIN",
-        "nonVotant": "NONVOTING",
-        "nonvotant": "NONVOTING",
-        "nonVotants": "NONVOTING",
-    }
+_BUCKET_TO_POS = {
+    "pour": "FOR",
+    "pours": "FOR",
+    "contre": "AGAINST",
+    "contres": "AGAINST",
+    "abstention": "ABSTAIN",
+    "abstentions": "ABSTAIN",
+    "nonVotant": "NONVOTING",
+    "nonvotant": "NONVOTING",
+    "nonVotants": "NONVOTING",
+}
 
-    actor_nodes = scrutin_node.xpath(".//*[local-name()='acteurRef']")
-    for a in actor_nodes:
-        pid = (a.text or "").strip()
-        if not pid:
-            continue
+_COUNT_FIELDS = [
+    ("for", "pour"),
+    ("against", "contre"),
+    ("abstention", "abstention"),
+    ("nonvoting", "nonVotant"),
+]
 
-        pos = None
-        group = None
+# profondeur max de remontée acteurRef -> groupe / position
+_MAX_ANCESTORS = 30
 
-        cur = a
-        for _ in range(30):
-            cur = cur.getparent()
-            if cur is None:
-                break
 
-            lname = cur.tag.split("}")[-1]
+_LOCAL_NAMES: dict[str, str] = {}
 
-            if pos is None and lname in bucket_to_pos:
-                pos = bucket_to_pos[lname]
 
-            if group is None:
-                g = cur.xpath("string(.//*[local-name()='organeRef'][1])")
-                g = g.strip() if isinstance(g, str) else ""
-                if g:
-                    group = g
+def _local_name(tag: str) -> str:
+    lname = _LOCAL_NAMES.get(tag)
+    if lname is None:
+        lname = _LOCAL_NAMES[tag] = tag.rpartition("}")[2]
+    return lname
 
-            if pos and group:
-                break
 
-        if not pos:
-            continue
+class _VoteTracker:
+    """
+    Extraction des votes en un seul parcours start/end (iterwalk / iterparse).
+
+    Chaque élément ouvert a un frame [local-name, cellule organeRef, capture].
+    La cellule d'un frame pointe vers le premier organeRef de son sous-arbre,
+    soit ce que `string(.//organeRef[1])` renvoyait pour cet ancêtre : le
+    groupe d'un votant est la première cellule non vide parmi ses
+    _MAX_ANCESTORS ancêtres, sa position le bucket le plus proche.
+    Les groupes sont résolus dans votes(), une fois toutes les cellules lues.
+    """
+
+    __slots__ = ("stack", "actors")
+
+    def __init__(self):
+        self.stack: list[list] = []
+        self.actors: list[tuple] = []
+
+    def start(self, lname: str) -> list:
+        frame = [lname, None, None]
+        if lname == "organeRef" and self.stack:
+            cell = [""]
+            for f in reversed(self.stack):
+                if f[1] is not None:
+                    break
+                f[1] = cell
+            frame[2] = cell
+        self.stack.append(frame)
+        return frame
+
+    def end(self, lname: str, el) -> list:
+        frame = self.stack.pop()
+        sink = frame[2]
+        if isinstance(sink, list):
+            sink[0] = "".join(el.itertext()).strip()
+        elif lname == "acteurRef" and self.stack:
+            pid = (el.text or "").strip()
+            if pid:
+                anc = self.stack[-1:-_MAX_ANCESTORS - 1:-1]
+                for f in anc:
+                    pos = _BUCKET_TO_POS.get(f[0])
+                    if pos:
+                        self.actors.append((pid, pos, anc))
+                        break
+        return frame
+
+    def votes(self) -> list[dict]:
+        votes = []
+        for pid, pos, anc in self.actors:
+            group = None
+            for f in anc:
+                if f[1] is not None and f[1][0]:
+                    group = f[1][0]
+                    break
+            votes.append(
+                {
+                    "person_id": pid,
+                    "position": pos,
+                    "group": group,
+                    "constituency": None,
+                    "name": None,
+                }
+            )
+        return _dedup_votes(votes)
+
+
+def _extract_votes(scrutin_node) -> list[dict]:
+    tracker = _VoteTracker()
+    for event, el in etree.iterwalk(scrutin_node, events=("start", "end")):
+        if event == "start":
+            tracker.start(_local_name(el.tag))
+        else:
+            tracker.end(_local_name(el.tag), el)
+    return tracker.votes()
 
-        votes.append(
-            {
-                "person_id": pid,
-                "position": pos,
-                "group": group,
-                "constituency": None,
-                "name": None,
-            }
-        )
 
-    # dédoublonnage
+def _dedup_votes(votes: list[dict]) -> list[dict]:
     seen = set()
     uniq = []
     for v in votes:
@@ -131,7 +230,6 @@ def _extract_votes(scrutin_node) -> list[dict]:
             continue
         seen.add(k)
         uniq.append(v)
-
     return uniq
 
 
@@ -139,11 +237,17 @@ def _extract_votes(scrutin_node) -> list[dict]:
 # Scrutin XML
 # ---------------------------------------------------------------------------
 
-def _parse_one_xml(fileobj) -> list[dict]:
+def _parse_one_xml(fileobj, legislature: str = AN_LEGISLATURE) -> list[dict]:
     try:
-        tree = etree.parse(fileobj)
-        el = tree.getroot()
+        el = etree.parse(fileobj).getroot()
+    except Exception:
+        return []
+    return _scrutin_from_element(el, legislature)
 
+
+def _scrutin_from_element(el, legislature: str = AN_LEGISLATURE) -> list[dict]:
+    """Un élément <scrutin> -> [scrutin] (requêtes XPath), [] si illisible."""
+    try:
         numero = _first_text(el, "numero") or "UNKNOWN"
         date = _date_only(_first_text(el, "dateScrutin")) or "1970-01-01"
         title = _first_text(el, "objet") or "(sans titre)"
@@ -174,73 +278,285 @@ def _parse_one_xml(fileobj) -> list[dict]:
             v = v.strip() if isinstance(v, str) else ""
             return int(v) if v.isdigit() else None
 
-        for k, lname in [
-            ("for", "pour"),
-            ("against", "contre"),
-            ("abstention", "abstention"),
-            ("nonvoting", "nonVotant"),
-        ]:
+        for k, lname in _COUNT_FIELDS:
             c = count_of(lname)
             if c is not None:
                 counts[k] = c
 
         votes = _extract_votes(el)
 
-        return [
-            {
-                "id": f"AN-{AN_LEGISLATURE}-{numero}",
-                "date": date,
-                "title": title,
-                "object": None,
-                "scrutin_type": scrutin_type,
-                "result_status": result_status,
-                "counts": counts or None,
-                "source_url": None,
-                "votes": votes,
-            }
-        ]
+        return [_scrutin_record(legislature, numero, date, title, scrutin_type,
+                                result_status, counts, votes)]
 
     except Exception:
         return []
 
 
+def _scrutin_record(legislature, numero, date, title, scrutin_type, result_status,
+                    counts, votes) -> dict:
+    return {
+        "id": f"AN-{legislature}-{numero}",
+        "date": date,
+        "title": title,
+        "object": None,
+        "scrutin_type": scrutin_type,
+        "result_status": result_status,
+        "counts": counts or None,
+        "source_url": None,
+        "votes": votes,
+    }
+
+
 # ---------------------------------------------------------------------------
-# Acteurs & organes
+# Scrutin XML (streaming)
 # ---------------------------------------------------------------------------
 
-def fetch_an_acteurs() -> tuple[dict, dict]:
+# local-name -> (champ, local-name de l'ancêtre requis) : mêmes champs que
+# les `string(.//X[1])` / `string(.//A//X[1])` de _parse_one_xml
+_STREAM_FIELDS = {
+    "numero": ("numero", None),
+    "dateScrutin": ("dateScrutin", None),
+    "objet": ("objet", None),
+    "libelle": ("scrutin_type", "typeScrutin"),
+    "resultat": ("result_status", "syntheseVote"),
+    **{lname: (k, "decompte") for k, lname in _COUNT_FIELDS},
+}
+
+
+def _stream_scrutin(events, legislature: str = AN_LEGISLATURE, root=None) -> dict:
     """
-    Télécharge et parse le(s) dump(s) AN pour:
-    - acteurs (députés) : uid -> name
-    - organes (groupes) : uid -> name + acronym
+    Lit un <scrutin> dans le flux d'événements iterparse (start, end)
+    `events`, jusqu'à sa fermeture, sans aucune requête XPath : champs
+    simples capturés sur leur première occurrence, votes suivis par
+    _VoteTracker. root : élément <scrutin> dont l'appelant a déjà consommé
+    l'événement start (dump composite).
+    """
+    tracker = _VoteTracker()
+    stack = tracker.stack
+    if root is not None:
+        tracker.start(_local_name(root.tag))
+    ctx = {"typeScrutin": 0, "syntheseVote": 0, "decompte": 0}
+    fields = {}
+    pending = 0
+
+    for event, el in events:
+        lname = _local_name(el.tag)
+
+        if event == "start":
+            frame = tracker.start(lname)
+            if len(stack) > 1:
+                spec = _STREAM_FIELDS.get(lname)
+                if spec is not None and spec[0] not in fields and (
+                    spec[1] is None or ctx[spec[1]]
+                ):
+                    fields[spec[0]] = None
+                    frame[2] = spec[0]
+                if frame[2] is not None:
+                    pending += 1
+                if lname in ctx:
+                    ctx[lname] += 1
+            continue
 
-    IMPORTANT: selon les dépôts AN, le ZIP peut contenir:
-      1) un JSON composite unique (souvent enveloppé dans `export`)
-      2) des milliers de JSON unitaires: `json/acteur/PAxxxx.json`, `json/organe/POxxxx.json`, etc.
+        frame = tracker.end(lname, el)
+        if not stack:
+            break
+        if lname in ctx:
+            ctx[lname] -= 1
+
+        sink = frame[2]
+        if sink is not None:
+            if isinstance(sink, str):
+                fields[sink] = "".join(el.itertext()).strip()
+            pending -= 1
+        if not pending:
+            el.clear(keep_tail=True)
+
+    numero = fields.get("numero") or "UNKNOWN"
+    date = _date_only(fields.get("dateScrutin")) or "1970-01-01"
+    title = fields.get("objet") or "(sans titre)"
+    scrutin_type = fields.get("scrutin_type") or None
+    result_status = _norm_result(fields.get("result_status") or None)
+
+    counts = {}
+    for k, _ in _COUNT_FIELDS:
+        v = fields.get(k) or ""
+        if v.isdigit():
+            counts[k] = int(v)
+
+    return _scrutin_record(legislature, numero, date, title, scrutin_type,
+                           result_status, counts, tracker.votes())
+
+
+def _stream_one_xml(fileobj, legislature: str = AN_LEGISLATURE) -> list[dict]:
+    """
+    Equivalent de _parse_one_xml en un seul passage `etree.iterparse`
+    (voir _stream_scrutin).
+    """
+    try:
+        events = etree.iterparse(fileobj, events=("start", "end"))
+        return [_stream_scrutin(events, legislature)]
+    except Exception:
+        return []
 
-    Cette fonction gère les deux formats.
+
+def _parse_composite_xml(fileobj, legislature: str = AN_LEGISLATURE) -> list[dict]:
+    """
+    Dump composite (anciennes législatures : un seul XML <scrutins> qui les
+    contient tous), en un passage iterparse : chaque <scrutin> est lu par
+    _stream_scrutin comme un fichier unitaire, puis libéré avec ses
+    prédécesseurs. Un XML illisible s'arrête au dernier scrutin complet.
     """
+    out = []
+    try:
+        events = etree.iterparse(fileobj, events=("start", "end"))
+        for event, el in events:
+            if event == "start" and _local_name(el.tag) == "scrutin":
+                out.append(_stream_scrutin(events, legislature, root=el))
+                el.clear(keep_tail=True)
+                while el.getprevious() is not None:
+                    del el.getparent()[0]
+    except Exception:
+        pass
+    return out
 
-    def get_text(x) -> str:
-        if isinstance(x, dict):
-            return (x.get("#text") or "").strip()
-        if isinstance(x, str):
-            return x.strip()
-        return ""
 
-    def as_list(x):
-        if x is None:
-            return []
-        if isinstance(x, list):
-            return x
-        return [x]
+# découpe d'un dump composite entre workers, sans le parser : bornes des
+# éléments <scrutin> dans le XML décompressé
+_SCRUTIN_OPEN = re.compile(rb"<(?:[\w.-]+:)?scrutin[\s/>]")
+_SCRUTIN_CLOSE = re.compile(rb"</(?:[\w.-]+:)?scrutin\s*>")
+_TAG_NAME = re.compile(rb"<([A-Za-z_][\w:.-]*)")
+_SCAN_BLOCK = 1 << 20
 
-    cache = _cache_dir()
-    zip_path = cache / "Acteurs.json.zip"
 
-    if not zip_path.exists():
-        _download(AN_ACTEURS_URL, zip_path)
+def _composite_slices(fileobj, parts: int) -> tuple[bytes, list[tuple[int, int]]]:
+    """
+    (en-tête du XML jusqu'au premier <scrutin>, [(début, fin)]) : au plus
+    `parts` tranches d'octets d'éléments <scrutin> consécutifs, avec autant
+    de scrutins chacune.
+    """
+    header = None
+    ends = []
+    buf = b""
+    base = 0
+    while True:
+        block = fileobj.read(_SCAN_BLOCK)
+        buf += block
+        pos = 0
+        if header is None:
+            m = _SCRUTIN_OPEN.search(buf)
+            if m is None:
+                if not block:
+                    break
+                continue
+            header = buf[:m.start()]
+            pos = m.start()
+        for m in _SCRUTIN_CLOSE.finditer(buf, pos):
+            ends.append(base + m.end())
+            pos = m.end()
+        if not block:
+            break
+        # une balise fermante à cheval sur deux blocs est retrouvée au suivant
+        cut = max(pos, len(buf) - 16)
+        base += cut
+        buf = buf[cut:]
+    if header is None or not ends:
+        return b"", []
+    step = -(-len(ends) // parts)
+    bounds = [len(header), *ends[step - 1::step]]
+    if bounds[-1] != ends[-1]:
+        bounds.append(ends[-1])
+    return header, list(zip(bounds, bounds[1:]))
+
+
+def _parse_composite_slice(zip_path: Path, name: str, header: bytes,
+                           span: tuple[int, int],
+                           legislature: str = AN_LEGISLATURE) -> list[dict]:
+    """
+    Une tranche d'un dump composite (dans un worker), reparsée sous la
+    racine d'origine (namespaces) ; votes compacts comme _parse_members.
+    """
+    start, end = span
+    with zipfile.ZipFile(zip_path) as zf, zf.open(name) as f:
+        f.seek(start)
+        data = f.read(end - start)
+    root = _TAG_NAME.findall(header)[-1]
+    parsed = _parse_composite_xml(io.BytesIO(header + data + b"</" + root + b">"), legislature)
+    return _compact_votes(parsed)
+
+
+# ---------------------------------------------------------------------------
+# Acteurs & organes
+# ---------------------------------------------------------------------------
+
+# cache du référentiel parsé, invalidé par l'empreinte du ZIP
+_ACTEURS_CACHE_NAME = "acteurs.cache.json"
+_ACTEURS_CACHE_VERSION = 1
+
+# nombre de JSON unitaires par lot envoyé à un worker
+_AMO_CHUNK_SIZE = 256
+
+
+def _json_loads(raw: bytes):
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _get_text(x) -> str:
+    if isinstance(x, dict):
+        return (x.get("#text") or "").strip()
+    if isinstance(x, str):
+        return x.strip()
+    return ""
+
+
+def _as_list(x):
+    if x is None:
+        return []
+    if isinstance(x, list):
+        return x
+    return [x]
+
+
+def _acteur_name(a: dict) -> str:
+    ident = ((a.get("etatCivil") or {}).get("ident") or {})
+    prenom = _get_text(ident.get("prenom"))
+    nom = _get_text(ident.get("nom"))
+    full_name = f"{prenom} {nom}".strip()
+    return full_name or "Inconnu"
+
+
+def _organe_entry(o: dict) -> dict:
+    libelle = _get_text(o.get("libelle"))
+    libelle_abrege = _get_text(o.get("libelleAbrege")) or _get_text(o.get("libelleAbrev"))
+    return {
+        "name": libelle or "Groupe inconnu",
+        "acronym": libelle_abrege or "",
+    }
+
+
+def _parse_amo_members(zip_path: Path, members: list[tuple[str, str]]) -> tuple[dict, dict]:
+    """
+    Parse une tranche de JSON unitaires (`kind` = "acteur" ou "organe"),
+    éventuellement dans un worker qui rouvre le ZIP.
+    """
+    acteurs: dict[str, dict] = {}
+    organes: dict[str, dict] = {}
+    with zipfile.ZipFile(zip_path) as zf:
+        for name, kind in members:
+            data = _json_loads(zf.read(name))
+            x = data.get(kind)
+            if not isinstance(x, dict):
+                continue
+            uid = _get_text(x.get("uid"))
+            if not uid:
+                continue
+            if kind == "acteur":
+                acteurs[uid] = {"name": _acteur_name(x)}
+            else:
+                organes[uid] = _organe_entry(x)
+    return acteurs, organes
 
+
+def _parse_acteurs_zip(zip_path: Path, workers: int = 1) -> tuple[dict, dict]:
     acteurs: dict[str, dict] = {}
     organes: dict[str, dict] = {}
 
@@ -253,90 +569,106 @@ def fetch_an_acteurs() -> tuple[dict, dict]:
             # Heuristique: si le ZIP contient très peu de JSON, c'est probablement un composite.
             # (Sinon, on bascule sur le mode multi-fichiers plus bas.)
             if len(json_files) <= 5:
-                with zf.open(json_files[0]) as f:
-                    data = json.load(f)
+                data = _json_loads(zf.read(json_files[0]))
 
                 root = data.get("export", data)
 
                 # acteurs
-                for a in as_list((root.get("acteurs") or {}).get("acteur")):
+                for a in _as_list((root.get("acteurs") or {}).get("acteur")):
                     if not isinstance(a, dict):
                         continue
-                    uid = get_text(a.get("uid"))
+                    uid = _get_text(a.get("uid"))
                     if not uid:
                         continue
-                    ident = ((a.get("etatCivil") or {}).get("ident") or {})
-                    prenom = get_text(ident.get("prenom"))
-                    nom = get_text(ident.get("nom"))
-                    full_name = f"{prenom} {nom}".strip()
-                    acteurs[uid] = {"name": full_name or "Inconnu"}
+                    acteurs[uid] = {"name": _acteur_name(a)}
 
                 # organes
-                for o in as_list((root.get("organes") or {}).get("organe")):
+                for o in _as_list((root.get("organes") or {}).get("organe")):
                     if not isinstance(o, dict):
                         continue
-                    oid = get_text(o.get("uid"))
+                    oid = _get_text(o.get("uid"))
                     if not oid:
                         continue
-                    libelle = get_text(o.get("libelle"))
-                    libelle_abrege = get_text(o.get("libelleAbrege")) or get_text(o.get("libelleAbrev"))
-                    organes[oid] = {
-                        "name": libelle or "Groupe inconnu",
-                        "acronym": libelle_abrege or "",
-                    }
+                    organes[oid] = _organe_entry(o)
 
-                print(f"✅ {len(acteurs)} acteurs chargés")
-                print(f"✅ {len(organes)} organes chargés")
                 return acteurs, organes
 
-        # --- Cas 2: ZIP multi-fichiers (json/acteur/*.json, json/organe/*.json) ---
-        acteur_files = [n for n in names if n.lower().startswith("json/acteur/") and n.lower().endswith(".json")]
-        organe_files = [n for n in names if n.lower().startswith("json/organe/") and n.lower().endswith(".json")]
+    # --- Cas 2: ZIP multi-fichiers (json/acteur/*.json, json/organe/*.json) ---
+    acteur_files = [n for n in names if n.lower().startswith("json/acteur/") and n.lower().endswith(".json")]
+    organe_files = [n for n in names if n.lower().startswith("json/organe/") and n.lower().endswith(".json")]
 
-        # Fallback si l'arborescence est légèrement différente
-        if not acteur_files:
-            acteur_files = [n for n in names if "/acteur/" in n.lower() and n.lower().endswith(".json")]
-        if not organe_files:
-            organe_files = [n for n in names if "/organe/" in n.lower() and n.lower().endswith(".json")]
+    # Fallback si l'arborescence est légèrement différente
+    if not acteur_files:
+        acteur_files = [n for n in names if "/acteur/" in n.lower() and n.lower().endswith(".json")]
+    if not organe_files:
+        organe_files = [n for n in names if "/organe/" in n.lower() and n.lower().endswith(".json")]
 
-        # Parse acteurs unitaires
-        for name in acteur_files:
-            with zf.open(name) as f:
-                data = json.load(f)
-            a = data.get("acteur")
-            if not isinstance(a, dict):
-                continue
+    # acteurs puis organes, lots fusionnés dans l'ordre : même résultat
+    # que le parcours séquentiel en cas d'uid dupliqué
+    members = [(n, "acteur") for n in acteur_files] + [(n, "organe") for n in organe_files]
+    chunks = [members[i:i + _AMO_CHUNK_SIZE] for i in range(0, len(members), _AMO_CHUNK_SIZE)]
 
-            uid = get_text(a.get("uid"))
-            if not uid:
-                continue
+    with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as pool:
+        mapper = pool.map if pool is not None else map
+        for a, o in mapper(_parse_amo_members, repeat(zip_path), chunks):
+            acteurs.update(a)
+            organes.update(o)
 
-            ident = ((a.get("etatCivil") or {}).get("ident") or {})
-            prenom = get_text(ident.get("prenom"))
-            nom = get_text(ident.get("nom"))
-            full_name = f"{prenom} {nom}".strip()
+    return acteurs, organes
 
-            acteurs[uid] = {"name": full_name or "Inconnu"}
 
-        # Parse organes unitaires
-        for name in organe_files:
-            with zf.open(name) as f:
-                data = json.load(f)
-            o = data.get("organe")
-            if not isinstance(o, dict):
-                continue
+def _file_sha1(path: Path) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
 
-            oid = get_text(o.get("uid"))
-            if not oid:
-                continue
 
-            libelle = get_text(o.get("libelle"))
-            libelle_abrege = get_text(o.get("libelleAbrege")) or get_text(o.get("libelleAbrev"))
+def fetch_an_acteurs(workers: int = 1,
+                     legislature: str = AN_LEGISLATURE) -> tuple[dict, dict]:
+    """
+    Télécharge et parse le(s) dump(s) AN pour:
+    - acteurs (députés) : uid -> name
+    - organes (groupes) : uid -> name + acronym
+
+    IMPORTANT: selon les dépôts AN, le ZIP peut contenir:
+      1) un JSON composite unique (souvent enveloppé dans `export`)
+      2) des milliers de JSON unitaires: `json/acteur/PAxxxx.json`, `json/organe/POxxxx.json`, etc.
+
+    Cette fonction gère les deux formats. Le résultat est mis en cache
+    (clé : SHA-1 du ZIP) ; workers > 1 répartit le cas 2 sur des processus.
+    """
+    cache = _cache_dir(legislature)
+    zip_path = cache / "Acteurs.json.zip"
+
+    if not zip_path.exists():
+        _download(AN_URLS[legislature][1], zip_path)
 
-            organes[oid] = {
-                "name": libelle or "Groupe inconnu",
-                "acronym": libelle_abrege or "",
-            }
+    digest = _file_sha1(zip_path)
+    cache_path = cache / _ACTEURS_CACHE_NAME
+    try:
+        cached = _json_loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        cached = {}
+
+    if cached.get("version") == _ACTEURS_CACHE_VERSION and cached.get("sha1") == digest:
+        acteurs = {uid: {"name": name} for uid, name in cached["acteurs"].items()}
+        organes = {
+            uid: {"name": name, "acronym": acronym}
+            for uid, (name, acronym) in cached["organes"].items()
+        }
+        print(f"✅ {len(acteurs)} acteurs, {len(organes)} organes (cache)")
+        return acteurs, organes
+
+    acteurs, organes = _parse_acteurs_zip(zip_path, workers)
+
+    cache_path.write_text(json.dumps({
+        "version": _ACTEURS_CACHE_VERSION,
+        "sha1": digest,
+        "acteurs": {uid: a["name"] for uid, a in acteurs.items()},
+        "organes": {uid: [o["name"], o["acronym"]] for uid, o in organes.items()},
+    }, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
 
     print(f"✅ {len(acteurs)} acteurs chargés")
     print(f"✅ {len(organes)} organes chargés")
@@ -344,43 +676,379 @@ def fetch_an_acteurs() -> tuple[dict, dict]:
 
 
 # ---------------------------------------------------------------------------
-# Public API
+# Parsing du ZIP (incrémental, séquentiel ou multi-processus)
 # ---------------------------------------------------------------------------
 
-def fetch_an_scrutins(limit: int = 0) -> list[dict]:
-    print("📥 Chargement acteurs / organes…")
-    acteurs, organes = fetch_an_acteurs()
+# nombre de membres XML par lot envoyé à un worker
+_CHUNK_SIZE = 64
 
-    cache = _cache_dir()
-    zip_path = cache / "Scrutins.xml.zip"
-    if not zip_path.exists():
-        _download(AN_ZIP_URL, zip_path)
+# au plus autant de XML dans le ZIP : dump composite (un XML <scrutins>)
+_COMPOSITE_MAX_MEMBERS = 5
+
+# manifeste de build : membre ZIP -> (CRC, taille, mois de ses scrutins)
+_MANIFEST_NAME = "scrutins.manifest.json"
+_MANIFEST_VERSION = 2
 
-    scrutins = []
+# scrutins parsés, un fichier par mois : {"members": {membre ZIP: [scrutins]}}
+_PARSED_DIR = "parsed"
+
+
+def _parse_members(zip_path: Path, names: list[str],
+                   legislature: str = AN_LEGISLATURE,
+                   composite: bool = False) -> list[list[dict]]:
+    """
+    Parse une tranche des membres XML du ZIP (éventuellement dans un worker).
+    Le ZIP est rouvert dans le processus (pas d'octets bruts à pickler).
+    Retourne, pour chaque membre, ses scrutins avec des votes compacts
+    (person_id, position, group).
+    """
+    parse = _parse_composite_xml if composite else _stream_one_xml
+    out = []
     with zipfile.ZipFile(zip_path) as zf:
-        xml_files = [n for n in zf.namelist() if n.endswith(".xml")]
-        for i, name in enumerate(xml_files):
-            if i % 500 == 0:
-                print(f"   … {i}/{len(xml_files)}")
+        for name in names:
             with zf.open(name) as f:
-                scrutins.extend(_parse_one_xml(f))
+                out.append(_compact_votes(parse(f, legislature)))
+    return out
+
+
+def _compact_votes(parsed: list[dict]) -> list[dict]:
+    """Votes dicts -> tuples (person_id, position, group), sur place."""
+    for s in parsed:
+        s["votes"] = [
+            (v["person_id"], v["position"], v["group"])
+            for v in s["votes"]
+        ]
+    return parsed
+
+
+def _parse_all_members(zip_path: Path, names: list[str], workers: int = 1,
+                       legislature: str = AN_LEGISLATURE, composite: bool = False):
+    """
+    Parse les membres `names` par lots, dans l'ordre du ZIP quel que soit
+    le nombre de workers (pool.map rend les lots dans l'ordre de soumission).
+    Générateur : un dict {membre: scrutins} par lot.
+
+    Dump composite : chaque XML est découpé en une tranche contiguë de
+    scrutins par worker (_composite_slices), recollées dans l'ordre.
+    """
+    if composite and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for name in names:
+                with zipfile.ZipFile(zip_path) as zf, zf.open(name) as f:
+                    header, slices = _composite_slices(f, workers)
+                print(f"   … {name} : {len(slices)} tranches, {workers} workers")
+                results = pool.map(_parse_composite_slice, repeat(zip_path), repeat(name),
+                                   repeat(header), slices, repeat(legislature))
+                yield {name: [s for recs in results for s in recs]}
+        return
+
+    chunks = [names[i:i + _CHUNK_SIZE] for i in range(0, len(names), _CHUNK_SIZE)]
+    if workers > 1 and len(chunks) > 1:
+        print(f"   … {len(names)} fichiers, {workers} workers")
+
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as pool:
+        mapper = pool.map if pool is not None else map
+        results = mapper(_parse_members, repeat(zip_path), chunks,
+                         repeat(legislature), repeat(composite))
+        for chunk, chunk_results in zip(chunks, results):
+            if done % 500 + len(chunk) >= 500 or done == 0:
+                print(f"   … {done}/{len(names)}")
+            done += len(chunk)
+            yield dict(zip(chunk, chunk_results))
+
+
+def _load_manifest(path: Path) -> dict:
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != _MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def _save_manifest(path: Path, manifest: dict):
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, separators=(",", ":")),
+                   encoding="utf-8")
+    tmp.replace(path)
+
 
+def _month_path(cache: Path, month: str) -> Path:
+    return cache / _PARSED_DIR / f"{month}.json"
+
+
+def _read_month(path: Path) -> dict[str, list[dict]]:
+    try:
+        return _json_loads(path.read_bytes())["members"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def _spill(parsed: dict[str, list[dict]], spills: dict, cache: Path) -> set[str]:
+    """
+    Ajoute les scrutins d'un lot de membres au fichier de débordement de
+    leur mois (<mois>.new.jsonl, une ligne [membre, scrutins] par membre) :
+    rien n'est gardé en mémoire d'un lot à l'autre.
+    """
+    months = set()
+    for name, recs in parsed.items():
+        by_month: dict[str, list[dict]] = {}
+        for s in recs:
+            by_month.setdefault(s["date"][:7], []).append(s)
+        for month, items in by_month.items():
+            f = spills.get(month)
+            if f is None:
+                path = cache / _PARSED_DIR / f"{month}.new.jsonl"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                f = spills[month] = open(path, "w", encoding="utf-8")
+            f.write(json.dumps([name, items], ensure_ascii=False, separators=(",", ":")))
+            f.write("\n")
+        months.update(by_month)
+    return months
+
+
+def _merge_month(cache: Path, month: str, order: dict[str, int], stale: set[str]):
+    """
+    Fichier du mois = membres inchangés de l'ancien fichier + membres
+    reparsés (débordement), dans l'ordre du ZIP.
+    """
+    path = _month_path(cache, month)
+    members = {
+        name: recs for name, recs in _read_month(path).items()
+        if name in order and name not in stale
+    }
+    spill = path.with_name(f"{month}.new.jsonl")
+    if spill.exists():
+        with open(spill, encoding="utf-8") as f:
+            for line in f:
+                name, recs = json.loads(line)
+                members[name] = recs
+        spill.unlink()
+    if not members:
+        path.unlink(missing_ok=True)
+        return
+    members = dict(sorted(members.items(), key=lambda kv: order[kv[0]]))
+    _save_manifest(path, {"members": members})
+
+
+def _parse_scrutins_zip(zip_path: Path, workers: int = 1,
+                        changed_months: set | None = None,
+                        context: str = "",
+                        incremental: bool = True,
+                        legislature: str = AN_LEGISLATURE) -> list[str]:
+    """
+    Met à jour le cache des scrutins parsés (<cache>/parsed/YYYY-MM.json)
+    en s'appuyant sur le manifeste de build : seuls les membres nouveaux ou
+    dont le CRC/la taille a changé sont parsés, puis fusionnés dans les
+    fichiers de leurs mois. Aucune étape ne garde tous les scrutins en
+    mémoire : les lots parsés débordent sur disque, mois par mois.
+
+    changed_months: si fourni, reçoit les mois (YYYY-MM) dont le contenu a
+    pu changer : mois des membres ajoutés, modifiés ou supprimés, ou tous
+    les mois si `context` (empreinte des référentiels) a changé.
+
+    Retourne la liste triée des mois présents dans le cache.
+    """
+    cache = zip_path.parent
+    manifest_path = cache / _MANIFEST_NAME
+    manifest = _load_manifest(manifest_path) if incremental else {}
+    old_members = manifest.get("members", {})
+    # cache de mois incomplet : tout reparser
+    if any(not _month_path(cache, mo).exists()
+           for m in old_members.values() for mo in m["months"]):
+        old_members = {}
+    full = manifest.get("context") != context
+
+    with zipfile.ZipFile(zip_path) as zf:
+        infos = [i for i in zf.infolist() if i.filename.endswith(".xml")]
+    order = {info.filename: i for i, info in enumerate(infos)}
+    composite = len(infos) <= _COMPOSITE_MAX_MEMBERS
+
+    stale = []
+    for info in infos:
+        m = old_members.get(info.filename)
+        if m is None or m["crc"] != info.CRC or m["size"] != info.file_size:
+            stale.append(info.filename)
+    if old_members:
+        print(f"   … {len(infos) - len(stale)} fichiers inchangés, {len(stale)} à parser")
+
+    members = {}
+    spills = {}
+    with instrument.stage("parse") as st:
+        try:
+            for parsed in _parse_all_members(zip_path, stale, workers, legislature, composite):
+                _spill(parsed, spills, cache)
+                for name, recs in parsed.items():
+                    info = infos[order[name]]
+                    members[name] = {
+                        "crc": info.CRC,
+                        "size": info.file_size,
+                        "months": sorted({s["date"][:7] for s in recs}),
+                    }
+        finally:
+            for f in spills.values():
+                f.close()
+        st.items = len(stale)
+
+    # mois à refaire : nouveaux mois des membres reparsés, anciens mois des
+    # membres reparsés ou supprimés
+    months: set[str] = set(spills)
+    for name in stale:
+        months.update(members[name]["months"])
+        if name in old_members:
+            months.update(old_members[name]["months"])
+    for name in old_members.keys() - order.keys():
+        months.update(old_members[name]["months"])
+    for name in order:
+        if name not in members:
+            members[name] = old_members[name]
+    members = {info.filename: members[info.filename] for info in infos}
+
+    stale_set = set(stale)
+    with instrument.stage("merge") as st:
+        for month in sorted(months):
+            _merge_month(cache, month, order, stale_set)
+        st.items = len(months)
+
+    if stale or full or len(members) != len(old_members):
+        _save_manifest(manifest_path, {
+            "version": _MANIFEST_VERSION,
+            "context": context,
+            "members": members,
+        })
+
+    all_months = sorted({mo for m in members.values() for mo in m["months"]})
+    if changed_months is not None:
+        if full:
+            months.update(all_months)
+        changed_months.update(months)
+    return all_months
+
+
+def iter_an_months(months: list[str], legislature: str = AN_LEGISLATURE):
+    """
+    Scrutins du cache parsé, un mois à la fois, du plus récent au plus
+    ancien : (mois, scrutins triés par (date, id) décroissants). Les votes
+    sont compacts (person_id, position, group). Un id présent dans
+    plusieurs membres garde la dernière version (ordre du ZIP).
+    """
+    cache = _cache_dir(legislature)
+    for month in sorted(months, reverse=True):
+        uniq = {}
+        for recs in _read_month(_month_path(cache, month)).values():
+            for s in recs:
+                uniq[s["id"]] = s
+        yield month, sorted(uniq.values(), key=lambda s: (s["date"], s["id"]), reverse=True)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def prepare_an_scrutins(workers: int = 1,
+                        changed_months: set | None = None,
+                        incremental: bool = True,
+                        refresh: bool = True,
+                        legislature: str = AN_LEGISLATURE) -> tuple[dict, dict, list[str]]:
+    """
+    Télécharge les archives, charge les référentiels et met à jour le cache
+    des scrutins parsés. Retourne (acteurs, organes, mois disponibles) ; les
+    scrutins se lisent ensuite mois par mois avec iter_an_months().
+    Paramètres : voir fetch_an_scrutins.
+    """
+    workers = workers or os.cpu_count() or 1
+    if legislature == AN_LEGISLATURE:
+        _migrate_flat_cache()
+    cache = _cache_dir(legislature)
+    zip_path = cache / "Scrutins.xml.zip"
+    zip_url, acteurs_url = AN_URLS[legislature]
+    with instrument.stage("download"):
+        # requêtes conditionnelles, les deux archives en parallèle ; hors
+        # ligne, seules les archives absentes du cache sont téléchargées
+        jobs = [(zip_url, zip_path), (acteurs_url, cache / "Acteurs.json.zip")]
+        if not refresh:
+            jobs = [(url, dest) for url, dest in jobs if not dest.exists()]
+        if jobs:
+            fetch_all(jobs)
+
+    print(f"📥 Chargement acteurs / organes (AN {legislature})…")
+    with instrument.stage("acteurs") as st:
+        acteurs, organes = fetch_an_acteurs(workers, legislature)
+        st.items = len(acteurs)
+
+    # les noms sont recopiés dans chaque vote : si le référentiel change,
+    # tous les mois sont à réécrire
+    context = hashlib.sha1(
+        json.dumps([acteurs, organes], sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+    months = _parse_scrutins_zip(
+        zip_path,
+        workers,
+        changed_months=changed_months,
+        context=context,
+        incremental=incremental,
+        legislature=legislature,
+    )
+    return acteurs, organes, months
+
+
+def fetch_an_scrutins(limit: int = 0, workers: int = 1,
+                      changed_months: set | None = None,
+                      incremental: bool = True,
+                      refresh: bool = True,
+                      legislature: str = AN_LEGISLATURE) -> list[dict]:
+    """
+    Scrutins bruts d'une législature (voir sources.fetch_scrutins pour
+    plusieurs sources normalisées).
+    workers: nombre de processus pour le parsing XML
+    (1 = séquentiel, 0 = un par CPU).
+    changed_months: rempli avec les mois à réécrire (voir _parse_scrutins_zip).
+    incremental: False pour ignorer le manifeste et tout reparser.
+    refresh: False pour utiliser les ZIP en cache sans interroger le serveur.
+
+    Les votes de chaque scrutin sont une VoteSlice d'une VoteTable commune.
+    Tous les scrutins sont chargés : voir pipeline.py pour le build en flux.
+    """
+    acteurs, organes, months = prepare_an_scrutins(
+        workers, changed_months=changed_months,
+        incremental=incremental, refresh=refresh, legislature=legislature,
+    )
+
+    # du plus récent au plus ancien, mois par mois
+    scrutins = [s for _, items in iter_an_months(months, legislature) for s in items]
     print(f"✅ {len(scrutins)} scrutins parsés")
+    if limit:
+        scrutins = scrutins[:limit]
 
+    # votes en colonnes, noms résolus une fois par député / groupe
+    table = VoteTable(acteurs, organes)
     for s in scrutins:
-        for v in s["votes"]:
-            pid = v["person_id"]
-            gid = v["group"]
-            v["name"] = acteurs.get(pid, {}).get("name", "Inconnu")
-            if gid:
-                v["group_name"] = organes.get(gid, {}).get("name")
-                v["group_acronym"] = organes.get(gid, {}).get("acronym")
-
-    uniq = {s["id"]: s for s in scrutins}
-    scrutins = sorted(
-        uniq.values(),
-        key=lambda s: (s["date"], s["id"]),
-        reverse=True,
-    )
+        s["votes"] = table.append(s["votes"])
+
+    return scrutins
+
+
+class AnSource(Source):
+    """Une législature de l'Assemblée nationale (cache .cache/an/<législature>/)."""
+
+    chamber = "AN"
+
+    def __init__(self, legislature: str):
+        self.legislature = legislature
+        self.key = f"an-{legislature}"
+
+    def prepare(self, workers=1, changed_months=None, incremental=True, refresh=True):
+        return prepare_an_scrutins(workers, changed_months=changed_months,
+                                   incremental=incremental, refresh=refresh,
+                                   legislature=self.legislature)
+
+    def iter_months(self, months):
+        for month, items in iter_an_months(months, self.legislature):
+            yield month, [normalize_an_scrutin(s) for s in items]
+
 
-    return scrutins[:limit] if limit else scrutins
\ No newline at end of file
+for _legislature in AN_URLS:
+    register(AnSource(_legislature))
@@ -0,0 +1,137 @@
+"""
+Téléchargements avec cache HTTP.
+
+Chaque fichier téléchargé a un sidecar `<fichier>.meta.json` qui garde ses
+validateurs (ETag, Last-Modified, taille) :
+- les requêtes suivantes sont conditionnelles (If-None-Match /
+  If-Modified-Since) : un 304 garde le fichier en cache tel quel ;
+- un transfert interrompu reste dans `<fichier>.part` et reprend avec
+  Range + If-Range au run suivant.
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+
+TIMEOUT = 120.0
+
+
+def _meta_path(dest: Path) -> Path:
+    return dest.with_name(dest.name + ".meta.json")
+
+
+def _part_path(dest: Path) -> Path:
+    return dest.with_name(dest.name + ".part")
+
+
+def _load_meta(dest: Path) -> dict:
+    try:
+        return json.loads(_meta_path(dest).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_meta(dest: Path, meta: dict):
+    _meta_path(dest).write_text(json.dumps(meta, indent=2) + "\n", encoding="utf-8")
+
+
+def _validators(r: httpx.Response) -> dict:
+    return {
+        "etag": r.headers.get("etag"),
+        "last_modified": r.headers.get("last-modified"),
+    }
+
+
+def _range_starts_at(r: httpx.Response, offset: int) -> bool:
+    # Content-Range: bytes <start>-<end>/<total>
+    unit, _, spec = r.headers.get("content-range", "").partition(" ")
+    return unit == "bytes" and spec.split("-")[0] == str(offset)
+
+
+def fetch(client: httpx.Client, url: str, dest: Path) -> bool:
+    """
+    Met à jour `dest` depuis `url` si la ressource distante a changé.
+    Retourne True si un nouveau contenu a été écrit.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    part = _part_path(dest)
+    meta = _load_meta(dest)
+    if meta.get("url") != url:
+        meta = {}
+
+    headers = {}
+    offset = 0
+    partial = meta.get("partial") or {}
+    # If-Range n'accepte qu'un ETag fort ou une date
+    etag = partial.get("etag")
+    if_range = etag if etag and not etag.startswith("W/") else partial.get("last_modified")
+    if part.exists() and if_range:
+        offset = part.stat().st_size
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = if_range
+    elif dest.exists():
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    with client.stream("GET", url, headers=headers) as r:
+        if r.status_code == 304:
+            print(f"✅ {dest.name} à jour")
+            return False
+        if r.status_code == 416 or (
+            r.status_code == 206 and not _range_starts_at(r, offset)
+        ):
+            # .part inutilisable : on repart de zéro
+            part.unlink(missing_ok=True)
+            meta.pop("partial", None)
+            _save_meta(dest, meta)
+            return fetch(client, url, dest)
+        r.raise_for_status()
+
+        if r.status_code == 206:
+            print(f"📥 Reprise de {dest.name} à {offset} octets...")
+            mode = "ab"
+        else:
+            print(f"📥 Téléchargement de {dest.name}...")
+            mode = "wb"
+            offset = 0
+            meta["partial"] = _validators(r)
+            _save_meta(dest, {**meta, "url": url})
+
+        # octets tels que transférés : la taille du .part sert d'offset de
+        # reprise, elle ne doit pas dépendre d'un Content-Encoding
+        with open(part, mode) as f:
+            for chunk in r.iter_raw():
+                f.write(chunk)
+        validators = _validators(r) if r.status_code == 200 else partial
+
+    size = part.stat().st_size
+    part.replace(dest)
+    _save_meta(dest, {"url": url, **validators, "size": size})
+    print(f"✅ {dest.name} téléchargé ({size} octets)")
+    return True
+
+
+def fetch_all(jobs: list[tuple[str, Path]], offline_ok: bool = True) -> list[bool]:
+    """
+    Télécharge en parallèle les couples (url, dest) sur un seul client
+    httpx (pool de connexions partagé).
+
+    offline_ok: si le réseau échoue et qu'une copie existe en cache,
+    on la garde avec un avertissement au lieu d'échouer.
+    """
+    def one(client, url, dest):
+        try:
+            return fetch(client, url, dest)
+        except (httpx.HTTPError, OSError) as e:
+            if offline_ok and dest.exists():
+                print(f"⚠️  {dest.name}: {e} — copie en cache conservée")
+                return False
+            raise
+
+    with httpx.Client(timeout=TIMEOUT, follow_redirects=True) as client:
+        with ThreadPoolExecutor(max_workers=max(1, len(jobs))) as pool:
+            futures = [pool.submit(one, client, url, dest) for url, dest in jobs]
+            return [f.result() for f in futures]
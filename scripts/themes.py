@@ -1,6 +1,11 @@
 import json
+import re
+import unicodedata
 from pathlib import Path
 
+# caractère de mot au sens de re (\w), pour les frontières de mots-clés
+_WORD = re.compile(r"\w")
+
 
 def load_themes(path: Path) -> dict:
     """
@@ -12,13 +17,140 @@ def load_themes(path: Path) -> dict:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def assign_themes(scrutins: list[dict], cfg: dict) -> list[dict]:
+def fold_accents(text: str) -> str:
+    """'Hôpitaux, énergie' -> 'Hopitaux, energie' (décomposition NFKD)."""
+    return "".join(
+        ch for ch in unicodedata.normalize("NFKD", text)
+        if not unicodedata.combining(ch)
+    )
+
+
+def _trie_pattern(words: list[str]) -> str:
+    """
+    Alternative regex factorisée en trie : à chaque position du texte, seuls
+    les mots-clés qui commencent par le bon caractère sont essayés. Les
+    branches plus longues passent d'abord (groupes optionnels gloutons) :
+    le match retenu à une position est le plus long mot-clé possible.
+    """
+    trie: dict = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        if "" in node:
+            return f"(?:{body})?"
+        return body
+
+    return build(trie)
+
+
+class ThemeMatcher:
+    """
+    Détection des thèmes par mots-clés, compilée une fois depuis la config.
+
+    Tous les mots-clés sont réunis dans une seule regex (trie) parcourue une
+    fois par texte ; un mot-clé préfixe d'un autre (ex: "patrimoine" /
+    "patrimoine immobilier") est aussi compté quand le plus long matche.
+    - word_boundary: un mot-clé ne matche que des mots entiers
+      ("plf" ne matche plus "gplf") ;
+    - fold_accents: texte et mots-clés comparés sans accents
+      ("hopital" == "hôpital").
+    Par défaut (les deux à False), le résultat est celui d'un test
+    `kw.lower() in text.lower()` pour chaque mot-clé.
+    Les résultats sont mémorisés par texte : les scrutins d'amendements
+    partagent souvent le même titre.
+    """
+
+    def __init__(self, themes: list[dict], word_boundary: bool = False,
+                 fold_accents: bool = False):
+        self.word_boundary = word_boundary
+        self.fold_accents = fold_accents
+        self._memo: dict[str, list[str]] = {}
+
+        # mot-clé normalisé -> slugs des thèmes qui le contiennent
+        kw_themes: dict[str, set[str]] = {}
+        # mot-clé vide : toujours présent (comme `"" in hay`)
+        self._always: set[str] = set()
+        for t in themes:
+            for kw in t.get("keywords", []):
+                kw = self._normalize(kw)
+                if kw:
+                    kw_themes.setdefault(kw, set()).add(t["slug"])
+                else:
+                    self._always.add(t["slug"])
+
+        # pour chaque mot-clé : (longueur, slugs) de ses préfixes mots-clés
+        self._prefixes = {
+            kw: [(len(p), slugs) for p, slugs in kw_themes.items() if kw.startswith(p)]
+            for kw in kw_themes
+        }
+
+        self._re = None
+        if kw_themes:
+            body = _trie_pattern(list(kw_themes))
+            if word_boundary:
+                self._re = re.compile(rf"(?<!\w)(?=({body})(?!\w))")
+            else:
+                self._re = re.compile(f"(?=({body}))")
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> "ThemeMatcher":
+        """
+        Matcher de la config themes.json ; les modes se règlent via
+        `"match": {"word_boundary": true, "fold_accents": true}`.
+        """
+        opts = cfg.get("match", {})
+        return cls(
+            cfg.get("themes", []),
+            word_boundary=opts.get("word_boundary", False),
+            fold_accents=opts.get("fold_accents", False),
+        )
+
+    def _normalize(self, text: str) -> str:
+        text = text.lower()
+        return fold_accents(text) if self.fold_accents else text
+
+    def match(self, text: str) -> list[str]:
+        """Slugs triés des thèmes présents dans `text`, ou ["autre"]."""
+        found = self._memo.get(text)
+        if found is None:
+            found = self._memo[text] = self._match(text)
+        return list(found)
+
+    def _match(self, text: str) -> list[str]:
+        hay = self._normalize(text)
+        found = set(self._always)
+        if self._re is not None:
+            for m in self._re.finditer(hay):
+                kw = m.group(1)
+                start = m.start(1)
+                for n, slugs in self._prefixes[kw]:
+                    # un préfixe plus court doit lui aussi finir en fin de mot
+                    if (self.word_boundary and n < len(kw)
+                            and _WORD.match(hay, start + n)):
+                        continue
+                    found |= slugs
+        return sorted(found) if found else ["autre"]
+
+
+def assign_themes(scrutins: list[dict], cfg: dict,
+                  matcher: ThemeMatcher | None = None) -> list[dict]:
     """
     Assigne des thèmes par mots-clés + overrides manuels.
     - overrides: { "AN-17-1234": ["budget"] }
     - themes: [{slug,label,keywords:[...]}]
+    - match (optionnel): {word_boundary, fold_accents}, voir ThemeMatcher
+    matcher: matcher déjà compilé depuis `cfg` (appels répétés, lot par lot)
     """
-    themes = cfg.get("themes", [])
+    if matcher is None:
+        matcher = ThemeMatcher.from_config(cfg)
     overrides = cfg.get("overrides", {})
 
     for s in scrutins:
@@ -30,14 +162,6 @@ def assign_themes(scrutins: list[dict], cfg: dict) -> list[dict]:
             continue
 
         # 2) mots-clés
-        hay = f'{s.get("title","")} {s.get("object","")}'.lower()
-        found = []
-        for t in themes:
-            for kw in t.get("keywords", []):
-                if kw.lower() in hay:
-                    found.append(t["slug"])
-                    break
-
-        s["themes"] = sorted(set(found)) if found else ["autre"]
+        s["themes"] = matcher.match(f'{s.get("title","")} {s.get("object","")}')
 
-    return scrutins
\ No newline at end of file
+    return scrutins
@@ -0,0 +1,174 @@
+"""
+Stockage colonnaire des votes individuels.
+
+Au lieu d'un dict par vote (identifiants et libellés recopiés des millions
+de fois), une VoteTable garde trois colonnes parallèles :
+- person   : code personne (int32)
+- group    : code groupe (int32, 0 = sans groupe)
+- position : code position (int8, index dans POSITIONS)
+Les identifiants et libellés ne sont stockés qu'une fois par code.
+Chaque scrutin référence sa plage de lignes via une VoteSlice ; les dicts
+historiques ne sont reconstruits qu'à l'export.
+"""
+from array import array
+
+POSITIONS = ("FOR", "AGAINST", "ABSTAIN", "NONVOTING")
+POSITION_CODES = {p: i for i, p in enumerate(POSITIONS)}
+
+
+class VoteTable:
+
+    def __init__(self, acteurs: dict | None = None, organes: dict | None = None):
+        """
+        acteurs / organes: référentiels de fetch_an_acteurs, utilisés pour
+        nommer chaque nouveau code. Sans référentiel, les noms viennent des
+        votes ajoutés (voir from_scrutins).
+        """
+        self.acteurs = acteurs
+        self.organes = organes
+
+        self.person_ids: list[str] = []
+        self.person_names: list[str | None] = []
+        self.group_ids: list[str | None] = [None]
+        self.group_names: list[str | None] = [None]
+        self.group_acronyms: list[str | None] = [None]
+        self._person_codes: dict[str, int] = {}
+        self._group_codes: dict[str | None, int] = {None: 0}
+
+        self.person = array("i")
+        self.group = array("i")
+        self.position = array("b")
+
+    def __len__(self) -> int:
+        return len(self.position)
+
+    # -- codes -------------------------------------------------------------
+
+    def person_code(self, pid: str) -> int:
+        code = self._person_codes.get(pid)
+        if code is None:
+            code = self._person_codes[pid] = len(self.person_ids)
+            self.person_ids.append(pid)
+            name = None
+            if self.acteurs is not None:
+                name = self.acteurs.get(pid, {}).get("name", "Inconnu")
+            self.person_names.append(name)
+        return code
+
+    def group_code(self, gid: str | None) -> int:
+        code = self._group_codes.get(gid)
+        if code is None:
+            code = self._group_codes[gid] = len(self.group_ids)
+            self.group_ids.append(gid)
+            org = (self.organes or {}).get(gid, {})
+            self.group_names.append(org.get("name"))
+            self.group_acronyms.append(org.get("acronym"))
+        return code
+
+    def find_person(self, pid: str) -> int | None:
+        """Code d'une personne déjà présente dans la table, sans l'ajouter."""
+        return self._person_codes.get(pid)
+
+    def find_group(self, gid: str | None) -> int | None:
+        """Code d'un groupe déjà présent dans la table, sans l'ajouter."""
+        return self._group_codes.get(gid)
+
+    # -- lignes ------------------------------------------------------------
+
+    def append(self, votes) -> "VoteSlice":
+        """Ajoute les votes (person_id, position, group) d'un scrutin."""
+        start = len(self.position)
+        person_code = self.person_code
+        group_code = self.group_code
+        for pid, pos, gid in votes:
+            self.person.append(person_code(pid))
+            self.group.append(group_code(gid))
+            self.position.append(POSITION_CODES[pos])
+        return VoteSlice(self, start, len(self.position))
+
+    def clear_rows(self):
+        """
+        Libère les lignes en gardant les codes (build en flux, un mois à la
+        fois) : les VoteSlice déjà rendues ne sont plus lisibles.
+        """
+        del self.person[:]
+        del self.group[:]
+        del self.position[:]
+
+    def vote(self, i: int) -> dict:
+        """Dict historique du vote à la ligne i (format des fichiers data/scrutins)."""
+        p = self.person[i]
+        g = self.group[i]
+        v = {
+            "person_id": self.person_ids[p],
+            "position": POSITIONS[self.position[i]],
+            "group": self.group_ids[g],
+            "constituency": None,
+            "name": self.person_names[p],
+        }
+        if g:
+            v["group_name"] = self.group_names[g]
+            v["group_acronym"] = self.group_acronyms[g]
+        return v
+
+    @classmethod
+    def from_scrutins(cls, scrutins: list[dict]) -> "VoteTable":
+        """
+        Table construite depuis des votes au format dict (ex: fichiers
+        data/scrutins relus) ; `s["votes"]` est remplacé par sa VoteSlice.
+        Les libellés retenus sont les derniers non vides vus par code.
+        """
+        table = cls()
+        for s in scrutins:
+            votes = s.get("votes", [])
+            if isinstance(votes, VoteSlice):
+                votes = list(votes)
+            for v in votes:
+                p = table.person_code(v["person_id"])
+                if v.get("name"):
+                    table.person_names[p] = v["name"]
+                g = table.group_code(v.get("group"))
+                if g and "group_name" in v:
+                    table.group_names[g] = v["group_name"]
+                    table.group_acronyms[g] = v.get("group_acronym")
+            s["votes"] = table.append(
+                (v["person_id"], v["position"], v.get("group")) for v in votes
+            )
+        return table
+
+
+class VoteSlice:
+    """
+    Votes d'un scrutin : plage [start, stop) d'une VoteTable.
+    Itérer dessus produit les dicts historiques.
+    """
+
+    __slots__ = ("table", "start", "stop")
+
+    def __init__(self, table: VoteTable, start: int, stop: int):
+        self.table = table
+        self.start = start
+        self.stop = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __iter__(self):
+        vote = self.table.vote
+        for i in range(self.start, self.stop):
+            yield vote(i)
+
+    def __repr__(self) -> str:
+        return f"VoteSlice({self.start}, {self.stop})"
+
+
+def vote_table(scrutins: list[dict]) -> VoteTable:
+    """
+    Table commune des votes de `scrutins`. Si les votes sont déjà des
+    VoteSlice d'une même table, elle est réutilisée telle quelle.
+    """
+    tables = {id(s["votes"].table): s["votes"].table
+              for s in scrutins if isinstance(s.get("votes"), VoteSlice)}
+    if len(tables) == 1 and all(isinstance(s.get("votes"), VoteSlice) for s in scrutins):
+        return next(iter(tables.values()))
+    return VoteTable.from_scrutins(scrutins)
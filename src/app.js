@@ -1,19 +1,26 @@
 // ===== UTILITAIRES =====
 
-async function loadJSON(url) {
-  const r = await fetch(url, { cache: "no-store" });
+async function loadJSON(url, cache = "no-store") {
+  const r = await fetch(url, { cache });
   if (!r.ok) throw new Error(`HTTP ${r.status} ${url}`);
   return r.json();
 }
 
+// data/manifest.json : nom haché (immuable) de chaque fichier, si généré avec --assets
+let MANIFEST = null;
+
 async function loadData(pathFromDataRoot) {
+  // fichier haché : contenu immuable, le cache du navigateur suffit
+  const hashed = MANIFEST?.files?.[pathFromDataRoot]?.path;
+  const path = hashed ?? pathFromDataRoot;
+  const cache = hashed ? "force-cache" : "no-store";
   const candidates = [
-    `./data/${pathFromDataRoot}`,
-    `../data/${pathFromDataRoot}`,
+    `./data/${path}`,
+    `../data/${path}`,
   ];
   let lastErr = null;
   for (const url of candidates) {
-    try { return await loadJSON(url); }
+    try { return await loadJSON(url, cache); }
     catch (e) { lastErr = e; }
   }
   throw lastErr;
@@ -55,36 +62,118 @@ function resultBadgeHtml(status) {
 
 // ===== ÉTAT GLOBAL =====
 
-let INDEX = null;
 let THEMES = null;
 let DEPUTIES = null;
 let GROUPS = null;
+let PEOPLE = null;
 let CURRENT_DETAIL = null;
 let CURRENT_DEPUTY = null;
 let CURRENT_GROUP = null;
 
-// Cache des fichiers scrutins par mois déjà chargés
-const SCRUTIN_CACHE = {};
+// Historiques déjà chargés (data/deputies/PAxxxx.json, data/groups/POxxxx.json)
+const DEPUTY_VOTES_CACHE = {};
+const GROUP_VOTES_CACHE = {};
+
+// ===== HELPER : historiques par député / par groupe (on-demand) =====
+
+async function loadDeputyVotes(personId) {
+  if (!DEPUTY_VOTES_CACHE[personId]) {
+    DEPUTY_VOTES_CACHE[personId] = await loadData(`deputies/${personId}.json`)
+      .catch(() => deputyVotesFromMonths(personId));
+  }
+  return DEPUTY_VOTES_CACHE[personId];
+}
+
+async function loadGroupVotes(groupId) {
+  if (!GROUP_VOTES_CACHE[groupId]) {
+    GROUP_VOTES_CACHE[groupId] = await loadData(`groups/${groupId}.json`)
+      .catch(() => groupVotesFromMonths(groupId));
+  }
+  return GROUP_VOTES_CACHE[groupId];
+}
 
-// ===== HELPER : charger tous les scrutins (on-demand, par mois) =====
+// data/ généré sans historiques (data/deputies/, data/groups/) : mêmes
+// historiques reconstitués depuis les fichiers de mois (mois absents ignorés)
+const MONTH_PACKS = {};
 
 async function loadAllScrutins() {
-  const months = INDEX.months ?? [];
-  const promises = months.map(async m => {
-    if (!SCRUTIN_CACHE[m]) {
-      SCRUTIN_CACHE[m] = await loadData(`scrutins/${m}.json`);
+  const packs = await Promise.all((CATALOG.months ?? []).map(m => {
+    if (!MONTH_PACKS[m]) MONTH_PACKS[m] = loadData(`scrutins/${m}.json`).catch(() => null);
+    return MONTH_PACKS[m];
+  }));
+  const all = [];
+  for (const pack of packs) {
+    for (const s of (pack?.scrutins ?? [])) all.push(await decodeScrutinVotes(pack, s));
+  }
+  return all.sort(compareScrutins);
+}
+
+// du plus récent au plus ancien, comme les historiques pré-calculés
+function compareScrutins(a, b) {
+  if (a.date !== b.date) return a.date < b.date ? 1 : -1;
+  return a.id < b.id ? 1 : (a.id > b.id ? -1 : 0);
+}
+
+async function deputyVotesFromMonths(personId) {
+  const votes = [];
+  for (const s of await loadAllScrutins()) {
+    // premier vote seulement (une mise au point ajoute un doublon)
+    const v = (s.votes ?? []).find(x => x.person_id === personId);
+    if (v) votes.push([s.id, s.date, v.position, null, s.title, s.result_status]);
+  }
+  return { person_id: personId, votes };
+}
+
+async function groupVotesFromMonths(groupId) {
+  const keys = { FOR: "for", AGAINST: "against", ABSTAIN: "abstain", NONVOTING: "nonvoting" };
+  const perScrutin = [];
+  for (const s of await loadAllScrutins()) {
+    const counts = { for: 0, against: 0, abstain: 0, nonvoting: 0 };
+    let n = 0;
+    for (const v of (s.votes ?? [])) {
+      if (v.group === groupId && keys[v.position]) { counts[keys[v.position]]++; n++; }
     }
-    return SCRUTIN_CACHE[m];
-  });
-  return Promise.all(promises);
+    if (!n) continue;
+    const best = Math.max(...Object.values(counts));
+    perScrutin.push({
+      scrutin_id: s.id,
+      date: s.date,
+      title: s.title,
+      group_counts: counts,
+      majority_position: Object.keys(counts).find(k => counts[k] === best),
+    });
+  }
+  return { group_id: groupId, per_scrutin: perScrutin };
 }
 
-function getAllScrutinsFromCache() {
-  const all = [];
-  for (const pack of Object.values(SCRUTIN_CACHE)) {
-    all.push(...(pack.scrutins ?? []));
+// ===== HELPER : mois au format colonnaire (scripts/columnar.py) =====
+
+const POSITIONS = ["FOR", "AGAINST", "ABSTAIN", "NONVOTING"];
+
+// votes {person, group, position} (indices vers people.json) -> liste de votes
+async function decodeScrutinVotes(pack, s) {
+  if (pack.format !== "columnar") return s;
+  if (pack.version !== 1) throw new Error(`format colonnaire v${pack.version} non supporté`);
+  if (!PEOPLE || PEOPLE.dictionary !== pack.dictionary) {
+    PEOPLE = await loadData("people.json");
   }
-  return all;
+  const people = PEOPLE.people;
+  const groups = PEOPLE.groups ?? [];
+  const { person, group, position } = s.votes;
+  const votes = person.map((p, i) => {
+    const pe = people[p];
+    const g = group[i] >= 0 ? groups[group[i]] : null;
+    return {
+      person_id: pe.person_id,
+      name: pe.name,
+      position: POSITIONS[position[i]],
+      group: g?.group_id ?? null,
+      group_acronym: g?.acronym,
+      group_name: g?.name,
+      constituency: null,
+    };
+  });
+  return { ...s, votes };
 }
 
 // ===== HELPER : fermer un overlay =====
@@ -119,19 +208,133 @@ function setupNavigation() {
 
 // ===== VUE : SCRUTINS =====
 
-function applyScrutinFilters() {
-  const q = document.querySelector("#q").value.trim().toLowerCase();
+// Catalogue paginé (data/catalog/, voir scripts/catalog.py) : meta + pages
+// chargées à la demande, index de recherche en tranches par préfixe.
+let CATALOG = null;
+const CATALOG_PAGES = {};   // n° de page -> lignes
+const TOKEN_SHARDS = {};    // préfixe -> {token: [rangs]}
+let FACETS = null;
+let SCRUTIN_LIMIT = 0;      // lignes affichées (augmente avec "Afficher plus")
+let SCRUTIN_SEQ = 0;        // ignore les réponses d'une recherche dépassée
+
+const STOPWORDS = new Set(("au aux ce ces cet cette d dans de des du en et il l la le les leur leurs " +
+  "n ne par pas pour qu que qui sa se ses son sur un une").split(" "));
+
+// même normalisation que catalog.tokenize : minuscules, sans accents, mots >= 2 caractères
+function tokenize(text) {
+  const folded = (text ?? "").toLowerCase().normalize("NFKD").replace(/\p{M}/gu, "");
+  const words = folded.split(/[^\p{L}\p{N}_]+/u);
+  return uniq(words.filter(w => w.length >= CATALOG.prefix_len && !STOPWORDS.has(w)));
+}
+
+function loadCatalogPage(n) {
+  if (!CATALOG_PAGES[n]) {
+    const name = String(n).padStart(4, "0");
+    CATALOG_PAGES[n] = loadData(`catalog/pages/${name}.json`).then(p => p.scrutins);
+  }
+  return CATALOG_PAGES[n];
+}
+
+function loadTokenShard(prefix) {
+  if (CATALOG.local) return TOKEN_SHARDS[prefix] ?? {};
+  if (!TOKEN_SHARDS[prefix]) {
+    TOKEN_SHARDS[prefix] = loadData(`catalog/tokens/${prefix}.json`).catch(() => ({}));
+  }
+  return TOKEN_SHARDS[prefix];
+}
+
+async function loadFacets() {
+  if (!FACETS) FACETS = await loadData("catalog/facets.json");
+  return FACETS;
+}
+
+// data/ généré sans catalogue (pas de catalog/meta.json) : même catalogue
+// calculé depuis index.json, pages, tranches et facettes en mémoire
+async function catalogFromIndex() {
+  const index = await loadData("index.json");
+  const items = [...(index.scrutins ?? [])].sort(compareScrutins);
+  const themes = {};
+  const results = {};
+  CATALOG = {
+    generated_at: index.generated_at,
+    page_size: 200,
+    total: items.length,
+    months: index.months ?? [],
+    prefix_len: 2,
+    local: true,
+  };
+  items.forEach((s, rank) => {
+    for (const tok of tokenize(s.title)) {
+      const shard = TOKEN_SHARDS[tok.slice(0, CATALOG.prefix_len)] ??= {};
+      (shard[tok] ??= []).push(rank);
+    }
+    for (const slug of (s.themes ?? [])) (themes[slug] ??= []).push(rank);
+    if (s.result_status) (results[s.result_status] ??= []).push(rank);
+  });
+  for (let n = 0; n * CATALOG.page_size < items.length; n++) {
+    CATALOG_PAGES[n] = Promise.resolve(items.slice(n * CATALOG.page_size, (n + 1) * CATALOG.page_size));
+  }
+  CATALOG.themes = Object.fromEntries(Object.entries(themes).map(([k, r]) => [k, r.length]));
+  FACETS = { themes, result_status: results };
+  return CATALOG;
+}
+
+// intersection de deux listes de rangs triées
+function intersectRanks(a, b) {
+  const out = [];
+  let i = 0, j = 0;
+  while (i < a.length && j < b.length) {
+    if (a[i] === b[j]) { out.push(a[i]); i++; j++; }
+    else if (a[i] < b[j]) i++;
+    else j++;
+  }
+  return out;
+}
+
+// rangs des scrutins dont le titre contient un mot commençant par `word`
+async function searchWord(word) {
+  const shard = await loadTokenShard(word.slice(0, CATALOG.prefix_len));
+  const ranks = new Set();
+  for (const [token, list] of Object.entries(shard)) {
+    if (token.startsWith(word)) for (const r of list) ranks.add(r);
+  }
+  return [...ranks].sort((a, b) => a - b);
+}
+
+// rangs filtrés, ou null si aucun filtre (tout le catalogue)
+async function filteredRanks(q, result, theme) {
+  const lists = await Promise.all(tokenize(q).map(searchWord));
+  if (result || theme) {
+    const facets = await loadFacets();
+    if (result) lists.push(facets.result_status[result] ?? []);
+    if (theme) lists.push(facets.themes[theme] ?? []);
+  }
+  if (!lists.length) return null;
+  return lists.reduce(intersectRanks);
+}
+
+async function applyScrutinFilters(more = false) {
+  const seq = ++SCRUTIN_SEQ;
+  const q = document.querySelector("#q").value.trim();
   const result = document.querySelector("#result").value;
   const theme = document.querySelector("#theme").value;
+  SCRUTIN_LIMIT = more ? SCRUTIN_LIMIT + CATALOG.page_size : CATALOG.page_size;
 
-  let rows = INDEX.scrutins;
+  const ranks = await filteredRanks(q, result, theme);
+  const total = ranks ? ranks.length : CATALOG.total;
+  const shown = [];
+  for (let i = 0; i < Math.min(total, SCRUTIN_LIMIT); i++) shown.push(ranks ? ranks[i] : i);
 
-  if (q) rows = rows.filter(s => (s.title ?? "").toLowerCase().includes(q));
-  if (result) rows = rows.filter(s => (s.result_status ?? "") === result);
-  if (theme) rows = rows.filter(s => (s.themes ?? []).includes(theme));
+  // seules les pages des lignes affichées sont chargées
+  const size = CATALOG.page_size;
+  const pageNums = uniq(shown.map(r => String(Math.floor(r / size)))).map(Number);
+  const pages = {};
+  await Promise.all(pageNums.map(async n => { pages[n] = await loadCatalogPage(n); }));
+  if (seq !== SCRUTIN_SEQ) return;
+  const rows = shown.map(r => pages[Math.floor(r / size)][r % size]);
 
   document.querySelector("#meta").innerHTML =
-    `<span class="meta-badge">${rows.length} scrutins</span> &nbsp; données générées: ${INDEX.generated_at}`;
+    `<span class="meta-badge">${total} scrutins</span> &nbsp; données générées: ${CATALOG.generated_at}`;
 
   const tbody = document.querySelector("#scrutinsTable tbody");
   tbody.innerHTML = "";
@@ -154,6 +357,10 @@ function applyScrutinFilters() {
   tbody.querySelectorAll("button[data-id]").forEach(btn => {
     btn.addEventListener("click", () => openScrutinDetail(btn.dataset.id, btn.dataset.date));
   });
+
+  const moreBtn = document.querySelector("#scrutins-more");
+  moreBtn.classList.toggle("hidden", rows.length >= total);
+  moreBtn.textContent = `Afficher plus (${rows.length} / ${total})`;
 }
 
 // ===== OVERLAY : DÉTAIL SCRUTIN =====
@@ -161,8 +368,9 @@ function applyScrutinFilters() {
 async function openScrutinDetail(scrutinId, dateStr) {
   const month = dateStr.slice(0, 7); // "YYYY-MM"
   const pack = await loadData(`scrutins/${month}.json`);
-  const s = pack.scrutins.find(x => x.id === scrutinId);
-  if (!s) { alert(`Scrutin introuvable`); return; }
+  const found = pack.scrutins.find(x => x.id === scrutinId);
+  if (!found) { alert(`Scrutin introuvable`); return; }
+  const s = await decodeScrutinVotes(pack, found);
 
   CURRENT_DETAIL = s;
   openOverlay("#overlay");
@@ -328,27 +536,31 @@ async function openDeputyProfile(personId) {
   const tbody = document.querySelector("#deputyVotesTable tbody");
   tbody.innerHTML = `<tr><td colspan="4" style="text-align:center;color:#6b7280;padding:24px">Chargement de l'historique...</td></tr>`;
 
-  // Charger tous les scrutins et extraire les votes de ce député
-  await loadAllScrutins();
-  const allScrutins = getAllScrutinsFromCache();
-  const deputyVotes = [];
-  for (const sc of allScrutins) {
-    const vote = (sc.votes ?? []).find(v => v.person_id === personId);
-    if (vote) {
-      deputyVotes.push({
-        scrutin_id: sc.id,
-        date: sc.date,
-        title: sc.title,
-        position: vote.position,
-        result_status: sc.result_status,
-      });
-    }
+  // Historique pré-calculé : [scrutin_id, date, position, loyalty, title, result_status],
+  // du plus récent au plus ancien (title : titre court)
+  // loyalty : 1 = avec la majorité du groupe, 0 = dissident, null = non marqué
+  const pack = await loadDeputyVotes(personId);
+  if (CURRENT_DEPUTY?.person_id !== personId) return; // fiche fermée ou changée entre-temps
+  const deputyVotes = (pack.votes ?? []).map(
+    ([scrutinId, date, position, loyalty = null, title, resultStatus]) => ({
+      scrutin_id: scrutinId,
+      date,
+      title,
+      position,
+      loyalty,
+      result_status: resultStatus,
+    }));
+
+  const loyal = deputyVotes.filter(v => v.loyalty === 1).length;
+  const dissent = deputyVotes.filter(v => v.loyalty === 0).length;
+  if (loyal + dissent) {
+    document.querySelector("#deputy-stats").insertAdjacentHTML("beforeend", `
+      <div class="stat-card">
+        <div class="stat-value">${Math.round(loyal / (loyal + dissent) * 1000) / 10}%</div>
+        <div class="stat-label">Loyauté (${dissent} dissidence${dissent > 1 ? "s" : ""})</div>
+      </div>
+    `);
   }
-  deputyVotes.sort((a, b) => {
-    if (a.date > b.date) return -1;
-    if (a.date < b.date) return 1;
-    return a.scrutin_id > b.scrutin_id ? -1 : 1;
-  });
 
   CURRENT_DEPUTY.votes = deputyVotes;
   renderDeputyVotes();
@@ -371,7 +583,7 @@ function renderDeputyVotes() {
     tr.innerHTML = `
       <td>${v.date}</td>
       <td>${escapeHtml(v.title)}</td>
-      <td>${voteBadgeHtml(v.position)}</td>
+      <td>${voteBadgeHtml(v.position)}${v.loyalty === 0 ? ` <span class="dissent-badge" title="Vote différent de la majorité de son groupe">dissident</span>` : ""}</td>
       <td>${resultBadgeHtml(v.result_status)}</td>
     `;
     tbody.appendChild(tr);
@@ -481,47 +693,10 @@ async function openGroupProfile(groupId) {
   const tbody = document.querySelector("#groupVotesTable tbody");
   tbody.innerHTML = `<tr><td colspan="6" style="text-align:center;color:#6b7280;padding:24px">Chargement des votes...</td></tr>`;
 
-  await loadAllScrutins();
-  const allScrutins = getAllScrutinsFromCache();
-
-  // Construire le per_scrutin pour ce groupe
-  const memberIds = new Set(g.members.map(m => m.person_id));
-  const perScrutin = [];
-  const positions = ["for", "against", "abstain", "nonvoting"];
-  const posKeyMap = { FOR: "for", AGAINST: "against", ABSTAIN: "abstain", NONVOTING: "nonvoting" };
-
-  for (const sc of allScrutins) {
-    const counts = { for: 0, against: 0, abstain: 0, nonvoting: 0 };
-    let hasVotes = false;
-    for (const v of (sc.votes ?? [])) {
-      if (v.group === groupId || memberIds.has(v.person_id)) {
-        const pk = posKeyMap[v.position];
-        if (pk) { counts[pk]++; hasVotes = true; }
-      }
-    }
-    if (!hasVotes) continue;
-
-    const total = counts.for + counts.against + counts.abstain + counts.nonvoting;
-    let majorityPos = null;
-    if (total > 0) {
-      const maxVal = Math.max(...positions.map(p => counts[p]));
-      majorityPos = positions.find(p => counts[p] === maxVal);
-    }
-
-    perScrutin.push({
-      scrutin_id: sc.id,
-      date: sc.date,
-      title: sc.title,
-      group_counts: counts,
-      majority_position: majorityPos,
-    });
-  }
-
-  perScrutin.sort((a, b) => {
-    if (a.date > b.date) return -1;
-    if (a.date < b.date) return 1;
-    return a.scrutin_id > b.scrutin_id ? -1 : 1;
-  });
+  // Votes du groupe par scrutin, pré-calculés (du plus récent au plus ancien), titre court compris
+  const pack = await loadGroupVotes(groupId);
+  if (CURRENT_GROUP?.group_id !== groupId) return; // fiche fermée ou changée entre-temps
+  const perScrutin = pack.per_scrutin ?? [];
 
   CURRENT_GROUP.per_scrutin = perScrutin;
 
@@ -546,7 +721,9 @@ async function openGroupProfile(groupId) {
 // ===== INIT =====
 
 async function init() {
-  INDEX = await loadData("index.json");
+  try { MANIFEST = await loadData("manifest.json"); } catch { MANIFEST = null; }
+  CATALOG = await loadData("catalog/meta.json").catch(catalogFromIndex);
+  loadCatalogPage(0); // premier affichage : la page 0 seulement
   THEMES = await loadData("themes.json");
 
   // charger deputies et groups (pas bloquant si absent)
@@ -557,11 +734,7 @@ async function init() {
   const labelMap = {};
   for (const t of (THEMES.themes ?? [])) labelMap[t.slug] = t.label ?? t.slug;
   labelMap["autre"] = "Autre";
-  const dataThemes = new Set();
-  for (const s of (INDEX.scrutins ?? [])) {
-    for (const t of (s.themes ?? [])) dataThemes.add(t);
-  }
-  const allSlugs = uniq([...Object.keys(labelMap), ...dataThemes]);
+  const allSlugs = uniq([...Object.keys(labelMap), ...Object.keys(CATALOG.themes ?? {})]);
   const themeSel = document.querySelector("#theme");
   for (const slug of allSlugs) {
     const opt = document.createElement("option");
@@ -584,12 +757,16 @@ async function init() {
   // navigation
   setupNavigation();
 
-  // scrutins filters
-  ["q", "result", "theme"].forEach(id => {
-    const el = document.querySelector(`#${id}`);
-    el.addEventListener("input", applyScrutinFilters);
-    el.addEventListener("change", applyScrutinFilters);
+  // scrutins filters (recherche différée pendant la frappe)
+  let searchTimer = null;
+  document.querySelector("#q").addEventListener("input", () => {
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(() => applyScrutinFilters(), 150);
+  });
+  ["result", "theme"].forEach(id => {
+    document.querySelector(`#${id}`).addEventListener("change", () => applyScrutinFilters());
   });
+  document.querySelector("#scrutins-more").addEventListener("click", () => applyScrutinFilters(true));
 
   // deputies filters
   ["dep-q", "dep-group-filter"].forEach(id => {
@@ -633,7 +810,7 @@ async function init() {
   });
 
   // render initial views
-  applyScrutinFilters();
+  await applyScrutinFilters();
   applyDeputyFilters();
   renderGroupsList();
 }